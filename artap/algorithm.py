@@ -6,10 +6,12 @@ This is base class for all algorithms
 
 from .problem import Problem
 from .utils import ConfigDictionary
-from .operators import Evaluator, GradientEvaluator, WorstCaseEvaluator
+from .operators import Evaluator, GradientEvaluator, WorstCaseEvaluator, MaximumFunctionCallTermination, \
+    TimeTermination
 
 
 from abc import ABCMeta
+import time
 from enum import Enum
 from uuid import uuid1
 
@@ -44,12 +46,63 @@ class Algorithm(metaclass=ABCMeta):
         # max(int(2 / 3 * cpu_count(), 1)
         self.options.declare(name='max_processes', default=1,
                              desc='Max running processes')
+        self.options.declare(name='parallel_backend', default='threading', values=['threading', 'process'],
+                             desc='Parallel evaluation backend (threads with shared memory or a pool of processes)')
+        self.options.declare(name='max_concurrency', default=100, lower=1,
+                             desc='Max concurrent evaluations of the asynchronous problems (evaluate_async)')
 
         self.options.declare(name='n_iterations', default=10,
                              desc='Max number of iterations')
+        self.options.declare(name='max_evaluations', default=None,
+                             desc='Max number of evaluations of the problem (checked after every generation)')
+        self.options.declare(name='max_time', default=None,
+                             desc='Max wall-clock time of the run in seconds (checked after every generation)')
 
         self.individual_features = dict()
 
+        # termination criteria (operators.Termination) added to max_evaluations and max_time
+        self.terminations = []
+        self._criteria = []
+        # state of the run: the number of the finished generations and the last population
+        self.n_gen = 0
+        self.population = []
+        self.start_time = None
+
+    def add_termination(self, termination):
+        self.terminations.append(termination)
+
+    def start_termination(self):
+        """ Starts the counters of the termination criteria, called at the start of the run. """
+        self.n_gen = 0
+        self.population = []
+        self.start_time = time.time()
+        self.evaluator.start()
+
+        self._criteria = list(self.terminations)
+        if self.options['max_evaluations'] is not None:
+            self._criteria.append(MaximumFunctionCallTermination(self.options['max_evaluations']))
+        if self.options['max_time'] is not None:
+            self._criteria.append(TimeTermination(self.options['max_time']))
+
+        for termination in self._criteria:
+            termination.start(self)
+
+    def do_continue(self, population):
+        """
+        Records the finished generation, returns False if some of the termination criteria is met (the algorithm
+        stops before the next generation).
+        """
+        self.n_gen += 1
+        self.population = population
+
+        for termination in self._criteria:
+            if termination.has_terminated(self):
+                self.problem.logger.info("{}: terminated by {} after {} generations".format(
+                    self.name, type(termination).__name__, self.n_gen))
+                return False
+
+        return True
+
     def evaluate(self, individuals):
         # set algorithm id
         for individual in individuals:
@@ -45,68 +45,72 @@ class NSGAII(GeneticAlgorithm):
                              desc='prob_mutation')
 
     def run(self):
-        if self.generator is None:
-            self.generator = RandomGenerator(self.problem.parameters)
-            self.generator.init(self.options['max_population_size'])
-        self.crossover = SimulatedBinaryCrossover(self.problem.parameters, self.options['prob_cross'])
-        self.mutator = PmMutator(self.problem.parameters, self.options['prob_mutation'])
-        self.selector = TournamentSelector(self.problem.parameters)
-
-        # create initial population
-        vectors = self.generator.generate()
-        individuals = []
-        for vector in vectors:
-            # append to problem
-            individuals.append(IndividualNSGAII(vector))
-            # add to population
-
-        # evaluate
-        self.evaluate(individuals)
-
-        # non-dominated sort of individuals
-        self.selector.fast_nondominated_sorting(individuals)
-
-        # sync to datastore
-        for individual in individuals:
-            self.problem.individuals.append(individual)
-            individual.population_id = 1
-            self.problem.data_store.sync_individual(individual)
-
-        t_s = time.time()
-        self.problem.logger.info(
-            "NSGA_II: {}/{}".format(self.options['max_population_number'],
-                                    self.options['max_population_number'] * self.options['max_population_size']))
-
-        # optimization
-        for it in range(self.options['max_population_number']-1):
-
-            # generate new offsprings
-            offsprings = self.generate(individuals)
-
-            # Todo: this lead to too many calculations of the goal function
-            # evaluate the offsprings
-            self.evaluate(offsprings)
+        with self.evaluator:
+            self.start_termination()
+            if self.generator is None:
+                self.generator = RandomGenerator(self.problem.parameters)
+                self.generator.init(self.options['max_population_size'])
+            self.crossover = SimulatedBinaryCrossover(self.problem.parameters, self.options['prob_cross'])
+            self.mutator = PmMutator(self.problem.parameters, self.options['prob_mutation'])
+            self.selector = TournamentSelector(self.problem.parameters)
+
+            # create initial population
+            vectors = self.generator.generate()
+            individuals = []
+            for vector in vectors:
+                # append to problem
+                individuals.append(IndividualNSGAII(vector))
+                # add to population
 
-            for individual in individuals:
-                offsprings.append(individual.copy())
+            # evaluate
+            self.evaluate(individuals)
 
-            # make the pareto dominance calculation and calculating the crowding distance
-            self.selector.fast_nondominated_sorting(offsprings)
+            # non-dominated sort of individuals
+            self.selector.fast_nondominated_sorting(individuals)
 
-            # truncate
-            # ToDO: Deside if we want to save removed individuals
-            # individuals, removed = nondominated_truncate(offsprings, self.options['max_population_size'])
-            individuals = nondominated_truncate(offsprings, self.options['max_population_size'])
+            # sync to datastore
             for individual in individuals:
-                # add to population
-                individual.population_id = it + 2
-                # append to problem
                 self.problem.individuals.append(individual)
+                individual.population_id = 1
                 self.problem.data_store.sync_individual(individual)
 
+            t_s = time.time()
+            self.problem.logger.info(
+                "NSGA_II: {}/{}".format(self.options['max_population_number'],
+                                        self.options['max_population_number'] * self.options['max_population_size']))
+
+            # optimization
+            for it in range(self.options['max_population_number']-1):
+                if not self.do_continue(individuals):
+                    break
+
+                # generate new offsprings
+                offsprings = self.generate(individuals)
+
+                # Todo: this lead to too many calculations of the goal function
+                # evaluate the offsprings
+                self.evaluate(offsprings)
+
+                for individual in individuals:
+                    offsprings.append(individual.copy())
+
+                # make the pareto dominance calculation and calculating the crowding distance
+                self.selector.fast_nondominated_sorting(offsprings)
+
+                # truncate
+                # ToDO: Deside if we want to save removed individuals
+                # individuals, removed = nondominated_truncate(offsprings, self.options['max_population_size'])
+                individuals = nondominated_truncate(offsprings, self.options['max_population_size'])
+                for individual in individuals:
+                    # add to population
+                    individual.population_id = it + 2
+                    # append to problem
+                    self.problem.individuals.append(individual)
+                    self.problem.data_store.sync_individual(individual)
+
 
-        t = time.time() - t_s
-        self.problem.logger.info("NSGA_II: elapsed time: {} s".format(t))
+            t = time.time() - t_s
+            self.problem.logger.info("NSGA_II: elapsed time: {} s".format(t))
 
-        # sync changed individual informations
-        self.problem.data_store.sync_all()
+            # sync changed individual informations
+            self.problem.data_store.sync_all()
@@ -127,47 +127,48 @@ class BayesOptSerial(BayesOpt):
         self.bo = BayesOptClassSerial(self)
 
     def run(self):
-        # Figure out bounds vectors.
-        i = 0
-        for parameter in self.problem.parameters:
-            bounds = parameter['bounds']
-
-            self.bo.lb[i] = bounds[0]
-            self.bo.ub[i] = bounds[1]
-
-            i += 1
-
-        # set bayesopt
-        self.bo.params['n_iterations'] = self.options['n_iterations']
-        self.bo.params['n_init_samples'] = self.options['n_init_samples']
-        self.bo.params['n_iter_relearn'] = self.options['n_iter_relearn']
-        self.bo.params['surr_name'] = self.options['surr_name']
-        self.bo.params['surr_noise'] = self.options['surr_noise']
-        self.bo.params['init_method'] = self.options['init_method']
-        self.bo.params['l_type'] = self.options['l_type']
-        self.bo.params['sc_type'] = self.options['sc_type']
-        self.bo.params['verbose_level'] = self.options['verbose_level']
-
-        t_s = time.time()
-
-        self.problem.logger.info("BayesOpt: surr_name{}".format(self.options['surr_name']))
-        mvalue, x_out, error = self.bo.optimize()
-
-        t = time.time() - t_s
-        self.problem.logger.info("BayesOpt: elapsed time: {} s".format(t))
-
-        # sync changed individual informations
-        self.problem.data_store.sync_all()
-
-        if error != 0:
-            print('Optimization FAILED.')
-            print("Error", error)
-            print('-' * 35)
-        else:
-            pass
-            # print('Optimization Complete, %f seconds' % (clock() - start))
-            # print("Result", x_out, mvalue)
-            # print('-' * 35)
+        with self.evaluator:
+            # Figure out bounds vectors.
+            i = 0
+            for parameter in self.problem.parameters:
+                bounds = parameter['bounds']
+
+                self.bo.lb[i] = bounds[0]
+                self.bo.ub[i] = bounds[1]
+
+                i += 1
+
+            # set bayesopt
+            self.bo.params['n_iterations'] = self.options['n_iterations']
+            self.bo.params['n_init_samples'] = self.options['n_init_samples']
+            self.bo.params['n_iter_relearn'] = self.options['n_iter_relearn']
+            self.bo.params['surr_name'] = self.options['surr_name']
+            self.bo.params['surr_noise'] = self.options['surr_noise']
+            self.bo.params['init_method'] = self.options['init_method']
+            self.bo.params['l_type'] = self.options['l_type']
+            self.bo.params['sc_type'] = self.options['sc_type']
+            self.bo.params['verbose_level'] = self.options['verbose_level']
+
+            t_s = time.time()
+
+            self.problem.logger.info("BayesOpt: surr_name{}".format(self.options['surr_name']))
+            mvalue, x_out, error = self.bo.optimize()
+
+            t = time.time() - t_s
+            self.problem.logger.info("BayesOpt: elapsed time: {} s".format(t))
+
+            # sync changed individual informations
+            self.problem.data_store.sync_all()
+
+            if error != 0:
+                print('Optimization FAILED.')
+                print("Error", error)
+                print('-' * 35)
+            else:
+                pass
+                # print('Optimization Complete, %f seconds' % (clock() - start))
+                # print("Result", x_out, mvalue)
+                # print('-' * 35)
 
 
 class BayesOptClassParallel(Process, BayesOptContinuous):
@@ -232,52 +233,53 @@ class BayesOptParallel(BayesOpt):
             pipe.send(result)
 
     def run(self):
-        # Figure out bounds vectors.
-        i = 0
-        for parameter in self.problem.parameters:
-            bounds = parameter['bounds']
-
-            self.bo.lb[i] = bounds[0]
-            self.bo.ub[i] = bounds[1]
-
-            i += 1
-
-        # set bayesopt
-        self.bo.params['n_iterations'] = self.options['n_iterations']
-        self.bo.params['n_init_samples'] = self.options['n_init_samples']
-        self.bo.params['n_iter_relearn'] = self.options['n_iter_relearn']
-        self.bo.params['surr_name'] = self.options['surr_name']
-        self.bo.params['surr_noise'] = self.options['surr_noise']
-        self.bo.params['init_method'] = self.options['init_method']
-        self.bo.params['l_type'] = self.options['l_type']
-        self.bo.params['sc_type'] = self.options['sc_type']
-        self.bo.params['verbose_level'] = self.options['verbose_level']
-
-        # process = Process(target=self.worker, args=(self.pipe_par, self.problem, ))
-        process = Process(target=self.worker, args=(self.pipe_par, ))
-
-        self.bo.start()
-        process.start()
-
-        self.bo.join()
-        process.join()
-
-        print(self.bo.mvalue)
-        print(self.bo.x_out)
-        print(self.bo.error)
-        print()
-        print(self.problem.data_store, len(self.problem.populations[-1].individuals))
-
-
-        # self.result = self.mvalue
-        """
-        if self.bo.error != 0:
-            print('Optimization FAILED.')
-            print("Error", self.bo.error)
-            print('-' * 35)
-        else:
-            print('Optimization Complete, %f seconds' % (clock() - start))
-            print("Result", self.bo.x_out, self.bo.mvalue)
-            print('-' * 35)
+        with self.evaluator:
+            # Figure out bounds vectors.
+            i = 0
+            for parameter in self.problem.parameters:
+                bounds = parameter['bounds']
+
+                self.bo.lb[i] = bounds[0]
+                self.bo.ub[i] = bounds[1]
+
+                i += 1
+
+            # set bayesopt
+            self.bo.params['n_iterations'] = self.options['n_iterations']
+            self.bo.params['n_init_samples'] = self.options['n_init_samples']
+            self.bo.params['n_iter_relearn'] = self.options['n_iter_relearn']
+            self.bo.params['surr_name'] = self.options['surr_name']
+            self.bo.params['surr_noise'] = self.options['surr_noise']
+            self.bo.params['init_method'] = self.options['init_method']
+            self.bo.params['l_type'] = self.options['l_type']
+            self.bo.params['sc_type'] = self.options['sc_type']
+            self.bo.params['verbose_level'] = self.options['verbose_level']
+
+            # process = Process(target=self.worker, args=(self.pipe_par, self.problem, ))
+            process = Process(target=self.worker, args=(self.pipe_par, ))
+
+            self.bo.start()
+            process.start()
+
+            self.bo.join()
+            process.join()
+
+            print(self.bo.mvalue)
+            print(self.bo.x_out)
+            print(self.bo.error)
+            print()
+            print(self.problem.data_store, len(self.problem.populations[-1].individuals))
+
+
+            # self.result = self.mvalue
+            """
+            if self.bo.error != 0:
+                print('Optimization FAILED.')
+                print("Error", self.bo.error)
+                print('-' * 35)
+            else:
+                print('Optimization Complete, %f seconds' % (clock() - start))
+                print("Result", self.bo.x_out, self.bo.mvalue)
+                print('-' * 35)
             
-        """
\ No newline at end of file
+            """
\ No newline at end of file
@@ -67,54 +67,58 @@ class CEM(GeneticAlgorithm):
         return new_std
 
     def run(self):
-        mean_fitness = []
-        best_fitness = []
-        worst_fitness = []
-        fitness = []
-        individuals = self.fit_gaussian()
-        for individual in individuals:
-            # append to problem
-            self.problem.individuals.append(individual)
-            # add to population
-            individual.population_id = 0
-
-            self.problem.data_store.sync_individual(individual)
-
-        self.evaluate(individuals)
-
-        start = time.time()
-        self.problem.logger.info("CEM: {}/{}".format(self.options['max_population_number'],
-                                                     self.options['max_population_size']))
-        for it in range(self.options['max_population_number']):
-
-            lists = []
-            for individual in individuals:
-                lists.append(individual.costs)
-            lists = np.array(lists)
-
-            mean_fitness.append(np.mean(lists))
-            best_fitness.append(np.min(lists))
-            worst_fitness.append(np.max(lists))
-            fitness.append(lists)
-
-            elite = self.take_elite(individuals)
-
-            e_candidates = [i.vector for i in elite]
-
-            self.theta_mean = self.compute_new_mean(e_candidates)
-            self.theta_std = self.compute_new_std(e_candidates)
+        with self.evaluator:
+            self.start_termination()
+            mean_fitness = []
+            best_fitness = []
+            worst_fitness = []
+            fitness = []
             individuals = self.fit_gaussian()
-
-            self.evaluate(individuals)
             for individual in individuals:
-                # add to population
-                individual.population_id = it + 1
                 # append to problem
                 self.problem.individuals.append(individual)
-                # sync to datastore
+                # add to population
+                individual.population_id = 0
+
                 self.problem.data_store.sync_individual(individual)
 
-        t = time.time() - start
-        self.problem.logger.info("CEM: elapsed time: {} s".format(t))
-        # sync changed individual informations
-        self.problem.data_store.sync_all()
+            self.evaluate(individuals)
+
+            start = time.time()
+            self.problem.logger.info("CEM: {}/{}".format(self.options['max_population_number'],
+                                                         self.options['max_population_size']))
+            for it in range(self.options['max_population_number']):
+                if not self.do_continue(individuals):
+                    break
+
+                lists = []
+                for individual in individuals:
+                    lists.append(individual.costs)
+                lists = np.array(lists)
+
+                mean_fitness.append(np.mean(lists))
+                best_fitness.append(np.min(lists))
+                worst_fitness.append(np.max(lists))
+                fitness.append(lists)
+
+                elite = self.take_elite(individuals)
+
+                e_candidates = [i.vector for i in elite]
+
+                self.theta_mean = self.compute_new_mean(e_candidates)
+                self.theta_std = self.compute_new_std(e_candidates)
+                individuals = self.fit_gaussian()
+
+                self.evaluate(individuals)
+                for individual in individuals:
+                    # add to population
+                    individual.population_id = it + 1
+                    # append to problem
+                    self.problem.individuals.append(individual)
+                    # sync to datastore
+                    self.problem.data_store.sync_individual(individual)
+
+            t = time.time() - start
+            self.problem.logger.info("CEM: elapsed time: {} s".format(t))
+            # sync changed individual informations
+            self.problem.data_store.sync_all()
@@ -112,56 +112,61 @@ class CMA_ES(GeneticAlgorithm):
         return 1 / e_candidates.shape[0] * cov + I * 1e-3
 
     def run(self):
-        mean_fitness = []
-        best_fitness = []
-        worst_fitness = []
-        fitness = []
-        individuals = self.fit_gaussian()
-        for individual in individuals:
-            # append to problem
-            self.problem.individuals.append(individual)
-            # add to population
-            individual.population_id = 0
-
-            self.problem.data_store.sync_individual(individual)
-
-        self.evaluate(individuals)
-
-        start = time.time()
-        self.problem.logger.info("CMA_ES: {}/{}".format(self.options['max_population_number'],
-                                                        self.options['max_population_size']))
-        for it in range(self.options['max_population_number']):
-            lists = []
-            for individual in individuals:
-                # fitness.append(individual.costs)
-                lists.append(individual.costs)
-            lists = np.array(lists)
-
-            mean_fitness.append(np.mean(lists))
-            best_fitness.append(np.min(lists))
-            worst_fitness.append(np.max(lists))
-            fitness.append(lists)
-
-            elite = self.take_elite(individuals)
-
-            e_candidates = [i.vector for i in elite]
-
-            self.theta_cov = self.compute_new_cov(e_candidates)
-            self.theta_mean = self.compute_new_mean(e_candidates)
+        with self.evaluator:
+            self.start_termination()
+            mean_fitness = []
+            best_fitness = []
+            worst_fitness = []
+            fitness = []
             individuals = self.fit_gaussian()
-            # individuals = nondominated_truncate(new_individuals, self.options['max_population_size'])
-
-            self.evaluate(individuals)
-
             for individual in individuals:
-                # add to population
-                individual.population_id = it + 1
                 # append to problem
                 self.problem.individuals.append(individual)
-                # sync to datastore
+                # add to population
+                individual.population_id = 0
+
                 self.problem.data_store.sync_individual(individual)
 
-        t = time.time() - start
-        self.problem.logger.info("CMA_ES: elapsed time: {} s".format(t))
-        # sync changed individual informations
-        self.problem.data_store.sync_all()
+            self.evaluate(individuals)
+
+            start = time.time()
+            self.problem.logger.info("CMA_ES: {}/{}".format(self.options['max_population_number'],
+                                                            self.options['max_population_size']))
+            for it in range(self.options['max_population_number']):
+                if not self.do_continue(individuals):
+                    break
+
+                lists = []
+                for individual in individuals:
+                    # fitness.append(individual.costs)
+                    lists.append(individual.costs)
+                lists = np.array(lists)
+
+                mean_fitness.append(np.mean(lists))
+                best_fitness.append(np.min(lists))
+                worst_fitness.append(np.max(lists))
+                fitness.append(lists)
+
+                elite = self.take_elite(individuals)
+
+                e_candidates = [i.vector for i in elite]
+
+                self.theta_cov = self.compute_new_cov(e_candidates)
+                self.theta_mean = self.compute_new_mean(e_candidates)
+                individuals = self.fit_gaussian()
+                # individuals = nondominated_truncate(new_individuals, self.options['max_population_size'])
+
+                self.evaluate(individuals)
+
+                for individual in individuals:
+                    # add to population
+                    individual.population_id = it + 1
+                    # append to problem
+                    self.problem.individuals.append(individual)
+                    # sync to datastore
+                    self.problem.data_store.sync_individual(individual)
+
+            t = time.time() - start
+            self.problem.logger.info("CMA_ES: elapsed time: {} s".format(t))
+            # sync changed individual informations
+            self.problem.data_store.sync_all()
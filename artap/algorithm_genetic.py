@@ -2,10 +2,11 @@ import time
 from copy import deepcopy
 from .algorithm import Algorithm
 from .operators import RandomGenerator, SimulatedBinaryCrossover, \
-    PmMutator, TournamentSelector, EpsilonDominance, nondominated_truncate, crowding_distance
+    PmMutator, TournamentSelector, nondominated_truncate, crowding_distance
 from .problem import Problem
-from .archive import Archive
+from .archive import EpsilonBoxArchive
 from .individual import Individual
+from .cache import DuplicateFilter
 
 
 class GeneticAlgorithm(Algorithm):
@@ -21,6 +22,10 @@ class GeneticAlgorithm(Algorithm):
                              desc='max_population_number')
         self.options.declare(name='max_population_size', default=100, lower=1,
                              desc='Maximal number of individuals in population')
+        self.options.declare(name='exclude_evaluated', default=False,
+                             desc='Offsprings do not repeat the points evaluated in the previous generations')
+        self.options.declare(name='max_duplicates', default=1000, lower=0,
+                             desc='Maximal number of rejected duplicates in one generation (then they are accepted)')
 
         self.problem = problem
         self.__only_single_objective = False
@@ -32,19 +37,32 @@ class GeneticAlgorithm(Algorithm):
         self.mutator = None
         self.crossover = None
 
+        # points of the evaluated individuals (option exclude_evaluated)
+        self.evaluated = DuplicateFilter(self.problem)
+        self._evaluated_individuals = None
+        self._evaluated_count = 0
+
+    def select_parents(self, parents, archive=None):
+        parent1 = self.selector.select(parents)
+
+        if archive:
+            if len(archive) <= 1:
+                parent2 = self.selector.select(parents)
+            else:
+                parent2 = archive.rand_choice()
+        else:
+            parent2 = self.selector.select(parents)
+
+        return parent1, parent2
+
     def generate(self, parents, archive=None):
+        if hasattr(self.crossover, "cross_batch") and hasattr(self.mutator, "mutate_batch"):
+            return self.generate_batch(parents, archive)
 
         offsprings = []
+        visited = self.visited_points(parents)
         while len(offsprings) < self.options['max_population_size']:
-            parent1 = self.selector.select(parents)
-
-            if archive:
-                if len(archive) <= 1:
-                    parent2 = self.selector.select(parents)
-                else:
-                    parent2 = archive.rand_choice()
-            else:
-                parent2 = self.selector.select(parents)
+            parent1, parent2 = self.select_parents(parents, archive)
 
             # crossover
             vector_1, vector_2 = self.crossover.cross(parent1.vector, parent2.vector)
@@ -54,26 +72,73 @@ class GeneticAlgorithm(Algorithm):
             child1.vector = self.mutator.mutate(child1.vector, child2.vector)
             child2.vector = self.mutator.mutate(child2.vector, child1.vector)
 
-            # always create new individual
-            if len(offsprings) == 0:
-                offsprings.append(child1)
+            self.add_offsprings(offsprings, visited, child1, child2)
 
-            if any(child1 == offspring for offspring in offsprings) and (len(offsprings) < self.options[
-                'max_population_size']):
-                pass
-            else:
-                offsprings.append(child1)
+        if self.options['exclude_evaluated']:
+            self.evaluated.update(offsprings)
+
+        return offsprings
+
+    def generate_batch(self, parents, archive=None):
+        """ Crosses and mutates all selected pairs of parents at once (cross_batch and mutate_batch). """
+        lower, upper = self.crossover.bounds()
+
+        offsprings = []
+        visited = self.visited_points(parents)
+        while len(offsprings) < self.options['max_population_size']:
+            n = (self.options['max_population_size'] - len(offsprings) + 1) // 2
+            pairs = [self.select_parents(parents, archive) for _ in range(n)]
+
+            # crossover
+            vectors_1, vectors_2 = self.crossover.cross_batch([parent1.vector for parent1, _ in pairs],
+                                                              [parent2.vector for _, parent2 in pairs], lower, upper)
+            # mutation
+            vectors_1 = self.mutator.mutate_batch(vectors_1, lower, upper).tolist()
+            vectors_2 = self.mutator.mutate_batch(vectors_2, lower, upper).tolist()
 
-            if any(child2 == offspring for offspring in offsprings) and (len(offsprings) < self.options[
-                'max_population_size']):
-                pass
-            elif len(offsprings) < self.options['max_population_size']:
-                offsprings.append(child2)
+            for (parent1, _), vector_1, vector_2 in zip(pairs, vectors_1, vectors_2):
+                self.add_offsprings(offsprings, visited, parent1.__class__(vector_1), parent1.__class__(vector_2))
+
+        if self.options['exclude_evaluated']:
+            self.evaluated.update(offsprings)
 
         return offsprings
 
+    def visited_points(self, parents):
+        """
+        Returns the filter of the duplicate offsprings, it contains the points evaluated in the previous generations
+        (the generated offsprings and the individuals of the problem) if the option exclude_evaluated is set.
+        """
+        if not self.options['exclude_evaluated']:
+            return DuplicateFilter(self.problem)
+
+        # the evaluated points are collected incrementally, the filter is rebuilt if the individuals were replaced
+        individuals = self.problem.individuals
+        if individuals is not self._evaluated_individuals or len(individuals) < self._evaluated_count:
+            self.evaluated.clear()
+            self._evaluated_individuals = individuals
+            self._evaluated_count = 0
+        self.evaluated.update(individuals[self._evaluated_count:])
+        self._evaluated_count = len(individuals)
+
+        # the evaluated points are shared, only the parents are added to the filter of the generation
+        visited = DuplicateFilter(self.problem, base=self.evaluated)
+        visited.update(parents)
+        return visited
+
+    def add_offsprings(self, offsprings, visited, child1, child2):
+        """ Appends the children, which are not duplicates of the offsprings (or of the evaluated individuals). """
+        for child in [child1, child2]:
+            if len(offsprings) >= self.options['max_population_size']:
+                return
+
+            if visited.add(child) or visited.rejected > self.options['max_duplicates']:
+                # the duplicates are accepted if the search space is (nearly) exhausted
+                offsprings.append(child)
+
     def run(self):
-        pass
+        with self.evaluator:
+            pass
 
 
 class IndividualEpsMOEA(Individual):
@@ -115,69 +180,74 @@ class EpsMOEA(GeneticAlgorithm):
         self.archive = None
 
     def run(self):
-        # set random generator
-        self.generator = RandomGenerator(self.problem.parameters)
-        self.generator.init(self.options['max_population_size'])
-        # set crossover
-        self.crossover = SimulatedBinaryCrossover(self.problem.parameters, self.options['prob_cross'])
-        self.mutator = PmMutator(self.problem.parameters, self.options['prob_mutation'])
-        # one individual is selected from the archive and one from the population to create a new individual
-        self.selector = TournamentSelector(self.problem.parameters)
-
-        # create initial population
-        vectors = self.generator.generate()
-        individuals = []
-        for vector in vectors:
-            individuals.append(IndividualEpsMOEA(vector))
-
-        for individual in individuals:
-            # append to problem
-            self.problem.individuals.append(individual)
-            # add to population
-            individual.population_id = 0
-
-        # an archive to collect the eps-dominated solutions
-        self.archive = Archive(dominance=EpsilonDominance(epsilons=self.options['epsilons']))
-
-        # evaluate individuals
-        self.evaluator.evaluate(individuals)
-
-        # archiving the eps-dominating solutions
-        for individual in individuals:
-            self.archive.add(individual)
-
-        # sync to datastore
-        for individual in individuals:
-            self.problem.data_store.sync_individual(individual)
-
-        t_s = time.time()
-        self.problem.logger.info(
-            "Eps-MOEA: {}/{}".format(self.options['max_population_number'], self.options['max_population_size']))
-
-        for it in range(self.options['max_population_number']):
-            # generate and evaluate the next generation
-            offsprings = self.generate(individuals, archive=self.archive)
-            self.evaluator.evaluate(offsprings)
-
-            # pop-acceptance procedure, the dominating offsprings will be preserved in the population and  in the archive
-            for individual in offsprings:
-                # pareto dominated solutions
-                self.selector.pop_acceptance(individuals, individual)
-                # archived solutions
-                self.archive.add(individual)
-
-                # add to population
-                individual.population_id = it + 1
+        with self.evaluator:
+            self.start_termination()
+            # set random generator
+            self.generator = RandomGenerator(self.problem.parameters)
+            self.generator.init(self.options['max_population_size'])
+            # set crossover
+            self.crossover = SimulatedBinaryCrossover(self.problem.parameters, self.options['prob_cross'])
+            self.mutator = PmMutator(self.problem.parameters, self.options['prob_mutation'])
+            # one individual is selected from the archive and one from the population to create a new individual
+            self.selector = TournamentSelector(self.problem.parameters)
+
+            # create initial population
+            vectors = self.generator.generate()
+            individuals = []
+            for vector in vectors:
+                individuals.append(IndividualEpsMOEA(vector))
+
+            for individual in individuals:
                 # append to problem
                 self.problem.individuals.append(individual)
-                # sync to datastore
+                # add to population
+                individual.population_id = 0
+
+            # an archive to collect the eps-dominated solutions
+            self.archive = EpsilonBoxArchive(epsilons=self.options['epsilons'])
+
+            # evaluate individuals
+            self.evaluator.evaluate(individuals)
+
+            # archiving the eps-dominating solutions
+            for individual in individuals:
+                self.archive.add(individual)
+
+            # sync to datastore
+            for individual in individuals:
                 self.problem.data_store.sync_individual(individual)
 
-            # make a new population from the previous population
-            # individuals = offsprings
+            t_s = time.time()
+            self.problem.logger.info(
+                "Eps-MOEA: {}/{}".format(self.options['max_population_number'], self.options['max_population_size']))
+
+            for it in range(self.options['max_population_number']):
+                if not self.do_continue(individuals):
+                    break
+
+                # generate and evaluate the next generation
+                offsprings = self.generate(individuals, archive=self.archive)
+                self.evaluator.evaluate(offsprings)
+
+                # pop-acceptance procedure, the dominating offsprings will be preserved in the population and  in the archive
+                for individual in offsprings:
+                    # pareto dominated solutions
+                    self.selector.pop_acceptance(individuals, individual)
+                    # archived solutions
+                    self.archive.add(individual)
+
+                    # add to population
+                    individual.population_id = it + 1
+                    # append to problem
+                    self.problem.individuals.append(individual)
+                    # sync to datastore
+                    self.problem.data_store.sync_individual(individual)
+
+                # make a new population from the previous population
+                # individuals = offsprings
 
-        t = time.time() - t_s
-        self.problem.logger.info("Eps-MOEA: {} s".format(t))
+            t = time.time() - t_s
+            self.problem.logger.info("Eps-MOEA: {} s".format(t))
 
-        # sync changed individual informations
-        self.problem.data_store.sync_all()
+            # sync changed individual informations
+            self.problem.data_store.sync_all()
@@ -130,59 +130,60 @@ class GradientDescent(GeneticAlgorithm):
         return individuals
 
     def run(self):
-        # optimization
-        t_s = time.time()
-        self.problem.logger.info("GradientDescent")
+        with self.evaluator:
+            # optimization
+            t_s = time.time()
+            self.problem.logger.info("GradientDescent")
 
-        # cache
-        self.adam_t = 0
-        self.cache_grad = [0] * len(self.problem.parameters)
-        self.cache_grad_sqr = [0] * len(self.problem.parameters)
+            # cache
+            self.adam_t = 0
+            self.cache_grad = [0] * len(self.problem.parameters)
+            self.cache_grad_sqr = [0] * len(self.problem.parameters)
 
-        # generate initial point
-        individuals = self.generate()
+            # generate initial point
+            individuals = self.generate()
 
-        # append to problem
-        for individual in individuals:
             # append to problem
-            self.problem.individuals.append(individual)
-            # add to population
-            individual.population_id = 0
-
-        self.evaluate(individuals)
-
-        for j in range(self.options["n_iterations"]):
-            new_individuals = []
             for individual in individuals:
-                # get new position
-                if self.options["algorithm"] == "fixed":
-                    x = self.step_fixed(individual)
-                elif self.options["algorithm"] == "adaptive":
-                    x = self.step_adaptive(individual)
-                elif self.options["algorithm"] == "adagrad":
-                    x = self.step_adagrad(individual)
-                elif self.options["algorithm"] == "rmsprop":
-                    x = self.step_rmsprop(individual)
-                elif self.options["algorithm"] == "adam":
-                    x = self.step_adam(individual)
-                else:
-                    raise "Algorithm '{}' is defined.".format(self.options["algorithm"])
-
-                # create a new individual
-                individual = Individual(x)
-                individual.population_id = j + 1
-                new_individuals.append(individual)
-
                 # append to problem
                 self.problem.individuals.append(individual)
-                # sync to datastore
-                self.problem.data_store.sync_individual(individual)
-
-            self.evaluate(new_individuals)
-            individuals = new_individuals
-
-        t = time.time() - t_s
-        self.problem.logger.info("GradientDescent: elapsed time: {} s".format(t))
-
-        # sync changed individual informations
-        self.problem.data_store.sync_all()
+                # add to population
+                individual.population_id = 0
+
+            self.evaluate(individuals)
+
+            for j in range(self.options["n_iterations"]):
+                new_individuals = []
+                for individual in individuals:
+                    # get new position
+                    if self.options["algorithm"] == "fixed":
+                        x = self.step_fixed(individual)
+                    elif self.options["algorithm"] == "adaptive":
+                        x = self.step_adaptive(individual)
+                    elif self.options["algorithm"] == "adagrad":
+                        x = self.step_adagrad(individual)
+                    elif self.options["algorithm"] == "rmsprop":
+                        x = self.step_rmsprop(individual)
+                    elif self.options["algorithm"] == "adam":
+                        x = self.step_adam(individual)
+                    else:
+                        raise "Algorithm '{}' is defined.".format(self.options["algorithm"])
+
+                    # create a new individual
+                    individual = Individual(x)
+                    individual.population_id = j + 1
+                    new_individuals.append(individual)
+
+                    # append to problem
+                    self.problem.individuals.append(individual)
+                    # sync to datastore
+                    self.problem.data_store.sync_individual(individual)
+
+                self.evaluate(new_individuals)
+                individuals = new_individuals
+
+            t = time.time() - t_s
+            self.problem.logger.info("GradientDescent: elapsed time: {} s".format(t))
+
+            # sync changed individual informations
+            self.problem.data_store.sync_all()
@@ -36,37 +36,38 @@ class Monte_Carlo(GeneticAlgorithm):
 
     def run(self):
 
-        individuals = self.generate()
-
-        for individual in individuals:
-            # append to problem
-            self.problem.individuals.append(individual)
-            # add to population
-            individual.population_id = 0
-            self.problem.data_store.sync_individual(individual)
-
-        self.evaluate(individuals)
-
-        start = time.time()
-        self.problem.logger.info("Monte_Carlo: {}/{}".format(self.options['max_population_number'],
-                                                             self.options['max_population_size']))
-        for it in range(self.options['max_population_number']):
-
+        with self.evaluator:
             individuals = self.generate()
-            self.evaluate(individuals)
 
             for individual in individuals:
-                # add to population
-                individual.population_id = it + 1
                 # append to problem
                 self.problem.individuals.append(individual)
-                # sync to datastore
+                # add to population
+                individual.population_id = 0
                 self.problem.data_store.sync_individual(individual)
 
-        t = time.time() - start
-        self.problem.logger.info("Monte_Carlo: elapsed time: {} s".format(t))
-        # sync changed individual informations
-        self.problem.data_store.sync_all()
+            self.evaluate(individuals)
+
+            start = time.time()
+            self.problem.logger.info("Monte_Carlo: {}/{}".format(self.options['max_population_number'],
+                                                                 self.options['max_population_size']))
+            for it in range(self.options['max_population_number']):
+
+                individuals = self.generate()
+                self.evaluate(individuals)
+
+                for individual in individuals:
+                    # add to population
+                    individual.population_id = it + 1
+                    # append to problem
+                    self.problem.individuals.append(individual)
+                    # sync to datastore
+                    self.problem.data_store.sync_individual(individual)
+
+            t = time.time() - start
+            self.problem.logger.info("Monte_Carlo: elapsed time: {} s".format(t))
+            # sync changed individual informations
+            self.problem.data_store.sync_all()
 
 
 class Numerical_Integrator(GeneticAlgorithm):
@@ -94,44 +95,45 @@ class Numerical_Integrator(GeneticAlgorithm):
         return individuals
 
     def run(self):
-        individuals = self.generate()
-        for individual in individuals:
-            # append to problem
-            self.problem.individuals.append(individual)
-            # add to population
-            individual.population_id = 0
+        with self.evaluator:
+            individuals = self.generate()
+            for individual in individuals:
+                # append to problem
+                self.problem.individuals.append(individual)
+                # add to population
+                individual.population_id = 0
 
-            individual.vector[0] = individual.vector[0] * (self.a + (self.b - self.a))
+                individual.vector[0] = individual.vector[0] * (self.a + (self.b - self.a))
 
-        self.evaluate(individuals)
+            self.evaluate(individuals)
 
-        start = time.time()
-        self.problem.logger.info("Monte_Carlo: {}/{}".format(self.options['max_population_number'],
-                                                             self.options['max_population_size']))
-        for it in range(self.options['max_population_number']):
+            start = time.time()
+            self.problem.logger.info("Monte_Carlo: {}/{}".format(self.options['max_population_number'],
+                                                                 self.options['max_population_size']))
+            for it in range(self.options['max_population_number']):
 
-            individuals = []
-            individuals = self.generate()
+                individuals = []
+                individuals = self.generate()
 
-            for individual in individuals:
-                individual.vector[0] = individual.vector[0] * (self.a + (self.b - self.a))
+                for individual in individuals:
+                    individual.vector[0] = individual.vector[0] * (self.a + (self.b - self.a))
 
-            self.evaluate(individuals)
+                self.evaluate(individuals)
 
-            for individual in individuals:
-                # individual.costs[0] = result
-                # add to population
-                individual.population_id = it + 1
-                # append to problem
-                self.problem.individuals.append(individual)
-                # sync to datastore
-                self.problem.data_store.sync_individual(individual)
+                for individual in individuals:
+                    # individual.costs[0] = result
+                    # add to population
+                    individual.population_id = it + 1
+                    # append to problem
+                    self.problem.individuals.append(individual)
+                    # sync to datastore
+                    self.problem.data_store.sync_individual(individual)
 
-            # self.calculate_integral()
-        t = time.time() - start
-        self.problem.logger.info("Monte_Carlo: elapsed time: {} s".format(t))
-        # sync changed individual informations
-        self.problem.data_store.sync_all()
+                # self.calculate_integral()
+            t = time.time() - start
+            self.problem.logger.info("Monte_Carlo: elapsed time: {} s".format(t))
+            # sync changed individual informations
+            self.problem.data_store.sync_all()
 
 
 class ImportanceSampling(Monte_Carlo):
@@ -172,34 +174,35 @@ class ImportanceSampling(Monte_Carlo):
         return individuals
 
     def run(self):
-        individuals = self.generate()
-        for individual in individuals:
-            # append to problem
-            self.problem.individuals.append(individual)
-            # add to population
-            individual.population_id = 0
-
-            self.problem.data_store.sync_individual(individual)
-
-        start = time.time()
-        self.problem.logger.info("ImportanceSampling: {}/{}".format(self.options['max_population_number'],
-                                                                    self.options['max_population_size']))
-        for it in range(self.options['max_population_number']):
-
-            self.evaluate(individuals)
-
+        with self.evaluator:
+            individuals = self.generate()
             for individual in individuals:
-                # add to population
-                individual.population_id = it + 1
                 # append to problem
                 self.problem.individuals.append(individual)
-                # sync to datastore
+                # add to population
+                individual.population_id = 0
+
                 self.problem.data_store.sync_individual(individual)
 
-        t = time.time() - start
-        self.problem.logger.info("ImportanceSampling: elapsed time: {} s".format(t))
-        # sync changed individual informations
-        self.problem.data_store.sync_all()
+            start = time.time()
+            self.problem.logger.info("ImportanceSampling: {}/{}".format(self.options['max_population_number'],
+                                                                        self.options['max_population_size']))
+            for it in range(self.options['max_population_number']):
+
+                self.evaluate(individuals)
+
+                for individual in individuals:
+                    # add to population
+                    individual.population_id = it + 1
+                    # append to problem
+                    self.problem.individuals.append(individual)
+                    # sync to datastore
+                    self.problem.data_store.sync_individual(individual)
+
+            t = time.time() - start
+            self.problem.logger.info("ImportanceSampling: elapsed time: {} s".format(t))
+            # sync changed individual informations
+            self.problem.data_store.sync_all()
 
 
 class Rejection_Sampling(Monte_Carlo):
@@ -252,31 +255,32 @@ class Rejection_Sampling(Monte_Carlo):
         return individuals
 
     def run(self):
-        individuals = self.generate()
-        for individual in individuals:
-            # append to problem
-            self.problem.individuals.append(individual)
-            # add to population
-            individual.population_id = 0
-
-            self.problem.data_store.sync_individual(individual)
-        self.evaluate(individuals)
-        start = time.time()
-        self.problem.logger.info("Rejection_Sampling: {}/{}".format(self.options['max_population_number'],
-                                                                    self.options['max_population_size']))
-        for it in range(self.options['max_population_number']):
+        with self.evaluator:
             individuals = self.generate()
-            self.evaluate(individuals)
-
             for individual in individuals:
-                # add to population
-                individual.population_id = it + 1
                 # append to problem
                 self.problem.individuals.append(individual)
-                # sync to datastore
-                self.problem.data_store.sync_individual(individual)
+                # add to population
+                individual.population_id = 0
 
-        t = time.time() - start
-        self.problem.logger.info("Rejection_Sampling: elapsed time: {} s".format(t))
-        # sync changed individual informations
-        self.problem.data_store.sync_all()
+                self.problem.data_store.sync_individual(individual)
+            self.evaluate(individuals)
+            start = time.time()
+            self.problem.logger.info("Rejection_Sampling: {}/{}".format(self.options['max_population_number'],
+                                                                        self.options['max_population_size']))
+            for it in range(self.options['max_population_number']):
+                individuals = self.generate()
+                self.evaluate(individuals)
+
+                for individual in individuals:
+                    # add to population
+                    individual.population_id = it + 1
+                    # append to problem
+                    self.problem.individuals.append(individual)
+                    # sync to datastore
+                    self.problem.data_store.sync_individual(individual)
+
+            t = time.time() - start
+            self.problem.logger.info("Rejection_Sampling: elapsed time: {} s".format(t))
+            # sync changed individual informations
+            self.problem.data_store.sync_all()
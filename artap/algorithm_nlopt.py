@@ -80,67 +80,68 @@ class NLopt(Algorithm):
         # return result
 
     def run(self):
-        # Figure out bounds vectors.
-        lb = []
-        ub = []
-        for parameter in self.problem.parameters:
-            bounds = parameter['bounds']
-
-            lb.append(bounds[0])
-            ub.append(bounds[1])
-
-        op = nlopt.opt(self.options['algorithm'], len(self.problem.parameters))
-        op.set_lower_bounds(lb)
-        op.set_upper_bounds(ub)
-        op.set_min_objective(self._function)
-        op.set_xtol_rel(self.options['xtol_rel'])
-        op.set_xtol_abs(self.options['xtol_abs'])
-        op.set_ftol_rel(self.options['ftol_rel'])
-        op.set_ftol_abs(self.options['ftol_abs'])
-        op.set_maxeval(self.options['n_iterations'])
-        # constraint
-        # op.add_inequality_mconstraint(self._inequality_constraint, [1e-8, 1e-8])
-
-        try:
-            t_s = time.time()
-
-            self.problem.logger.info("NLopt: {}".format(op.get_algorithm_name()))
-            x = op.optimize(self.problem.get_initial_values())
-            # print('initial values:',x)
-
-            t = time.time() - t_s
-            self.problem.logger.info("NLopt: elapsed time: {} s".format(t))
-
-            # sync changed individual informations
-            self.problem.data_store.sync_all()
-
-            """
+        with self.evaluator:
+            # Figure out bounds vectors.
+            lb = []
+            ub = []
+            for parameter in self.problem.parameters:
+                bounds = parameter['bounds']
+
+                lb.append(bounds[0])
+                ub.append(bounds[1])
+
+            op = nlopt.opt(self.options['algorithm'], len(self.problem.parameters))
+            op.set_lower_bounds(lb)
+            op.set_upper_bounds(ub)
+            op.set_min_objective(self._function)
+            op.set_xtol_rel(self.options['xtol_rel'])
+            op.set_xtol_abs(self.options['xtol_abs'])
+            op.set_ftol_rel(self.options['ftol_rel'])
+            op.set_ftol_abs(self.options['ftol_abs'])
+            op.set_maxeval(self.options['n_iterations'])
+            # constraint
+            # op.add_inequality_mconstraint(self._inequality_constraint, [1e-8, 1e-8])
+
+            try:
+                t_s = time.time()
+
+                self.problem.logger.info("NLopt: {}".format(op.get_algorithm_name()))
+                x = op.optimize(self.problem.get_initial_values())
+                # print('initial values:',x)
+
+                t = time.time() - t_s
+                self.problem.logger.info("NLopt: elapsed time: {} s".format(t))
+
+                # sync changed individual informations
+                self.problem.data_store.sync_all()
+
+                """
+                if self.options['verbose_level'] >= 1:
+                    print('method: ', op.get_algorithm_name())
+                    print('optimum at ', x)
+                    print('minimum value = ', op.last_optimum_value())
+                    print('nevals = ', op.get_numevals())
+                """
+            except RuntimeError:
+                print('Optimization FAILED.')
+                print(op.get_errmsg())
+            except ValueError:
+                print('Optimization FAILED.')
+                print(op.get_errmsg())
+
+            msg_nlopt = {-1: 'failure - generic failure code',
+                         -2: 'failure - invalid arguments',
+                         -3: 'failure - out of memory',
+                         -4: 'failure - round off limited',
+                         -5: 'failure - forced stop',
+                          1: 'success - generic success code',
+                          2: 'success - stop value reached',
+                          3: 'success - ftol reached',
+                          4: 'success - xtol reached',
+                          5: 'success - maxeval reached',
+                          6: 'success - maxtime reached'
+                         }
+
             if self.options['verbose_level'] >= 1:
-                print('method: ', op.get_algorithm_name())
-                print('optimum at ', x)
-                print('minimum value = ', op.last_optimum_value())
-                print('nevals = ', op.get_numevals())
-            """
-        except RuntimeError:
-            print('Optimization FAILED.')
-            print(op.get_errmsg())
-        except ValueError:
-            print('Optimization FAILED.')
-            print(op.get_errmsg())
-
-        msg_nlopt = {-1: 'failure - generic failure code',
-                     -2: 'failure - invalid arguments',
-                     -3: 'failure - out of memory',
-                     -4: 'failure - round off limited',
-                     -5: 'failure - forced stop',
-                      1: 'success - generic success code',
-                      2: 'success - stop value reached',
-                      3: 'success - ftol reached',
-                      4: 'success - xtol reached',
-                      5: 'success - maxeval reached',
-                      6: 'success - maxtime reached'
-                     }
-
-        if self.options['verbose_level'] >= 1:
-            print('optimum = ', op.last_optimum_value())
-            print('result code and meaning = ', op.last_optimize_result(), msg_nlopt[op.last_optimize_result()])
+                print('optimum = ', op.last_optimum_value())
+                print('result code and meaning = ', op.last_optimize_result(), msg_nlopt[op.last_optimize_result()])
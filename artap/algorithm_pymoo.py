@@ -5,7 +5,7 @@ import time
 import numpy as np
 
 try:
-    from pymoo.core.problem import ElementwiseProblem
+    from pymoo.core.problem import ElementwiseProblem, Problem as BatchProblem
     from pymoo.factory import get_termination
     from pymoo.optimize import minimize
 
@@ -66,6 +66,54 @@ try:
             out["G"] = inequality_constraints
 
 
+    class MooBatchProblem(BatchProblem):
+        """ Evaluates whole populations, used if the problem offers evaluate_batch. """
+
+        def __init__(self, problem, algorithm, moo_algorithm):
+            self.problem = problem
+            self.algorithm = algorithm
+            self.moo_algorithm = moo_algorithm
+
+            lb = []
+            ub = []
+            for parameter in self.problem.parameters:
+                bounds = parameter['bounds']
+
+                lb.append(bounds[0])
+                ub.append(bounds[1])
+
+            super().__init__(n_var=len(problem.parameters),
+                             n_obj=len(problem.costs),
+                             n_constr=len(problem.constraints),
+                             xl=np.array(lb),
+                             xu=np.array(ub))
+
+        def _evaluate(self, X, out, *args, **kwargs):
+            individuals = [Individual(list(x)) for x in X]
+
+            # evaluate
+            self.algorithm.evaluator.evaluate(individuals)
+
+            costs = []
+            constraints = []
+            for individual in individuals:
+                # append to problem
+                inequality_constraints = self.problem.evaluate_inequality_constraints(individual.vector)
+                inequality_constraints_positive = all(v < 0 for (v) in inequality_constraints)
+
+                if inequality_constraints_positive:
+                    self.problem.individuals.append(individual)
+                    # add to population
+                    individual.population_id = self.moo_algorithm.n_gen
+
+                costs.append(individual.costs)
+                constraints.append(inequality_constraints)
+
+            out["F"] = np.array(costs)
+            if len(self.problem.constraints) > 0:
+                out["G"] = np.array(constraints)
+
+
     class Pymoo(Algorithm):
         def __init__(self, problem, name="pymoo Optimization"):
             super().__init__(problem, name)
@@ -76,56 +124,60 @@ try:
                                  desc='Algorithm')
 
         def run(self):
-            t_s = time.time()
+            with self.evaluator:
+                t_s = time.time()
 
-            self.problem.logger.info("pymoo: {}".format(type(self.options["algorithm"]).__name__))
+                self.problem.logger.info("pymoo: {}".format(type(self.options["algorithm"]).__name__))
 
-            moo_algorithm = self.options["algorithm"]
-            moo_problem = MooProblem(self.problem, self, moo_algorithm)
+                moo_algorithm = self.options["algorithm"]
+                if self.evaluator.job.batch_evaluation():
+                    moo_problem = MooBatchProblem(self.problem, self, moo_algorithm)
+                else:
+                    moo_problem = MooProblem(self.problem, self, moo_algorithm)
 
-            termination = get_termination("n_gen", self.options["n_iterations"])
+                termination = get_termination("n_gen", self.options["n_iterations"])
 
-            moo_algorithm.setup(problem=moo_problem,
-                                termination=termination,
-                                seed=1,
-                                save_history=True,
-                                verbose=self.options["verbose_level"] > 0)
+                moo_algorithm.setup(problem=moo_problem,
+                                    termination=termination,
+                                    seed=1,
+                                    save_history=True,
+                                    verbose=self.options["verbose_level"] > 0)
 
-            # until the algorithm has no terminated
-            while moo_algorithm.has_next():
-                # do the next iteration
-                moo_algorithm.next()
+                # until the algorithm has no terminated
+                while moo_algorithm.has_next():
+                    # do the next iteration
+                    moo_algorithm.next()
 
-                # do same more things, printing, logging, storing or even modifying the algorithm object
-                # print(moo_algorithm.n_gen, moo_algorithm.evaluator.n_eval)
+                    # do same more things, printing, logging, storing or even modifying the algorithm object
+                    # print(moo_algorithm.n_gen, moo_algorithm.evaluator.n_eval)
 
-            # obtain the result objective from the algorithm
-            res = moo_algorithm.result()
+                # obtain the result objective from the algorithm
+                res = moo_algorithm.result()
 
-            t = time.time() - t_s
-            self.problem.logger.info("NLopt: elapsed time: {} s".format(t))
+                t = time.time() - t_s
+                self.problem.logger.info("NLopt: elapsed time: {} s".format(t))
 
-            # create last population
-            if res.X.ndim == 2:
-                for x, f in zip(res.X, res.F):
-                    individual = Individual(list(x))
-                    individual.costs = list(f)
+                # create last population
+                if res.X.ndim == 2:
+                    for x, f in zip(res.X, res.F):
+                        individual = Individual(list(x))
+                        individual.costs = list(f)
+
+                        # append to problem
+                        self.problem.individuals.append(individual)
+                        # add to population
+                        individual.population_id = moo_algorithm.n_gen + 1
+                else:
+                    individual = Individual(list(res.X))
+                    individual.costs = list(res.F)
 
                     # append to problem
                     self.problem.individuals.append(individual)
                     # add to population
                     individual.population_id = moo_algorithm.n_gen + 1
-            else:
-                individual = Individual(list(res.X))
-                individual.costs = list(res.F)
-
-                # append to problem
-                self.problem.individuals.append(individual)
-                # add to population
-                individual.population_id = moo_algorithm.n_gen + 1
 
-            # sync changed individual informations
-            self.problem.data_store.sync_all()
+                # sync changed individual informations
+                self.problem.data_store.sync_all()
 
 except ImportError:
     print("pymoo is not present test skipped")
\ No newline at end of file
@@ -45,53 +45,54 @@ class SALibAlgorithm(Algorithm):
                              desc='Samples')
 
     def run(self):
-        t_s = time.time()
+        with self.evaluator:
+            t_s = time.time()
+
+            # set SALib problem
+            names = []
+            bounds = []
+            for parameter in self.problem.parameters:
+                names.append(parameter['name'])
+                bounds.append(parameter['bounds'])
+
+            self.sa_problem = {'num_vars': len(self.problem.parameters),
+                               'names': names,
+                               'bounds': bounds}
+
+            # generate samples
+            if self.options["method"] == "rbd_fast":
+                self.samples_x = latin_sample(self.sa_problem, self.options["samples"])
+            elif self.options["method"] == "fast":
+                self.samples_x = fast_sample(self.sa_problem, self.options["samples"])
+            elif self.options["method"] == "morris":
+                self.samples_x = morris_sample(self.sa_problem, self.options["samples"], num_levels=4)
+            elif self.options["method"] == "sobol":
+                self.samples_x = sobol_sample(self.sa_problem, self.options["samples"])
+            elif self.options["method"] == "delta":
+                self.samples_x = latin_sample(self.sa_problem, self.options["samples"])
+            elif self.options["method"] == "ff":
+                self.samples_x = ff_sample(self.sa_problem, self.options["samples"])
 
-        # set SALib problem
-        names = []
-        bounds = []
-        for parameter in self.problem.parameters:
-            names.append(parameter['name'])
-            bounds.append(parameter['bounds'])
-
-        self.sa_problem = {'num_vars': len(self.problem.parameters),
-                           'names': names,
-                           'bounds': bounds}
-
-        # generate samples
-        if self.options["method"] == "rbd_fast":
-            self.samples_x = latin_sample(self.sa_problem, self.options["samples"])
-        elif self.options["method"] == "fast":
-            self.samples_x = fast_sample(self.sa_problem, self.options["samples"])
-        elif self.options["method"] == "morris":
-            self.samples_x = morris_sample(self.sa_problem, self.options["samples"], num_levels=4)
-        elif self.options["method"] == "sobol":
-            self.samples_x = sobol_sample(self.sa_problem, self.options["samples"])
-        elif self.options["method"] == "delta":
-            self.samples_x = latin_sample(self.sa_problem, self.options["samples"])
-        elif self.options["method"] == "ff":
-            self.samples_x = ff_sample(self.sa_problem, self.options["samples"])
-
-        individuals = []
-        for vector in self.samples_x:
-            individuals.append(Individual(vector))
+            individuals = []
+            for vector in self.samples_x:
+                individuals.append(Individual(vector))
 
-        # append to problem
-        for individual in individuals:
-            self.problem.individuals.append(individual)
+            # append to problem
+            for individual in individuals:
+                self.problem.individuals.append(individual)
 
-        # evaluate individuals
-        self.evaluate(individuals)
+            # evaluate individuals
+            self.evaluate(individuals)
 
-        for individual in individuals:
-            self.samples_y.append(individual.costs[0]) # TODO: fix index [0]
-        self.samples_y = np.array(self.samples_y)
+            for individual in individuals:
+                self.samples_y.append(individual.costs[0]) # TODO: fix index [0]
+            self.samples_y = np.array(self.samples_y)
 
-        t = time.time() - t_s
-        self.problem.logger.info("Sensitivity: elapsed time: {} s".format(t))
+            t = time.time() - t_s
+            self.problem.logger.info("Sensitivity: elapsed time: {} s".format(t))
 
-        # sync changed individual informations
-        self.problem.data_store.sync_all()
+            # sync changed individual informations
+            self.problem.data_store.sync_all()
 
 
     def analyze(self):
@@ -142,39 +143,40 @@ class Sensitivity(Algorithm):
                              desc='Maximal number of individuals in population')
 
     def run(self):
-        parameters = []
-        for parameter in self.problem.parameters:
-            parameters.append(float(parameter['initial_value']))
-
-        for parameter_name in self.parameters:
-            parameter_values = []
-
-            index = 0
-            selected_parameter = None
-            for parameter in self.parameters:
-                if parameter['name'] == parameter_name['name']:
-                    selected_parameter = parameter
-                    break
-                index += 1
-
-            individuals = []
-            for i in range(self.options['max_population_size']):
-                value = VectorAndNumbers.gen_number(selected_parameter['bounds'], selected_parameter['precision'], 'normal')
-                parameters[index] = value
-                parameter_values.append(value)
-                individual = Individual(parameters.copy())
-                individuals.append(individual)
-
-            self.evaluate(individuals)
-            # costs = []
-            # # TODO: Make also for multi-objective
-            # for individual in individuals:
-            #     costs.append(individual.costs)
-
-        # append individuals
-        for individual in individuals:
-            self.problem.individuals.append(individual)
-
-        # sync changed individual informations
-        self.problem.data_store.sync_all()
+        with self.evaluator:
+            parameters = []
+            for parameter in self.problem.parameters:
+                parameters.append(float(parameter['initial_value']))
+
+            for parameter_name in self.parameters:
+                parameter_values = []
+
+                index = 0
+                selected_parameter = None
+                for parameter in self.parameters:
+                    if parameter['name'] == parameter_name['name']:
+                        selected_parameter = parameter
+                        break
+                    index += 1
+
+                individuals = []
+                for i in range(self.options['max_population_size']):
+                    value = VectorAndNumbers.gen_number(selected_parameter['bounds'], selected_parameter['precision'], 'normal')
+                    parameters[index] = value
+                    parameter_values.append(value)
+                    individual = Individual(parameters.copy())
+                    individuals.append(individual)
+
+                self.evaluate(individuals)
+                # costs = []
+                # # TODO: Make also for multi-objective
+                # for individual in individuals:
+                #     costs.append(individual.costs)
+
+            # append individuals
+            for individual in individuals:
+                self.problem.individuals.append(individual)
+
+            # sync changed individual informations
+            self.problem.data_store.sync_all()
 
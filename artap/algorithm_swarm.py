@@ -1,10 +1,10 @@
-from random import uniform
+import numpy as np
 from .individual import Individual
 from .problem import Problem
 from .algorithm_genetic import GeneticAlgorithm
-from .operators import RandomGenerator, PmMutator, ParetoDominance, EpsilonDominance, crowding_distance, \
-    NonUniformMutation, UniformMutator, CopySelector, SimulatedBinaryCrossover, TournamentSelector
-from .archive import Archive
+from .operators import RandomGenerator, PmMutator, ParetoDominance, crowding_distance, \
+    NonUniformMutation, UniformMutator, CopySelector, SimulatedBinaryCrossover, TournamentSelector, parameter_bounds
+from .archive import Archive, EpsilonBoxArchive
 from copy import copy
 import time
 
@@ -46,37 +46,53 @@ class SwarmAlgorithm(GeneticAlgorithm):
         self.r2_max = 1.0
         self.min_weight = 0.1
         self.max_weight = 0.5
+        # state of the swarm kept between the iterations, one row for every particle (None - read from the features)
+        self.velocities = None
+        self.best_vectors = None
+        self.best_costs = None
 
     def init_pvelocity(self, population):
         pass
 
-    @staticmethod
-    def init_pbest(population):
+    def init_pbest(self, population):
         for individual in population:
             individual.features['best_cost'] = individual.costs_signed
             individual.features['best_vector'] = individual.vector
 
+        self.best_vectors = self.particle_array(population)
+        self.best_costs = [individual.costs_signed for individual in population]
+
+    def reset_state(self):
+        """ Forgets the state of the swarm (at the start of run()). """
+        self.velocities = None
+        self.best_vectors = None
+        self.best_costs = None
+
+    def append_state(self, rows):
+        """ Appends the copies of the rows of the swarm state, for the particles appended to the swarm. """
+        self.velocities = np.concatenate((self.velocities, self.velocities[rows]))
+        self.best_vectors = np.concatenate((self.best_vectors, self.best_vectors[rows]))
+        self.best_costs = self.best_costs + [self.best_costs[row] for row in rows]
+
     @staticmethod
-    def khi(c1: float, c2: float) -> float:
+    def khi(c1, c2):
         """
         Constriction coefficient [1].
         [1] Ebarhart and Kennedym Empirical study of particle swarm optimization,” in Proc. IEEE Int. Congr.
         Evolutionary Computation, vol. 3, 1999, pp. 101–106.
 
-        :param c1: specific parameter to control the particle best component.
-        :param c2: specific parameter to control the global best component.
-        :return: float, constriction coefficient
+        :param c1: specific parameter to control the particle best component (float or array).
+        :param c2: specific parameter to control the global best component (float or array).
+        :return: float (or array), constriction coefficient
         """
-        rho = c1 + c2
-        if rho <= 4:
-            result = 1.0
-        else:
-            result = 2.0 / (2.0 - rho - (rho ** 2.0 - 4.0 * rho) ** 0.5)
+        rho = np.asarray(c1 + c2, dtype=float)
+        with np.errstate(invalid='ignore'):
+            result = np.where(rho <= 4, 1.0, 2.0 / (2.0 - rho - np.sqrt(rho ** 2.0 - 4.0 * rho)))
 
-        return result
+        return result if result.ndim else float(result)
 
     @staticmethod
-    def speed_constriction(velocity, u_bound, l_bound) -> float:
+    def speed_constriction(velocity, u_bound, l_bound):
         """
         Velocity constriction factor [1].
 
@@ -84,62 +100,155 @@ class SwarmAlgorithm(GeneticAlgorithm):
         [1] Nebro, Antonio J., et al. "SMPSO: A new PSO-based metaheuristic for multi-objective optimization."
             2009 IEEE Symposium on Computational Intelligence in Multi-Criteria Decision-Making (MCDM). IEEE, 2009.
 
-        :param velocity: parameter velocity for the i^th component
-        :param u_bound: upper bound
-        :param l_bound: lower bound
+        :param velocity: parameter velocity for the i^th component (or (n, d) array of the velocities)
+        :param u_bound: upper bound (or (d,) array of the upper bounds)
+        :param l_bound: lower bound (or (d,) array of the lower bounds)
         :return:
         """
 
-        delta_i = (u_bound - l_bound) / 2.
+        delta_i = (np.asarray(u_bound) - np.asarray(l_bound)) / 2.
         # user defined max speed
-        velocity = min(velocity, delta_i)
-        velocity = max(velocity, -delta_i)
+        velocity = np.minimum(velocity, delta_i)
+        velocity = np.maximum(velocity, -delta_i)
 
-        return velocity
+        return velocity if velocity.ndim else float(velocity)
 
-    def select_leader(self):
-        pass
+    def bounds(self):
+        """ :return: arrays of the lower and upper bounds of the parameters """
+        return parameter_bounds(self.parameters)
 
-    def inertia_weight(self):
-        pass
+    @staticmethod
+    def particle_array(particles, feature=None):
+        """
+        Collects the state of the swarm to one array.
+
+        :param particles: list of particles
+        :param feature: None - positions of the particles, or the name of a feature ('velocity', 'best_vector')
+        :return: (n, d) array, one row for every particle
+        """
+        if feature is None:
+            return np.array([particle.vector for particle in particles], dtype=float)
+        else:
+            return np.array([particle.features[feature] for particle in particles], dtype=float)
+
+    def particle_velocities(self, particles):
+        """ :return: (n, d) array of the velocities kept by the algorithm (or collected from the features) """
+        if self.velocities is None or len(self.velocities) != len(particles):
+            self.velocities = self.particle_array(particles, 'velocity')
+        return self.velocities
+
+    def particle_best_vectors(self, particles):
+        """ :return: (n, d) array of the particle best vectors kept by the algorithm (or collected from the features) """
+        if self.best_vectors is None or len(self.best_vectors) != len(particles):
+            self.best_vectors = self.particle_array(particles, 'best_vector')
+        return self.best_vectors
+
+    def set_velocities(self, particles, velocities):
+        """ Stores the velocities limited by speed_constriction() to the swarm state and to the particles. """
+        lower, upper = self.bounds()
+        self.velocities = self.speed_constriction(velocities, upper, lower)
+
+        for particle, velocity in zip(particles, self.velocities.tolist()):
+            particle.features['velocity'] = velocity
+
+    def velocity_coefficients(self, n):
+        """ :return: (n, 1) arrays of the random coefficients r1, r2, c1, c2 of the particles """
+        r1 = np.round(np.random.uniform(self.r1_min, self.r1_max, (n, 1)), 1)
+        r2 = np.round(np.random.uniform(self.r2_min, self.r2_max, (n, 1)), 1)
+        c1 = np.round(np.random.uniform(self.c1_min, self.c1_max, (n, 1)), 1)
+        c2 = np.round(np.random.uniform(self.c2_min, self.c2_max, (n, 1)), 1)
+
+        return r1, r2, c1, c2
+
+    def inertia_weights(self, shape):
+        """ :return: array of the inertia weights, every component of the velocity gets its own """
+        return np.random.uniform(self.min_weight, self.max_weight, shape)
+
+    def select_leaders(self, n):
+        """
+        Selects the leader (global best) of every particle at once. The binary tournament: two different leaders
+        are sampled and the one with the bigger crowding distance wins.
+
+        :param n: number of the particles
+        :return: (n, d) array of the leader positions
+        """
+        leaders = list(self.leaders)
+        positions = self.particle_array(leaders)
+
+        if len(leaders) == 1:
+            return np.repeat(positions, n, axis=0)
+
+        distances = np.array([leader.features['crowding_distance'] for leader in leaders], dtype=float)
+        first = np.random.randint(len(leaders), size=n)
+        second = (first + np.random.randint(1, len(leaders), size=n)) % len(leaders)
+        winners = np.where(distances[second] > distances[first], second, first)
+
+        return positions[winners]
+
+    def move_particles(self, particles, rebound):
+        """
+        Moves the particles by their velocities. The particles leaving the search space are stopped at the bounds
+        and their velocity components are multiplied by the rebound factor.
+        """
+        if len(particles) == 0:
+            return
+
+        lower, upper = self.bounds()
+        velocities = self.particle_velocities(particles)
+        positions = self.particle_array(particles) + velocities
+
+        outside = (positions > upper) | (positions < lower)
+        velocities[outside] *= rebound
+        positions = np.clip(positions, lower, upper)
+
+        for particle, position, velocity in zip(particles, positions.tolist(), velocities.tolist()):
+            particle.vector = position
+            particle.features['velocity'] = velocity
 
     def update_global_best(self, offsprings):
         pass
 
     def update_velocity(self, individuals):
-        for individual in individuals:
-            individual.features['velocity'] = [0] * len(individual.vector)
-            global_best = self.select_leader()
+        """
+        Updates the velocities of the whole swarm:
+        khi * (w * pos(i) + c1 * r1 * (best_vector - pos(i)) + c2 * r2 * (global_best - pos(i)))
+        """
+        if len(individuals) == 0:
+            return
 
-            r1 = round(uniform(self.r1_min, self.r1_max), 1)
-            r2 = round(uniform(self.r2_min, self.r2_max), 1)
-            c1 = round(uniform(self.c1_min, self.c1_max), 1)
-            c2 = round(uniform(self.c2_min, self.c2_max), 1)
+        positions = self.particle_array(individuals)
+        best_vectors = self.particle_best_vectors(individuals)
+        global_best = self.select_leaders(len(individuals))
+        r1, r2, c1, c2 = self.velocity_coefficients(len(individuals))
 
-            for i in range(0, len(individual.vector)):
-                momentum = self.inertia_weight() * individual.vector[i]
-                v_cog = c1 * r1 * (individual.features['best_vector'][i] - individual.vector[i])
-                v_soc = c2 * r2 * (global_best.vector[i] - individual.vector[i])
+        momentum = self.inertia_weights(positions.shape) * positions
+        v_cog = c1 * r1 * (best_vectors - positions)
+        v_soc = c2 * r2 * (global_best - positions)
 
-                v = self.khi(c1, c2) * (momentum + v_cog + v_soc)
-                individual.features['velocity'][i] = self.speed_constriction(v, self.parameters[i]['bounds'][1],
-                                                                             self.parameters[i]['bounds'][0])
+        self.set_velocities(individuals, self.khi(c1, c2) * (momentum + v_cog + v_soc))
 
     def update_position(self, population):
         pass
 
     def update_particle_best(self, population):
-        for particle in population:
-            flag = self.dominance.compare(particle.costs_signed, particle.features['best_cost'])
+        if self.best_costs is None or len(self.best_costs) != len(population):
+            self.best_costs = [particle.features['best_cost'] for particle in population]
+        best_vectors = self.particle_best_vectors(population)
+
+        for i, particle in enumerate(population):
+            flag = self.dominance.compare(particle.costs_signed, self.best_costs[i])
             if flag != 2:
                 particle.features['best_cost'] = particle.costs_signed
                 particle.features['best_vector'] = particle.vector
+                self.best_costs[i] = particle.costs_signed
+                best_vectors[i] = particle.vector
 
     def turbulence(self, particles, current_step=0):
         pass
 
     def run(self):
-        pass
+        with self.evaluator:
+            pass
 
 
 class OMOPSO(SwarmAlgorithm):
@@ -173,7 +282,7 @@ class OMOPSO(SwarmAlgorithm):
         # set random generator
         self.generator = RandomGenerator(self.problem.parameters)
         self.leaders = Archive()
-        self.archive = Archive(dominance=EpsilonDominance(epsilons=self.options['epsilons']))
+        self.archive = EpsilonBoxArchive(epsilons=self.options['epsilons'])
 
         self.non_uniform_mutator = NonUniformMutation(self.problem.parameters, self.options['prob_mutation'],
                                                       self.options['max_population_number'])
@@ -181,9 +290,6 @@ class OMOPSO(SwarmAlgorithm):
                                               self.options['max_population_number'])
 
 
-    def inertia_weight(self):
-        return uniform(self.min_weight, self.max_weight)
-
     def turbulence(self, particles, current_step=0):
         """
         OMOPSO applies a combination of uniform and nonuniform
@@ -191,28 +297,19 @@ class OMOPSO(SwarmAlgorithm):
         the swarm, non-uniform to the next 30 %, and no mutation on the particles)
         """
 
-        for i in range(len(particles)):
-            if i % 3 == 0:
-                mutated = self.uniform_mutator.mutate(particles[i].vector)
-            else:
-                mutated = self.non_uniform_mutator.mutate(particles[i].vector, current_step)
-            particles[i].vector = mutated.copy()
-        return
+        if len(particles) == 0:
+            return
 
-    def update_position(self, individuals):
-        for individual in individuals:
-            for parameter, i in zip(self.parameters, range(len(individual.vector))):
-                individual.vector[i] = individual.vector[i] + individual.features['velocity'][i]
+        positions = self.particle_array(particles)
+        uniform_mutated = np.arange(len(particles)) % 3 == 0
+        positions[uniform_mutated] = self.uniform_mutator.mutate_batch(positions[uniform_mutated])
+        positions[~uniform_mutated] = self.non_uniform_mutator.mutate_batch(positions[~uniform_mutated], current_step)
 
-                # adjust maximum position if necessary
-                if individual.vector[i] > parameter['bounds'][1]:
-                    individual.vector[i] = parameter['bounds'][1]
-                    individual.features['velocity'][i] *= -1
+        for particle, position in zip(particles, positions.tolist()):
+            particle.vector = position
 
-                # adjust minimum position if necessary
-                if individual.vector[i] < parameter['bounds'][0]:
-                    individual.vector[i] = parameter['bounds'][0]
-                    individual.features['velocity'][i] *= -1
+    def update_position(self, individuals):
+        self.move_particles(individuals, -1)
 
     def update_global_best(self, swarm):
         """ Manages the leader class in OMOPSO. """
@@ -234,100 +331,70 @@ class OMOPSO(SwarmAlgorithm):
 
         return
 
-    def select_leader(self):
-        """
-        There are different possibilities to select the global best solution.
-        The leader class in this concept contains everybody after the initialization, every individual expected as a
-        leader, we select 2 from them and select the non-dominated as the global best.
-
-        :return:
-        """
-
-        if self.leaders.size() == 1:
-            return self.leaders.rand_choice()
-
-        candidates = self.leaders.rand_sample(2)
-
-        # randomly favourize one of them
-        # best_global = choice(candidates)
-
-        # should select those which has bigger fitness
-        # # if one of them dominates, it will be selected as global best
-        # dom = self.dominance.compare(candidates[0].costs_signed, candidates[1].costs_signed)
-        #
-        # if dom == 1:
-        #     best_global = candidates[0]
-        #
-        # if dom == 2:
-        #     best_global = candidates[1]
-
-        if candidates[1].features['crowding_distance'] > candidates[0].features['crowding_distance']:
-            best_global = candidates[1]
-        else:
-            best_global = candidates[0]
-        return best_global
-
     def run(self):
-        t_s = time.time()
-        self.problem.logger.info("PSO: {}/{}".format(self.options['max_population_number'],
-                                                     self.options['max_population_size']))
-        # update mutators
-        self.non_uniform_mutator = NonUniformMutation(self.problem.parameters, self.options['prob_mutation'],
-                                                      self.options['max_population_number'])
-        self.uniform_mutator = UniformMutator(self.problem.parameters, self.options['prob_mutation'],
-                                              self.options['max_population_number'])
-        # initialize the swarm
-        self.generator.init(self.options['max_population_size'])
-        vectors = self.generator.generate()
-        individuals = []
-        for vector in vectors:
-            individuals.append(IndividualSwarm(vector))
+        with self.evaluator:
+            self.start_termination()
+            self.reset_state()
+            t_s = time.time()
+            self.problem.logger.info("PSO: {}/{}".format(self.options['max_population_number'],
+                                                         self.options['max_population_size']))
+            # update mutators
+            self.non_uniform_mutator = NonUniformMutation(self.problem.parameters, self.options['prob_mutation'],
+                                                          self.options['max_population_number'])
+            self.uniform_mutator = UniformMutator(self.problem.parameters, self.options['prob_mutation'],
+                                                  self.options['max_population_number'])
+            # initialize the swarm
+            self.generator.init(self.options['max_population_size'])
+            vectors = self.generator.generate()
+            individuals = []
+            for vector in vectors:
+                individuals.append(IndividualSwarm(vector))
 
-        for individual in individuals:
-            # append to problem
-            self.problem.individuals.append(individual)
-            # add to population
-            individual.population_id = 0
+            for individual in individuals:
+                # append to problem
+                self.problem.individuals.append(individual)
+                # add to population
+                individual.population_id = 0
 
-        self.evaluate(individuals)
-        self.init_pbest(individuals)
-        self.update_global_best(individuals)
+            self.evaluate(individuals)
+            self.init_pbest(individuals)
+            self.update_global_best(individuals)
 
-        # sync to datastore
-        for individual in individuals:
-            self.problem.data_store.sync_individual(individual)
+            # sync to datastore
+            for individual in individuals:
+                self.problem.data_store.sync_individual(individual)
 
-        it = 0
-        while it < self.options['max_population_number']:
-            offsprings = self.selector.select(individuals)
+            it = 0
+            while it < self.options['max_population_number'] and self.do_continue(individuals):
+                offsprings = self.selector.select(individuals)
 
-            self.update_velocity(offsprings)
-            self.update_position(offsprings)
-            self.turbulence(offsprings, it)
+                self.update_velocity(offsprings)
+                self.update_position(offsprings)
+                self.turbulence(offsprings, it)
 
-            self.evaluate(offsprings)
+                self.evaluate(offsprings)
 
-            self.update_particle_best(offsprings)
-            self.update_global_best(offsprings)
+                self.update_particle_best(offsprings)
+                self.update_global_best(offsprings)
 
-            # update individuals
-            individuals = offsprings
+                # update individuals
+                individuals = offsprings
 
-            for individual in individuals:
-                # add to population
-                individual.population_id = it + 1
-                # append to problem
-                self.problem.individuals.append(individual)
-                # sync to datastore
-                self.problem.data_store.sync_individual(individual)
+                for individual in individuals:
+                    # add to population
+                    individual.population_id = it + 1
+                    # append to problem
+                    self.problem.individuals.append(individual)
+                    # sync to datastore
+                    self.problem.data_store.sync_individual(individual)
 
-            it += 1
+                it += 1
 
-        t = time.time() - t_s
-        self.problem.logger.info("PSO: elapsed time: {} s".format(t))
+            t = time.time() - t_s
+            self.problem.logger.info("PSO: elapsed time: {} s".format(t))
 
-        # sync changed individual informations
-        self.problem.data_store.sync_all()
+            # sync changed individual informations
+            self.problem.data_store.sync_all()
 
 
 class SMPSO(SwarmAlgorithm):
@@ -384,9 +451,6 @@ class SMPSO(SwarmAlgorithm):
         self.min_weight = 0.1
         self.max_weight = 0.1
 
-    def inertia_weight(self):
-        return uniform(self.min_weight, self.max_weight)
-
     def init_pvelocity(self, individuals):
         """
         Inits the particle velocity and its allowed maximum speed.
@@ -396,30 +460,24 @@ class SMPSO(SwarmAlgorithm):
         for individual in individuals:
             # the initial speed is set to zero
             individual.features['velocity'] = [0] * len(individual.vector)
+        self.velocities = np.zeros((len(individuals), len(self.parameters)))
 
         return
 
     def turbulence(self, particles, current_step=0):
         """ SMPSO applies polynomial mutation on 15% of the particles """
 
-        for i in range(len(particles)):
-            if i % 6 == 0:
-                particles[i].vector = self.mutator.mutate(particles[i].vector)
+        if len(particles) == 0:
+            return
 
-    def update_position(self, individuals):
-        for individual in individuals:
-            for parameter, i in zip(self.parameters, range(len(individual.vector))):
-                individual.vector[i] = individual.vector[i] + individual.features['velocity'][i]
+        mutated = particles[::6]
+        positions = self.mutator.mutate_batch(self.particle_array(mutated))
 
-                # adjust maximum position if necessary
-                if individual.vector[i] > parameter['bounds'][1]:
-                    individual.vector[i] = parameter['bounds'][1]
-                    individual.features['velocity'][i] *= 0.001
+        for particle, position in zip(mutated, positions.tolist()):
+            particle.vector = position
 
-                # adjust minimum position if necessary
-                if individual.vector[i] < parameter['bounds'][0]:
-                    individual.vector[i] = parameter['bounds'][0]
-                    individual.features['velocity'][i] *= 0.001
+    def update_position(self, individuals):
+        self.move_particles(individuals, 0.001)
 
     def update_global_best(self, swarm):
         """ Manages the leader class in OMOPSO. """
@@ -434,97 +492,67 @@ class SMPSO(SwarmAlgorithm):
 
         return
 
-    def select_leader(self):
-        """
-        There are different possibilities to select the global best solution.
-        The leader class in this concept contains everybody after the initialization, every individual expected as a
-        leader, we select 2 from them and select the non-dominated as the global best.
-
-        :return:
-        """
-
-        if self.leaders.size() == 1:
-            return self.leaders.rand_choice()
-
-        candidates = self.leaders.rand_sample(2)
-
-        # randomly favourize one of them
-        # best_global = choice(candidates)
-
-        # should select those which has bigger fitness
-        # # if one of them dominates, it will be selected as global best
-        # dom = self.dominance.compare(candidates[0].costs_signed, candidates[1].costs_signed)
-        #
-        # if dom == 1:
-        #     best_global = candidates[0]
-        #
-        # if dom == 2:
-        #     best_global = candidates[1]
-
-        if candidates[1].features['crowding_distance'] > candidates[0].features['crowding_distance']:
-            best_global = candidates[1]
-        else:
-            best_global = candidates[0]
-        return best_global
-
     def run(self):
-        t_s = time.time()
-        self.problem.logger.info("PSO: {}/{}".format(self.options['max_population_number'],
-                                                     self.options['max_population_size']))
-        # initialize the swarm
-        self.generator.init(self.options['max_population_size'])
-        vectors = self.generator.generate()
-        individuals = []
-        for vector in vectors:
-            individuals.append(Individual(vector))
+        with self.evaluator:
+            self.start_termination()
+            self.reset_state()
+            t_s = time.time()
+            self.problem.logger.info("PSO: {}/{}".format(self.options['max_population_number'],
+                                                         self.options['max_population_size']))
+            # initialize the swarm
+            self.generator.init(self.options['max_population_size'])
+            vectors = self.generator.generate()
+            individuals = []
+            for vector in vectors:
+                individuals.append(Individual(vector))
 
-        for individual in individuals:
-            # append to problem
-            self.problem.individuals.append(individual)
-            # add to population
-            individual.population_id = 0
+            for individual in individuals:
+                # append to problem
+                self.problem.individuals.append(individual)
+                # add to population
+                individual.population_id = 0
 
-        self.evaluate(individuals)
+            self.evaluate(individuals)
 
-        self.init_pvelocity(individuals)
-        self.init_pbest(individuals)
-        self.update_global_best(individuals)
+            self.init_pvelocity(individuals)
+            self.init_pbest(individuals)
+            self.update_global_best(individuals)
 
-        # sync to datastore
-        for individual in individuals:
-            self.problem.data_store.sync_individual(individual)
+            # sync to datastore
+            for individual in individuals:
+                self.problem.data_store.sync_individual(individual)
 
-        it = 0
-        while it < self.options['max_population_number']:
-            offsprings = self.selector.select(individuals)
+            it = 0
+            while it < self.options['max_population_number'] and self.do_continue(individuals):
+                offsprings = self.selector.select(individuals)
 
-            self.update_velocity(offsprings)
-            self.update_position(offsprings)
-            self.turbulence(offsprings, it)
+                self.update_velocity(offsprings)
+                self.update_position(offsprings)
+                self.turbulence(offsprings, it)
 
-            self.evaluate(offsprings)
+                self.evaluate(offsprings)
 
-            self.update_particle_best(offsprings)
-            self.update_global_best(offsprings)
+                self.update_particle_best(offsprings)
+                self.update_global_best(offsprings)
 
-            # update individuals
-            individuals = offsprings
+                # update individuals
+                individuals = offsprings
 
-            for individual in individuals:
-                # add to population
-                individual.population_id = it + 1
-                # append to problem
-                self.problem.individuals.append(individual)
-                # sync to datastore
-                self.problem.data_store.sync_individual(individual)
+                for individual in individuals:
+                    # add to population
+                    individual.population_id = it + 1
+                    # append to problem
+                    self.problem.individuals.append(individual)
+                    # sync to datastore
+                    self.problem.data_store.sync_individual(individual)
 
-            it += 1
+                it += 1
 
-        t = time.time() - t_s
-        self.problem.logger.info("PSO: elapsed time: {} s".format(t))
+            t = time.time() - t_s
+            self.problem.logger.info("PSO: elapsed time: {} s".format(t))
 
-        # sync changed individual informations
-        self.problem.data_store.sync_all()
+            # sync changed individual informations
+            self.problem.data_store.sync_all()
 
 
 class PSOGA(SwarmAlgorithm):
@@ -572,12 +600,19 @@ class PSOGA(SwarmAlgorithm):
         self.distribution_index = 1
         self.probability = 1
 
-    def inertia_weight(self):
-        return uniform(self.min_weight, self.max_weight)
-
     def init_pvelocity(self, individuals):
         for individual in individuals:
             individual.features['velocity'] = [0] * len(individual.vector)
+        self.velocities = np.zeros((len(individuals), len(self.parameters)))
+
+    def velocity_coefficients(self, n):
+        """ :return: (n, 1) arrays of the random coefficients, r2 and c2 are sampled from the ranges of r1 and c1 """
+        r1 = np.round(np.random.uniform(self.r1_min, self.r1_max, (n, 1)), 1)
+        r2 = np.round(np.random.uniform(self.r1_min, self.r1_max, (n, 1)), 1)
+        c1 = np.round(np.random.uniform(self.c1_min, self.c1_max, (n, 1)), 1)
+        c2 = np.round(np.random.uniform(self.c1_min, self.c1_max, (n, 1)), 1)
+
+        return r1, r2, c1, c2
 
     def update_velocity(self, individuals):
         """
@@ -586,53 +621,23 @@ class PSOGA(SwarmAlgorithm):
         @return: update individual.features['velocity']
         """
 
-        for individual in individuals:
-            individual.features['velocity'] = [0] * len(individual.vector)
-            global_best = self.select_leader()
-
-            r1 = round(uniform(self.r1_min, self.r1_max), 1)
-            r2 = round(uniform(self.r1_min, self.r1_max), 1)
-            c1 = round(uniform(self.c1_min, self.c1_max), 1)
-            c2 = round(uniform(self.c1_min, self.c1_max), 1)
-
-            for i in range(0, len(individual.vector)):
-                lb = self.parameters[i]['bounds'][0]
-                ub = self.parameters[i]['bounds'][1]
-                w = self.khi(c1, c2)
-                momentum = w * individual.vector[i]
-                v_cog = c1 * r1 * (individual.features['best_vector'][i] - individual.vector[i])
-                v_soc = c2 * r2 * (global_best.vector[i] - individual.vector[i])
+        if len(individuals) == 0:
+            return
 
-                v = momentum + v_cog + v_soc
-                individual.features['velocity'][i] = self.speed_constriction(v, ub, lb)
+        positions = self.particle_array(individuals)
+        best_vectors = self.particle_best_vectors(individuals)
+        global_best = self.select_leaders(len(individuals))
+        r1, r2, c1, c2 = self.velocity_coefficients(len(individuals))
 
-    def select_leader(self):
+        w = self.khi(c1, c2)
+        momentum = w * positions
+        v_cog = c1 * r1 * (best_vectors - positions)
+        v_soc = c2 * r2 * (global_best - positions)
 
-        if self.leaders.size() == 1:
-            return self.leaders.rand_choice()
-
-        candidates = self.leaders.rand_sample(2)
-
-        if candidates[1].features['crowding_distance'] > candidates[0].features['crowding_distance']:
-            best_global = candidates[1]
-        else:
-            best_global = candidates[0]
-        return best_global
+        self.set_velocities(individuals, momentum + v_cog + v_soc)
 
     def update_position(self, individuals):
-        for individual in individuals:
-            for parameter, i in zip(self.parameters, range(len(individual.vector))):
-                individual.vector[i] = individual.vector[i] + individual.features['velocity'][i]
-
-                if individual.vector[i] > parameter['bounds'][1]:
-                    individual.vector[i] = parameter['bounds'][1]
-                    individual.features['velocity'][i] *= -1
-
-                if individual.vector[i] < parameter['bounds'][0]:
-                    individual.vector[i] = parameter['bounds'][0]
-                    individual.features['velocity'][i] *= -1
-
-            # self.makeinteger(individual.vector)
+        self.move_particles(individuals, -1)
 
     def update_global_best(self, swarm):
         crowding_distance(swarm)
@@ -642,71 +647,76 @@ class PSOGA(SwarmAlgorithm):
         return
 
     def run(self):
-        start = time.time()
-        self.problem.logger.info("PSOGA: {}/{}".format(self.options['max_population_number'],
-                                                       self.options['max_population_size']))
-        # initialization of swarm
-        self.generator.init(self.options['max_population_size'])
-        vectors = self.generator.generate()
-        individuals = []
-        for vector in vectors:
-            individuals.append(IndividualSwarm(vector))
-
-        for individual in individuals:
-            # append to problem
-            self.problem.individuals.append(individual)
-
-            # add to population
-            individual.population_id = 0
-
-            self.problem.data_store.sync_individual(individual)
-
-        self.evaluate(individuals)
-        self.init_pvelocity(individuals)
-        self.init_pbest(individuals)
-        self.update_global_best(individuals)
-
-        it = 0
-        while it < self.options['max_population_number']:
-            offsprings = self.offspring_selector.select(individuals)
-
-            # PSO operators
-            self.update_velocity(offsprings)
-            self.update_position(offsprings)
-            self.evaluate(offsprings)
-
-            # GA operators
-            first_selected = self.selector.select(offsprings)
-            second_selected = self.selector.select(offsprings)
-            vector1, vector2 = self.crossover.cross(first_selected.vector, second_selected.vector)
-            vector1 = self.mutator.mutate(vector1)
-            vector2 = self.mutator.mutate(vector2)
-
-            # ToDo: Make it clean
-            offspring1 = IndividualSwarm(vector1)
-            offspring2 = IndividualSwarm(vector2)
-            offspring1.features = first_selected.features
-            offspring2.features = second_selected.features
-            offsprings.append(offspring1)
-            offsprings.append(offspring2)
-
-            self.evaluate(offsprings)
-            self.update_particle_best(offsprings)
-            self.update_global_best(offsprings)
-
-            # update individuals
-            individuals = offsprings
+        with self.evaluator:
+            self.start_termination()
+            self.reset_state()
+            start = time.time()
+            self.problem.logger.info("PSOGA: {}/{}".format(self.options['max_population_number'],
+                                                           self.options['max_population_size']))
+            # initialization of swarm
+            self.generator.init(self.options['max_population_size'])
+            vectors = self.generator.generate()
+            individuals = []
+            for vector in vectors:
+                individuals.append(IndividualSwarm(vector))
 
             for individual in individuals:
-                # add to population
-                individual.population_id = it + 1
                 # append to problem
                 self.problem.individuals.append(individual)
-                # sync to datastore
+
+                # add to population
+                individual.population_id = 0
+
                 self.problem.data_store.sync_individual(individual)
 
-            it += 1
-        t = time.time() - start
-        self.problem.logger.info("PSOGA: elapsed time: {} s".format(t))
-        # sync changed individual informations
-        self.problem.data_store.sync_all()
+            self.evaluate(individuals)
+            self.init_pvelocity(individuals)
+            self.init_pbest(individuals)
+            self.update_global_best(individuals)
+
+            it = 0
+            while it < self.options['max_population_number'] and self.do_continue(individuals):
+                offsprings = self.offspring_selector.select(individuals)
+
+                # PSO operators
+                self.update_velocity(offsprings)
+                self.update_position(offsprings)
+                self.evaluate(offsprings)
+
+                # GA operators
+                first_selected = self.selector.select(offsprings)
+                second_selected = self.selector.select(offsprings)
+                vector1, vector2 = self.crossover.cross(first_selected.vector, second_selected.vector)
+                vector1 = self.mutator.mutate(vector1)
+                vector2 = self.mutator.mutate(vector2)
+
+                # ToDo: Make it clean
+                offspring1 = IndividualSwarm(vector1)
+                offspring2 = IndividualSwarm(vector2)
+                offspring1.features = first_selected.features
+                offspring2.features = second_selected.features
+                # the offsprings continue with the velocity and the particle best of the selected particles
+                self.append_state([offsprings.index(first_selected), offsprings.index(second_selected)])
+                offsprings.append(offspring1)
+                offsprings.append(offspring2)
+
+                self.evaluate(offsprings)
+                self.update_particle_best(offsprings)
+                self.update_global_best(offsprings)
+
+                # update individuals
+                individuals = offsprings
+
+                for individual in individuals:
+                    # add to population
+                    individual.population_id = it + 1
+                    # append to problem
+                    self.problem.individuals.append(individual)
+                    # sync to datastore
+                    self.problem.data_store.sync_individual(individual)
+
+                it += 1
+            t = time.time() - start
+            self.problem.logger.info("PSOGA: elapsed time: {} s".format(t))
+            # sync changed individual informations
+            self.problem.data_store.sync_all()
@@ -14,22 +14,23 @@ class SweepAlgorithm(GeneticAlgorithm):
         self.generator = generator
 
     def run(self):
-        t_s = time.time()
-
-        # create initial population
-        vectors = self.generator.generate()
-        individuals = []
-        for vector in vectors:
-            individuals.append(Individual(vector))
-        # append to problem
-        for individual in individuals:
-            self.problem.individuals.append(individual)
-
-        # evaluate individuals
-        self.evaluate(individuals)
-
-        t = time.time() - t_s
-        self.problem.logger.info("Sweep: elapsed time: {} s".format(t))
-
-        # sync changed individual informations
-        self.problem.data_store.sync_all()
+        with self.evaluator:
+            t_s = time.time()
+
+            # create initial population
+            vectors = self.generator.generate()
+            individuals = []
+            for vector in vectors:
+                individuals.append(Individual(vector))
+            # append to problem
+            for individual in individuals:
+                self.problem.individuals.append(individual)
+
+            # evaluate individuals
+            self.evaluate(individuals)
+
+            t = time.time() - t_s
+            self.problem.logger.info("Sweep: elapsed time: {} s".format(t))
+
+            # sync changed individual informations
+            self.problem.data_store.sync_all()
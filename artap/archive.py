@@ -1,11 +1,265 @@
 import itertools, operator
+import math
+from bisect import bisect_left, bisect_right
 from .operators import ParetoDominance, EpsilonDominance
 from random import choice, sample
 
 
+def _weakly_dominates(p, q):
+    """ True if the point p is not worse than q in any objective (minimization). """
+    for p_i, q_i in zip(p, q):
+        if p_i > q_i:
+            return False
+    return True
+
+
+class SortedFront:
+    """
+    Non-dominated set of the bi-objective (or single-objective) points, the points are sorted by the first objective,
+    so the second objective is decreasing. The dominance query costs O(log n), the dominated points form a contiguous
+    slice of the list.
+    """
+
+    def __init__(self):
+        self._f1 = []
+        self._f2 = []
+        self._items = []
+
+    def __len__(self):
+        return len(self._items)
+
+    @staticmethod
+    def _pad(key):
+        return (key[0], key[1]) if len(key) > 1 else (key[0], 0.0)
+
+    def is_dominated(self, key):
+        """ True if some point weakly dominates the key. """
+        f1, f2 = self._pad(key)
+        # the point with the largest f1 <= key[0] has the smallest f2 of these points
+        index = bisect_right(self._f1, f1) - 1
+        return index >= 0 and self._f2[index] <= f2
+
+    def add(self, key, item):
+        """
+        Inserts the point, if it is not weakly dominated.
+
+        :return: (accepted, list of the removed dominated items)
+        """
+        if self.is_dominated(key):
+            return False, []
+
+        f1, f2 = self._pad(key)
+        start = bisect_left(self._f1, f1)
+        end = start
+        while end < len(self._f2) and self._f2[end] >= f2:
+            end += 1
+
+        removed = self._items[start:end]
+        self._f1[start:end] = [f1]
+        self._f2[start:end] = [f2]
+        self._items[start:end] = [item]
+        return True, removed
+
+    def remove(self, key, item):
+        f1, _ = self._pad(key)
+        index = bisect_left(self._f1, f1)
+        while index < len(self._f1) and self._f1[index] == f1:
+            if self._items[index] is item:
+                del self._f1[index], self._f2[index], self._items[index]
+                return True
+            index += 1
+        return False
+
+
+class _NDTreeNode:
+    __slots__ = ('children', 'points', 'ideal', 'nadir')
+
+    def __init__(self):
+        self.children = None  # None for leaves
+        self.points = []  # (key, item) pairs of the leaf
+        self.ideal = None
+        self.nadir = None
+
+    def extend_bounds(self, key):
+        if self.ideal is None:
+            self.ideal = list(key)
+            self.nadir = list(key)
+        else:
+            for i, value in enumerate(key):
+                if value < self.ideal[i]:
+                    self.ideal[i] = value
+                elif value > self.nadir[i]:
+                    self.nadir[i] = value
+
+    def distance(self, key):
+        """ Squared distance of the key from the middle of the bounds. """
+        return sum((value - (low + high) / 2.0) ** 2 for value, low, high in zip(key, self.ideal, self.nadir))
+
+
+class NDTree:
+    """
+    Non-dominated set of the points of any dimension organized in the ND-tree [1], each node keeps the approximations
+    of the ideal and nadir point of its subtree, so the dominance queries and updates visit only the nodes whose
+    bounds overlap the examined point.
+
+    The bounds are not shrunk after the removal of the points, they remain valid (but looser) bounds of the subtree.
+
+    [1] A. Jaszkiewicz, T. Lust: ND-Tree-Based Update: A Fast Algorithm for the Dynamic Nondominance Problem.
+        IEEE Transactions on Evolutionary Computation 22 (5) (2018) 778-791.
+    """
+
+    def __init__(self, dimension, leaf_size=20, branching=None):
+        self.leaf_size = leaf_size
+        self.branching = branching if branching else dimension + 1
+        self.root = _NDTreeNode()
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def is_dominated(self, key):
+        """ True if some point weakly dominates the key. """
+        return self._is_dominated(self.root, key)
+
+    def _is_dominated(self, node, key):
+        if node.ideal is None or not _weakly_dominates(node.ideal, key):
+            return False
+        if _weakly_dominates(node.nadir, key):
+            # every point of the (non-empty) subtree dominates the key
+            return True
+        if node.children is None:
+            return any(_weakly_dominates(point, key) for point, _ in node.points)
+        return any(self._is_dominated(child, key) for child in node.children)
+
+    def add(self, key, item):
+        """
+        Inserts the point, if it is not weakly dominated.
+
+        :return: (accepted, list of the removed dominated items)
+        """
+        if self.is_dominated(key):
+            return False, []
+
+        removed = []
+        if self._remove_dominated(self.root, key, removed):
+            self.root = _NDTreeNode()
+        self._size -= len(removed)
+
+        self._insert(key, item)
+        self._size += 1
+        return True, removed
+
+    def _remove_dominated(self, node, key, removed):
+        """ Removes the points dominated by the key from the subtree, returns True if the node became empty. """
+        if node.ideal is None or not _weakly_dominates(key, node.nadir):
+            return False
+        if _weakly_dominates(key, node.ideal):
+            removed.extend(item for _, item in self._points(node))
+            return True
+
+        if node.children is None:
+            points = []
+            for point, item in node.points:
+                if _weakly_dominates(key, point):
+                    removed.append(item)
+                else:
+                    points.append((point, item))
+            node.points = points
+            return len(points) == 0
+
+        node.children = [child for child in node.children if not self._remove_dominated(child, key, removed)]
+        return self._collapse(node)
+
+    def remove(self, key, item):
+        found = self._remove(self.root, key, item)
+        if found is None:
+            return False
+        if found:
+            self.root = _NDTreeNode()
+        self._size -= 1
+        return True
+
+    def _remove(self, node, key, item):
+        """ Returns None if the item is not in the subtree, otherwise True if the node became empty. """
+        if node.ideal is None or not (_weakly_dominates(node.ideal, key) and _weakly_dominates(key, node.nadir)):
+            return None
+
+        if node.children is None:
+            for i, (_, current) in enumerate(node.points):
+                if current is item:
+                    del node.points[i]
+                    return len(node.points) == 0
+            return None
+
+        for i, child in enumerate(node.children):
+            found = self._remove(child, key, item)
+            if found is not None:
+                if found:
+                    del node.children[i]
+                    return self._collapse(node)
+                return False
+        return None
+
+    @staticmethod
+    def _collapse(node):
+        """ Replaces the node with the only child, returns True if the node is empty. """
+        if len(node.children) == 1:
+            child = node.children[0]
+            node.children, node.points = child.children, child.points
+        return node.children is not None and len(node.children) == 0
+
+    def _points(self, node):
+        if node.children is None:
+            return node.points
+        return [point for child in node.children for point in self._points(child)]
+
+    def _insert(self, key, item):
+        node = self.root
+        while node.children is not None:
+            node.extend_bounds(key)
+            node = min(node.children, key=lambda child: child.distance(key))
+
+        node.extend_bounds(key)
+        node.points.append((key, item))
+        if len(node.points) > self.leaf_size:
+            self._split(node)
+
+    def _split(self, node):
+        """ Distributes the points of the leaf into the new leaves around the mutually most distant points. """
+        points = node.points
+
+        def distance(p, q):
+            return sum((p_i - q_i) ** 2 for p_i, q_i in zip(p[0], q[0]))
+
+        seeds = [max(points, key=lambda p: sum(distance(p, q) for q in points))]
+        while len(seeds) < self.branching:
+            seeds.append(max(points, key=lambda p: min(distance(p, seed) for seed in seeds)))
+
+        children = []
+        for seed in seeds:
+            child = _NDTreeNode()
+            child.extend_bounds(seed[0])
+            child.points.append(seed)
+            children.append(child)
+
+        for point in points:
+            if not any(point is seed for seed in seeds):
+                child = min(children, key=lambda child: child.distance(point[0]))
+                child.extend_bounds(point[0])
+                child.points.append(point)
+
+        node.children = children
+        node.points = []
+
+
 class Archive(object):
     """ Base archiving class based on platypus. An archive only containing non-dominated solutions.
         This base class realize the non-dominated sorting archive.
+
+        With the Pareto (or epsilon) dominance, the members are indexed by their signed costs (SortedFront for one or
+        two objectives, NDTree for more objectives), so the acceptance test does not compare the individual with every
+        member. The archive holds only the members with the smallest constraint violation, the other comparators are
+        applied to every member.
     """
 
     def __init__(self, dominance=EpsilonDominance(epsilons=[0.1, 0.1])):
@@ -13,6 +267,30 @@ class Archive(object):
         self._dominance = dominance  # dominance comparator
         self._contents = []
 
+        # dominance index of the members
+        self._front = None
+        self._violation = None
+        # positions of the members in _contents (validated, the list may be reordered, e.g. by crowding_distance)
+        self._positions = {}
+        # keys of the members in the dominance index (the costs of the member may be changed later)
+        self._keys = {}
+
+    def indexed(self):
+        """ True if the dominance of the archive can be decided by the dominance index. """
+        return type(self._dominance) in (ParetoDominance, EpsilonDominance)
+
+    @staticmethod
+    def _key(individual):
+        # the epsilon dominance compares the costs scaled by the (positive) epsilons, the order is the same
+        costs_signed = individual.costs_signed
+        return tuple(float(value) for value in costs_signed[:-1]), abs(costs_signed[-1])
+
+    @staticmethod
+    def _create_front(dimension):
+        if dimension <= 2:
+            return SortedFront()
+        return NDTree(dimension)
+
     def add(self, individual):
         """
         Archive acceptance procedure is implemented here, this procedure accepts the individual if it is dominates some
@@ -20,9 +298,39 @@ class Archive(object):
         the _contents list.
 
         :param individual: the examined Individual object from the offsprings.
-        :return: 
+        :return:
+        """
+        if not self.indexed():
+            return self._add_compare(individual)
+
+        key, violation = self._key(individual)
+        if not self._accepts_violation(violation, len(key)):
+            return False
+
+        accepted, removed = self._front.add(key, individual)
+        if not accepted:
+            return False
+
+        for member in removed:
+            self._discard(member)
+        self._append(individual, key)
+        return True
+
+    def _accepts_violation(self, violation, dimension):
         """
+        Compares the constraint violation with the members, the members are removed if the violation is smaller.
+        Returns False if the violation is larger.
+        """
+        if self._front is None or len(self._front) == 0 or violation < self._violation:
+            # the individual dominates all members by its smaller constraint violation
+            self._clear()
+            self._front = self._create_front(dimension)
+            self._violation = violation
+            return True
 
+        return violation == self._violation
+
+    def _add_compare(self, individual):
         is_dominated = False
         is_contained = False
 
@@ -52,6 +360,55 @@ class Archive(object):
 
         return False
 
+    def is_dominated(self, individual):
+        """ True if some member of the archive dominates (or equals) the individual. """
+        if not self.indexed():
+            return any(self._dominance.compare(individual.costs_signed, member.costs_signed) == 2 or
+                       individual.costs_signed == member.costs_signed for member in self._contents)
+
+        key, violation = self._key(individual)
+        if self._front is None or len(self._front) == 0 or violation < self._violation:
+            return False
+        return violation > self._violation or self._front.is_dominated(key)
+
+    def _index_of(self, individual):
+        index = self._positions.get(id(individual))
+        if index is None or index >= len(self._contents) or self._contents[index] is not individual:
+            self._positions = {id(member): i for i, member in enumerate(self._contents)}
+            index = self._positions.get(id(individual))
+        return index
+
+    def _append(self, individual, key):
+        self._positions[id(individual)] = len(self._contents)
+        self._keys[id(individual)] = key
+        self._contents.append(individual)
+
+    def _discard(self, individual):
+        """ Removes the member from _contents in O(1), the last member takes its place. """
+        index = self._index_of(individual)
+        del self._positions[id(individual)]
+        del self._keys[id(individual)]
+        last = self._contents.pop()
+        if last is not individual:
+            self._contents[index] = last
+            self._positions[id(last)] = index
+
+    def _clear(self):
+        self._contents = []
+        self._positions = {}
+        self._keys = {}
+        self._front = None
+        self._violation = None
+
+    def _reset(self, contents):
+        """ Replaces the members, which are mutually non-dominated. """
+        self._clear()
+        if self.indexed():
+            for individual in contents:
+                self.add(individual)
+        else:
+            self._contents = list(contents)
+
     def rand_choice(self):
         """
         Gives back a random element for the selector operator, here we don't need to
@@ -72,7 +429,7 @@ class Archive(object):
         if larger_preferred:
             result.reverse()
 
-        self._contents = result[:size]
+        self._reset(result[:size])
         return
 
     def append(self, individual):
@@ -83,11 +440,24 @@ class Archive(object):
             self.append(individual)
 
     def remove(self, solution):
-        try:
-            self._contents.remove(solution)
-            return True
-        except ValueError:
-            return False
+        if not self.indexed() or self._front is None:
+            try:
+                self._contents.remove(solution)
+                return True
+            except ValueError:
+                return False
+
+        index = self._index_of(solution)
+        if index is None:
+            # the equal individual
+            try:
+                solution = self._contents[self._contents.index(solution)]
+            except ValueError:
+                return False
+
+        self._front.remove(self._keys[id(solution)], solution)
+        self._discard(solution)
+        return True
 
     def size(self) -> int:
         return len(self._contents)
@@ -109,3 +479,98 @@ class Archive(object):
 
     def __iter__(self):
         return iter(self._contents)
+
+
+class EpsilonBoxArchive(Archive):
+    """
+    Epsilon-dominance archive [1], the objective space is divided into the hyper-boxes of the size of the epsilons and
+    every box holds at most one member. The members are kept in the dict by the integer coordinates of their boxes,
+    so the conflicts within one box are resolved in O(1), the non-dominated boxes are indexed as the points of the
+    Archive.
+
+    The box is replaced by the individual, which Pareto-dominates the member or which is closer to the corner of the
+    box.
+
+    [1] M. Laumanns, L. Thiele, K. Deb, E. Zitzler: Combining Convergence and Diversity in Evolutionary
+        Multiobjective Optimization. Evolutionary Computation 10 (3) (2002) 263-282.
+    """
+
+    def __init__(self, epsilons=[0.1, 0.1]):
+        super(EpsilonBoxArchive, self).__init__(dominance=EpsilonDominance(epsilons=epsilons))
+        self.epsilons = [float(epsilon) if epsilon > 0 else 1e-3 for epsilon in self._dominance.epsilons]
+        self._boxes = {}
+
+    def box(self, individual):
+        """ Integer coordinates of the box of the individual. """
+        return tuple(math.floor(value / self.epsilons[i % len(self.epsilons)])
+                     for i, value in enumerate(individual.costs_signed[:-1]))
+
+    def _corner_distance(self, individual, box):
+        return sum((value - index * self.epsilons[i % len(self.epsilons)]) ** 2
+                   for i, (value, index) in enumerate(zip(individual.costs_signed[:-1], box)))
+
+    def _replaces(self, individual, member, box):
+        """ True if the individual wins the box of the member. """
+        dominance = ParetoDominance().compare(individual.costs_signed, member.costs_signed)
+        if dominance != 0:
+            return dominance == 1
+        if individual.costs_signed == member.costs_signed:
+            return False
+        return self._corner_distance(individual, box) < self._corner_distance(member, box)
+
+    def add(self, individual):
+        box = self.box(individual)
+        if not self._accepts_violation(abs(individual.costs_signed[-1]), len(box)):
+            return False
+
+        member = self._boxes.get(box)
+        if member is not None:
+            # the other boxes are not affected
+            if not self._replaces(individual, member, box):
+                return False
+            self._front.remove(box, member)
+            self._discard(member)
+            self._front.add(box, individual)
+        else:
+            accepted, removed = self._front.add(box, individual)
+            if not accepted:
+                return False
+            for member in removed:
+                del self._boxes[self._keys[id(member)]]
+                self._discard(member)
+
+        self._boxes[box] = individual
+        self._append(individual, box)
+        return True
+
+    def is_dominated(self, individual):
+        """ True if the individual would be rejected by the archive. """
+        violation = abs(individual.costs_signed[-1])
+        if self._front is None or len(self._front) == 0 or violation < self._violation:
+            return False
+        if violation > self._violation:
+            return True
+
+        box = self.box(individual)
+        member = self._boxes.get(box)
+        if member is not None:
+            return not self._replaces(individual, member, box)
+        return self._front.is_dominated(box)
+
+    def _clear(self):
+        super(EpsilonBoxArchive, self)._clear()
+        self._boxes = {}
+
+    def remove(self, solution):
+        index = self._index_of(solution)
+        if index is None:
+            try:
+                solution = self._contents[self._contents.index(solution)]
+            except ValueError:
+                return False
+
+        box = self._keys[id(solution)]
+        self._front.remove(box, solution)
+        del self._boxes[box]
+        self._discard(solution)
+        return True
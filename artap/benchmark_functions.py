@@ -28,6 +28,9 @@ class BenchmarkFunction(Problem):
     The functions should defined by the eval and the eval constraints functions, which mimics the structure of a
     standardized artap problem.
 
+    The vectorized evaluate_batch(x) evaluates (n, d) array of the vectors at once and returns (n, m) array of the
+    costs, the results are identical to the evaluate function.
+
     """
 
     def __init__(self, **kwargs):
@@ -213,6 +216,15 @@ class Rosenbrock(BenchmarkFunction):
             scores += (a * a + b * b * 100.0)
         return [scores]
 
+    def evaluate_batch(self, x):
+        """
+        :param x: (n, d) array of the vectors
+        :return: (n, 1) array of f(X)
+        """
+        a = 1. - x[:, :self.dimension - 1]
+        b = x[:, 1:self.dimension] - x[:, :self.dimension - 1] ** 2.
+        return np.column_stack([np.sum(a * a + b * b * 100.0, axis=1)])
+
 
 class Ackley(BenchmarkFunction):
     """
@@ -255,6 +267,12 @@ class Ackley(BenchmarkFunction):
         n = float(len(x))
         return [-20.0 * np.exp(-0.2 * np.sqrt(firstSum / n)) - np.exp(secondSum / n) + 20.0 + np.e]
 
+    def evaluate_batch(self, x):
+        first_sum = np.sum(x ** 2.0, axis=1)
+        second_sum = np.sum(np.cos(2.0 * np.pi * x), axis=1)
+        n = float(x.shape[1])
+        return np.column_stack([-20.0 * np.exp(-0.2 * np.sqrt(first_sum / n)) - np.exp(second_sum / n) + 20.0 + np.e])
+
 
 # class Ackley4Modified:
 #     """
@@ -331,6 +349,9 @@ class Sphere(BenchmarkFunction):
 
         return [sum]
 
+    def evaluate_batch(self, x):
+        return np.column_stack([np.sum(x ** 2.0, axis=1)])
+
 
 class Schwefel(BenchmarkFunction):
     """
@@ -373,6 +394,10 @@ class Schwefel(BenchmarkFunction):
             fitness += alpha
         return [fitness]
 
+    def evaluate_batch(self, x):
+        alpha = 418.982887
+        return np.column_stack([np.sum(alpha - x * np.sin(np.sqrt(np.abs(x))), axis=1)])
+
 
 class ModifiedEasom(BenchmarkFunction):
     """
@@ -409,6 +434,11 @@ class ModifiedEasom(BenchmarkFunction):
             summa += (c - np.pi) ** 2.
         return [product * np.exp(-summa)]
 
+    def evaluate_batch(self, x):
+        product = -1.0 * np.prod(-1. * np.cos(x) ** 2., axis=1)
+        summa = np.sum((x - np.pi) ** 2., axis=1)
+        return np.column_stack([product * np.exp(-summa)])
+
 
 class EqualityConstr(BenchmarkFunction):
     """
@@ -446,6 +476,11 @@ class EqualityConstr(BenchmarkFunction):
         else:
             return [0.]
 
+    def evaluate_batch(self, x):
+        product = np.prod(x * np.sqrt(self.dimension), axis=1)
+        summa = np.sum(x * x, axis=1)
+        return np.column_stack([np.where(summa != 0., -1.0 * product, 0.)])
+
 
 class Griewank(BenchmarkFunction):
     """
@@ -489,6 +524,12 @@ class Griewank(BenchmarkFunction):
             produkt *= np.cos(c / np.sqrt(i + 1))
         return [summa - produkt + 1.]
 
+    def evaluate_batch(self, x):
+        i = np.arange(1, x.shape[1] + 1)
+        summa = np.sum(x ** 2 / 4000.0, axis=1)
+        produkt = np.prod(np.cos(x / np.sqrt(i)), axis=1)
+        return np.column_stack([summa - produkt + 1.])
+
 
 class Michaelwicz(BenchmarkFunction):
     """
@@ -534,6 +575,12 @@ class Michaelwicz(BenchmarkFunction):
             f += np.sin(c) * np.sin((i + 1) * c * c / np.pi) ** (2. * m)
         return [-f]
 
+    def evaluate_batch(self, x):
+        m = 10  # m is generally selected to 10
+        i = np.arange(1, x.shape[1] + 1)
+        f = np.sum(np.sin(x) * np.sin(i * x * x / np.pi) ** (2. * m), axis=1)
+        return np.column_stack([-f])
+
 
 class Perm(BenchmarkFunction):
     """
@@ -568,6 +615,15 @@ class Perm(BenchmarkFunction):
                 f += (j + 1 + b) * (d ** i - 1. / ((j + 1.) ** i)) ** 2.
         return [f]
 
+    def evaluate_batch(self, x):
+        b = 10  # optional, with the default value of 10
+        f = np.zeros(x.shape[0])
+        j = np.arange(1., x.shape[1] + 1.)
+
+        for i in range(1, self.dimension + 1):
+            f += np.sum((j + b) * (x ** i - 1. / (j ** i)) ** 2., axis=1)
+        return np.column_stack([f])
+
 
 class Rastrigin(BenchmarkFunction):
     """
@@ -606,6 +662,10 @@ class Rastrigin(BenchmarkFunction):
             fitness += c ** 2 - (10 * np.cos(2 * np.pi * c))
         return [fitness]
 
+    def evaluate_batch(self, x):
+        fitness = 10 * self.dimension + np.sum(x ** 2 - (10 * np.cos(2 * np.pi * x)), axis=1)
+        return np.column_stack([fitness])
+
 
 class SixHump(BenchmarkFunction):
     """
@@ -637,6 +697,12 @@ class SixHump(BenchmarkFunction):
         return [((4 - 2.1 * x[0] ** 2 + x[0] ** 4 / 3.) * x[0] ** 2 + x[0] * x[1]
                  - 4 * x[1] ** 2 + 4 * x[1] ** 4)]
 
+    def evaluate_batch(self, x):
+        x0 = x[:, 0]
+        x1 = x[:, 1]
+
+        return np.column_stack([(4 - 2.1 * x0 ** 2 + x0 ** 4 / 3.) * x0 ** 2 + x0 * x1 - 4 * x1 ** 2 + 4 * x1 ** 4])
+
 
 class Schubert(BenchmarkFunction):
     """
@@ -671,6 +737,16 @@ class Schubert(BenchmarkFunction):
             f2 += i * np.cos(i + (i + 1) * x[1])
         return [f1 * f2]
 
+    def evaluate_batch(self, x):
+        n = 5
+        f1 = np.zeros(x.shape[0])
+        f2 = np.zeros(x.shape[0])
+
+        for i in range(1, n + 1):
+            f1 += i * np.cos(i + (i + 1) * x[:, 0])
+            f2 += i * np.cos(i + (i + 1) * x[:, 1])
+        return np.column_stack([f1 * f2])
+
 
 class Zakharov(BenchmarkFunction):
     """
@@ -712,6 +788,13 @@ class Zakharov(BenchmarkFunction):
             f3 += 0.5 * (i + 1) * c
         return [f1 + f2 ** 2. + f3 ** 2.]
 
+    def evaluate_batch(self, x):
+        i = np.arange(1, x.shape[1] + 1)
+        f1 = np.sum(x ** 2, axis=1)
+        f2 = np.sum(0.5 * i * x, axis=1)
+        f3 = f2
+        return np.column_stack([f1 + f2 ** 2. + f3 ** 2.])
+
 
 class XinSheYang(BenchmarkFunction):
     """
@@ -749,6 +832,11 @@ class XinSheYang(BenchmarkFunction):
             f2 = np.sin(c ** 2.)
         return [f1 * np.exp(-f2)]
 
+    def evaluate_batch(self, x):
+        # same as evaluate, only the last component is taken into account
+        c = x[:, -1]
+        return np.column_stack([np.fabs(c) * np.exp(-np.sin(c ** 2.))])
+
 
 class XinSheYang2(BenchmarkFunction):
     """
@@ -791,6 +879,17 @@ class XinSheYang2(BenchmarkFunction):
             f3 = np.cos(c) ** 2.
         return [(np.exp(f1) - 2. * np.exp(f2)) * f3]
 
+    def evaluate_batch(self, x):
+        beta = 15.
+        m = 5.
+        # same as evaluate, only the last component is taken into account
+        c = x[:, -1]
+
+        f1 = -1. * (c / beta) ** (2. * m)
+        f2 = -1. * c ** 2.
+        f3 = np.cos(c) ** 2.
+        return np.column_stack([(np.exp(f1) - 2. * np.exp(f2)) * f3])
+
 
 class XinSheYang3(BenchmarkFunction):
     """
@@ -828,6 +927,11 @@ class XinSheYang3(BenchmarkFunction):
             f1 = eps * np.fabs(c - 1. / (i + 1.))
         return [f1]
 
+    def evaluate_batch(self, x):
+        # same as evaluate, only the last component is taken into account
+        eps = np.random.uniform(0, 1, x.shape[0])
+        return np.column_stack([eps * np.fabs(x[:, -1] - 1. / x.shape[1])])
+
 
 class BinhAndKorn:
     """
@@ -925,6 +1029,9 @@ class Booth(BenchmarkFunction):
         x = x.vector
         return [(x[0] + 2 * x[1] - 7) ** 2 + (2 * x[0] + x[1] - 5) ** 2]
 
+    def evaluate_batch(self, x):
+        return np.column_stack([(x[:, 0] + 2 * x[:, 1] - 7) ** 2 + (2 * x[:, 0] + x[:, 1] - 5) ** 2])
+
 
 class GramacyLee(BenchmarkFunction):
     """
@@ -951,6 +1058,11 @@ class GramacyLee(BenchmarkFunction):
         f = np.sin(10.0 * np.pi * x[0]) / (2. * x[0]) + (x[0] - 1.) ** 4
         return [f]
 
+    def evaluate_batch(self, x):
+        x = x[:, 0]
+        f = np.sin(10.0 * np.pi * x) / (2. * x) + (x - 1.) ** 4
+        return np.column_stack([f])
+
 
 class AlpineFunction(BenchmarkFunction):
     """
@@ -987,6 +1099,9 @@ class AlpineFunction(BenchmarkFunction):
             f1 += np.abs(c * np.sin(c) + 0.1 * c)
         return [f1]
 
+    def evaluate_batch(self, x):
+        return np.column_stack([np.sum(np.abs(x * np.sin(x) + 0.1 * x), axis=1)])
+
 
 class SurrogateBenchmarkData:
     def __init__(self, n_test=5, n_train=None, verbose=1):
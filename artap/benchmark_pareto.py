@@ -49,6 +49,11 @@ class BiObjectiveTestProblem(BenchmarkFunction):
         f2 = (1 + individual.vector[1]) / individual.vector[0]
         return [f1, f2]
 
+    def evaluate_batch(self, x):
+        f1 = x[:, 0]
+        f2 = (1 + x[:, 1]) / x[:, 0]
+        return np.column_stack([f1, f2])
+
 
 class PoloniFunction(BenchmarkFunction):
     """
@@ -95,6 +100,21 @@ class PoloniFunction(BenchmarkFunction):
 
         return [f1, f2]
 
+    def evaluate_batch(self, x):
+        x1 = x[:, 0]
+        x2 = x[:, 1]
+
+        A1 = 0.5 * np.sin(1.) - 2. * np.cos(1.) + np.sin(2.) - 1.5 * np.cos(2.)
+        A2 = 1.5 * np.sin(1.) - np.cos(1.) + 2. * np.sin(2.) - 0.5 * np.cos(2.)
+
+        B1 = 0.5 * np.sin(x1) - 2. * np.cos(x1) + np.sin(x2) - 1.5 * np.cos(x2)
+        B2 = 1.5 * np.sin(x1) - np.cos(x1) + 2. * np.sin(x2) - 0.5 * np.cos(x2)
+
+        f1 = 1. + (A1 - B1) ** 2. + (A2 - B2) ** 2.
+        f2 = (x1 + 3.) ** 2. + (x2 + 1.) ** 2.
+
+        return np.column_stack([f1, f2])
+
 
 class DTLZI(BenchmarkFunction):
     """
@@ -168,6 +188,27 @@ class DTLZI(BenchmarkFunction):
 
         return scores
 
+    def evaluate_batch(self, x):
+        m = len(self.costs)
+        nvar = x.shape[1]
+        k = nvar - m + 1
+
+        y = x[:, nvar - k:]
+        g = 100 * (k + np.sum((y - 0.5) * (y - 0.5) - np.cos(20.0 * np.pi * (y - 0.5)), axis=1))
+
+        scores = []
+        factor = 0.5 * (1 + g)
+
+        for i in range(0, m):
+            fi = factor * np.prod(x[:, :m - i - 1], axis=1)
+
+            if i > 0:
+                fi *= (1. - x[:, m - i - 1])
+
+            scores.append(fi)
+
+        return np.column_stack(scores)
+
 
 class DTLZII(BenchmarkFunction):
     """
@@ -233,6 +274,26 @@ class DTLZII(BenchmarkFunction):
 
         return scores
 
+    def evaluate_batch(self, x):
+
+        k = 10  # k >= 1, it can be k = 5 is the offered value,
+
+        m = len(self.costs)
+        # the same (wrapped) components as in evaluate
+        y = x[:, x.shape[1] - 1 - np.arange(k)]
+        gm = np.sum((y - 0.5) ** 2., axis=1)
+
+        scores = []
+        for i in range(0, m):
+            fi = np.prod(np.cos(0.5 * x[:, :m - i - 1] * np.pi), axis=1)
+
+            if i > 0:
+                fi *= np.sin(x[:, m - i] * np.pi / 2.)
+            fi *= (1. + gm)
+            scores.append(fi)
+
+        return np.column_stack(scores)
+
 
 class DTLZIII(BenchmarkFunction):
     """
@@ -299,6 +360,26 @@ class DTLZIII(BenchmarkFunction):
 
         return scores
 
+    def evaluate_batch(self, x):
+
+        k = 10  # k >= 1, it can be k = 5 is the offered value,
+
+        m = len(self.costs)
+        # g(xm), the same (wrapped) components as in evaluate
+        y = x[:, x.shape[1] - 1 - np.arange(k)]
+        gm = float(k) + np.sum((y - 0.5) ** 2. - np.cos(20. * np.pi * (y - 0.5)), axis=1)
+
+        scores = []
+        for i in range(0, m):
+            fi = np.prod(np.cos(0.5 * x[:, :m - i - 1] * np.pi), axis=1)
+
+            if i > 0:
+                fi *= np.sin(x[:, m - i] * np.pi / 2.)
+            fi = fi * (1 + 100. * gm)
+            scores.append(fi)
+
+        return np.column_stack(scores)
+
 
 class DTLZIV(BenchmarkFunction):
     """
@@ -356,6 +437,27 @@ class DTLZIV(BenchmarkFunction):
 
         return scores
 
+    def evaluate_batch(self, x):
+
+        k = 10  # k >= 1, it can be k = 5 is the offered value,
+
+        alpha = 100
+        m = len(self.costs)
+        # the same (wrapped) components as in evaluate
+        y = x[:, x.shape[1] - 1 - np.arange(k)]
+        gm = np.sum((y - 0.5) ** 2., axis=1)
+
+        scores = []
+        for i in range(0, m):
+            fi = np.prod(np.cos(0.5 * x[:, :m - i - 1] ** alpha * np.pi), axis=1)
+
+            if i > 0:
+                fi *= np.sin(x[:, m - i] ** alpha * np.pi / 2.)
+            fi *= (1. + gm)
+            scores.append(fi)
+
+        return np.column_stack(scores)
+
 
 # TODO : finish the dtlz 5-7 problems and the dtlz test problems https://deap.readthedocs.io/en/master/api/benchmarks.html#deap.benchmarks.zdt1
 
@@ -410,6 +512,15 @@ class CEC2020MMF1(BenchmarkFunction):
         f2 = 1 - np.abs(x1 - 2) ** 0.5 + 2. * (x2 - (a ** x1) * np.sin(6. * np.pi * np.abs(x1 - 2.) + np.pi)) ** 2.
         return [f1, f2]
 
+    def evaluate_batch(self, x):
+        x1 = x[:, 0]
+        x2 = x[:, 1]
+
+        a = np.where(x1 < 2., 1., np.e)
+        f1 = np.abs(x1 - 2)
+        f2 = 1 - np.abs(x1 - 2) ** 0.5 + 2. * (x2 - (a ** x1) * np.sin(6. * np.pi * np.abs(x1 - 2.) + np.pi)) ** 2.
+        return np.column_stack([f1, f2])
+
 
 class CEC2020MMF2(BenchmarkFunction):
     """
@@ -468,6 +579,21 @@ class CEC2020MMF2(BenchmarkFunction):
 
         return [f1, f2]
 
+    def evaluate_batch(self, x):
+        x1 = x[:, 0]
+        x2 = x[:, 1]
+
+        f1 = np.abs(x1)
+
+        a = x1 ** 0.5
+
+        f2a = 1 - a + 2. * (4. * (x2 - a)) ** 2. - 2. * np.cos(20.0 * np.pi / (2.0 ** 0.5) * (x2 - a)) + 2.
+        f2b = 1 - a + 2. * (4. * (x2 - 1.0 - a)) ** 2. - 2. * np.cos(20.0 * np.pi / (2.0 ** 0.5) * (x2 - 1.0 - a)) + 2.
+
+        f2 = np.where(x2 < 1., f2a, f2b)
+
+        return np.column_stack([f1, f2])
+
 
 class ZDT1(BenchmarkFunction):
     """
@@ -519,6 +645,15 @@ class ZDT1(BenchmarkFunction):
     def eval_h(self, f: float, g: float) -> float:
         return 1.0 - sqrt(f / g)
 
+    def evaluate_batch(self, x):
+        g = 9.0 / (x.shape[1] - 1) * (np.sum(x, axis=1) - x[:, 0]) + 1.0
+        h = 1.0 - np.sqrt(x[:, 0] / g)
+
+        f1 = x[:, 0]
+        f2 = h * g
+
+        return np.column_stack([f1, f2])
+
 
 if __name__ == '__main__':
     # visualcheck
@@ -1,6 +1,6 @@
 
 from .benchmark_functions import BenchmarkFunction
-from numpy import exp
+from numpy import exp, column_stack
 
 
 class Synthetic2D(BenchmarkFunction):
@@ -52,6 +52,18 @@ class Synthetic2D(BenchmarkFunction):
 
         return [res]
 
+    def evaluate_batch(self, x):
+        x1 = x[:, 0]
+        x2 = x[:, 1]
+
+        res = 0.7 * exp(-((x1 - 1.) ** 2. + (x2 - 1.) ** 2.) / 0.18) + \
+              0.75 * exp(-((x1 - 1.) ** 2. + (x2 - 3.) ** 2.) / 0.32) + \
+              exp(-((x1 - 3) ** 2 + (x2 - 1) ** 2) / 2.) + \
+              1.2 * exp(-((x1 - 3) ** 2 + (x2 - 4) ** 2) / 0.32) + \
+              exp(-((x1 - 5) ** 2. + (x2 - 2) ** 2.) / 0.72)
+
+        return column_stack([res])
+
 
 class Synthetic1D(BenchmarkFunction):
     """
@@ -93,6 +105,19 @@ class Synthetic1D(BenchmarkFunction):
 
         return [res]
 
+    def evaluate_batch(self, x):
+        x = x[:, 0]
+
+        res = exp(-(x - 1) ** 2. / 0.5) + 2. * exp(-(x - 1.25) ** 2. / 0.045) + 0.5 * exp(-(x - 1.5) ** 2. / 0.0128) + \
+              2. * exp(-(x - 1.6) ** 2. / 0.005) + 2.5 * exp(-(x - 1.8) ** 2. / 0.02) + \
+              2.5 * exp(-(x - 2.2) ** 2. / 0.02) + 2. * exp(-(x - 2.4) ** 2. / 0.005) + \
+              2. * exp(-(x - 2.75) ** 2. / 0.045) + exp(-(x - 3) ** 2. / 0.5) + 2. * exp(-(x - 6.) ** 2. / 0.32) + \
+              2.2 * exp(-(x - 7.) ** 2. / 0.18) + 2.4 * exp(-(x - 8.) ** 2. / 0.5) + \
+              2.3 * exp(-(x - 9.5) ** 2. / 0.5) + 3.2 * exp(-(x - 11.) ** 2. / 0.18) + 1.2 * exp(
+            -(x - 12.) ** 2. / 0.18)
+
+        return column_stack([res])
+
 
 def atom_nd(width, multiplier, x: list, z: list):
     """
@@ -158,6 +183,23 @@ class Synthetic5D(BenchmarkFunction):
 
         return [result]
 
+    def evaluate_batch(self, x):
+        # atom_nd iterates over the components, columns of x
+        x = x.T
+
+        result = atom_nd(0.3, 0.7, x, [10., 1.0, 6.0, 7.0, 8.0])
+        result += atom_nd(0.4, 0.75, x, [1.0, 3.0, 8.0, 9.5, 2.0])
+        result += atom_nd(1.0, 1.0, x, [3.0, 1.0, 3.0, 2.0, 5.0])  # robust solution
+        result += atom_nd(0.4, 1.2, x, [3.0, 4.0, 1.3, 5.0, 5.0])  # highest peak
+        result += atom_nd(0.6, 1.0, x, [5.0, 2.0, 9.6, 7.3, 8.6])
+        result += atom_nd(0.5, 0.6, x, [7.5, 8.0, 9.0, 3.2, 4.6])
+        result += atom_nd(0.1, 0.5, x, [5.7, 9.3, 2.2, 8.4, 7.1])
+        result += atom_nd(1.0, 0.2, x, [5.5, 7.2, 5.8, 2.3, 4.5])
+        result += atom_nd(0.2, 0.4, x, [4.7, 3.2, 5.5, 7.1, 3.3])
+        result += atom_nd(0.3, 0.1, x, [9.7, 8.4, 0.6, 3.2, 8.5])
+
+        return column_stack([result])
+
 
 class Synthetic10D(BenchmarkFunction):
     """
@@ -210,6 +252,23 @@ class Synthetic10D(BenchmarkFunction):
 
         return [result]
 
+    def evaluate_batch(self, x):
+        # atom_nd iterates over the components, columns of x
+        x = x.T
+
+        result = atom_nd(0.3, 0.7, x, [10., 1.0, 6.0, 7.0, 8.0, 1.0, 1.0, 6.0, 7.0, 8.0])
+        result += atom_nd(0.4, 0.75, x, [1.0, 3.0, 8.0, 9.5, 2.0, 1.0, 3.0, 8.0, 9.5, 2.0])
+        result += atom_nd(1.0, 1.0, x, [3.0, 1.0, 3.0, 2.0, 5.0, 3.0, 1.0, 3.0, 2.0, 5.0])  # robust solution
+        result += atom_nd(0.4, 1.2, x, [3.0, 4.0, 1.3, 5.0, 5.0, 3.0, 4.0, 1.3, 5.0, 5.0])  # highest peak
+        result += atom_nd(0.6, 1.0, x, [5.0, 2.0, 9.6, 7.3, 8.6, 5.0, 2.0, 9.6, 7.3, 8.6])
+        result += atom_nd(0.5, 0.6, x, [7.5, 8.0, 9.0, 3.2, 4.6, 7.5, 8.0, 9.0, 3.2, 4.6])
+        result += atom_nd(0.1, 0.5, x, [5.7, 9.3, 2.2, 8.4, 7.1, 5.7, 9.3, 2.2, 8.4, 7.1])
+        result += atom_nd(1.0, 0.2, x, [5.5, 7.2, 5.8, 2.3, 4.5, 5.5, 7.2, 5.8, 2.3, 4.5])
+        result += atom_nd(0.2, 0.4, x, [4.7, 3.2, 5.5, 7.1, 3.3, 4.7, 3.2, 5.5, 7.1, 3.3])
+        result += atom_nd(0.3, 0.1, x, [9.7, 8.4, 0.6, 3.2, 8.5, 9.7, 8.4, 0.6, 3.2, 8.5])
+
+        return column_stack([result])
+
 
 if __name__ == '__main__':
     test = Synthetic2D()
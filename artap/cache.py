@@ -0,0 +1,166 @@
+import threading
+from collections import OrderedDict
+from copy import deepcopy
+
+
+def quantized_vector(parameters, individual):
+    """
+    Returns the vector of the individual quantized to the precision of the parameters (parameter['precision'] or the
+    default number of decimals of the individual), the hashable key of the point.
+    """
+    key = []
+    for i, value in enumerate(individual.vector):
+        precision = None
+        if i < len(parameters):
+            precision = parameters[i].get('precision')
+
+        if precision:
+            key.append(round(value / precision))
+        else:
+            key.append(round(value, individual.features["precision"]))
+
+    return tuple(key)
+
+
+class DuplicateFilter:
+    """
+    Set of the visited points, the vectors are compared after the quantization to the precision of the parameters
+    (see quantized_vector), so the test costs O(1) instead of the comparison with all the individuals.
+    """
+
+    def __init__(self, problem, base=None):
+        """
+        :param base: filter of the points visited before, it is shared (not copied), the new points are added only
+                     to this filter
+        """
+        self.problem = problem
+        self.base = base
+        self._keys = set()
+        # number of the rejected duplicates
+        self.rejected = 0
+
+    def __len__(self):
+        return len(self._keys) + (len(self.base) if self.base is not None else 0)
+
+    def __contains__(self, individual):
+        return self._contains_key(quantized_vector(self.problem.parameters, individual))
+
+    def _contains_key(self, key):
+        return key in self._keys or (self.base is not None and self.base._contains_key(key))
+
+    def add(self, individual):
+        """ Adds the point of the individual, returns False if it was already visited. """
+        key = quantized_vector(self.problem.parameters, individual)
+        if self._contains_key(key):
+            self.rejected += 1
+            return False
+
+        self._keys.add(key)
+        return True
+
+    def update(self, individuals):
+        for individual in individuals:
+            self._keys.add(quantized_vector(self.problem.parameters, individual))
+
+    def clear(self):
+        self._keys.clear()
+
+    def copy(self):
+        duplicate_filter = DuplicateFilter(self.problem, self.base)
+        duplicate_filter._keys = self._keys.copy()
+        return duplicate_filter
+
+
+class EvaluationCache:
+    """
+    Memoization of evaluated design vectors.
+
+    The vectors are rounded to the precision of the parameters (parameter['precision'] or the default
+    number of decimals of the individual), so different algorithms revisiting the same point share the result.
+    The least recently used entries are evicted when the size of the cache exceeds
+    problem.options['evaluation_cache_size']. If problem.options['evaluation_cache_persistent'] is set, the entries
+    are stored in (and read from) the data store of the problem.
+    """
+
+    def __init__(self, problem):
+        self.problem = problem
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # data store the persistent entries were read from
+        self._data_store = None
+
+        # stats
+        self.hits = 0
+        self.misses = 0
+
+    def __getstate__(self):
+        # the entries and the lock are not transferred (e.g. to the worker processes)
+        return {'problem': self.problem}
+
+    def __setstate__(self, state):
+        self.__init__(state['problem'])
+
+    def __len__(self):
+        return len(self._entries)
+
+    def key(self, individual):
+        """ Returns the vector of the individual quantized to the precision of the parameters. """
+        return quantized_vector(self.problem.parameters, individual)
+
+    def get(self, individual):
+        """ Returns the cached entry (dict with costs, feasible and custom) or None. """
+        self._read_persistent()
+        key = self.key(individual)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+        return deepcopy(entry)
+
+    def add(self, individual):
+        """ Stores the result of the evaluated individual. """
+        key = self.key(individual)
+        entry = {'costs': list(individual.costs),
+                 'feasible': individual.features["feasible"],
+                 'custom': deepcopy(individual.custom)}
+
+        self._insert(key, entry)
+
+        if self.problem.options['evaluation_cache_persistent']:
+            self.problem.data_store.sync_cache_entry(key, entry)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def _insert(self, key, entry):
+        size = self.problem.options['evaluation_cache_size']
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+
+            if size > 0:
+                while len(self._entries) > size:
+                    self._entries.popitem(last=False)
+
+    def _read_persistent(self):
+        if not self.problem.options['evaluation_cache_persistent']:
+            return
+
+        data_store = self.problem.data_store
+        if data_store is self._data_store:
+            return
+
+        for key, entry in data_store.read_cache():
+            self._insert(key, entry)
+        self._data_store = data_store
@@ -2,10 +2,69 @@ import sqlite3
 
 import os
 import json
+import queue
+import threading
+import time
+import numpy as np
 
 from .individual import Individual
 
 
+def _pack_array(array):
+    """ Packs the list of numbers to float64 blob, the other values (non-numeric, ragged) are stored as json text. """
+    try:
+        packed = np.asarray(array, dtype=np.float64)
+    except (TypeError, ValueError):
+        return json.dumps(array)
+
+    return packed.tobytes() if packed.ndim == 1 else json.dumps(array)
+
+
+def _pack_arrays(arrays):
+    """ Packs the lists of numbers to float64 blobs, by one conversion if the lists have the same length. """
+    if len(set(len(array) for array in arrays)) == 1:
+        try:
+            matrix = np.asarray(arrays, dtype=np.float64)
+        except (TypeError, ValueError):
+            matrix = None
+        if matrix is not None and matrix.ndim == 2:
+            return [row.tobytes() for row in matrix]
+
+    return [_pack_array(array) for array in arrays]
+
+
+def _unpack_matrix(blobs):
+    """ Unpacks the float64 blobs to (n, k) array, or to the list of arrays if the blobs have different lengths. """
+    lengths = set(len(blob) for blob in blobs)
+    if len(lengths) == 1:
+        width = lengths.pop() // 8
+        return np.frombuffer(b"".join(blobs), dtype=np.float64).reshape(len(blobs), width)
+    else:
+        return [np.frombuffer(blob, dtype=np.float64) for blob in blobs]
+
+
+def _unpack_arrays(blobs):
+    """ Unpacks the float64 blobs to the lists of numbers, by one conversion if the blobs have the same length. """
+    if any(isinstance(blob, str) for blob in blobs):
+        # rows stored as json text
+        return [json.loads(blob) if isinstance(blob, str) else np.frombuffer(blob, dtype=np.float64).tolist()
+                for blob in blobs]
+
+    matrix = _unpack_matrix(blobs)
+    if isinstance(matrix, np.ndarray):
+        return matrix.tolist()
+    else:
+        return [array.tolist() for array in matrix]
+
+
+def _is_busy(error):
+    """ Returns True if the write failed because the database is locked by another connection. """
+    if not isinstance(error, sqlite3.OperationalError):
+        return False
+    message = str(error).lower()
+    return "locked" in message or "busy" in message
+
+
 class DummyDataStore:
     def __init__(self):
         pass
@@ -16,36 +75,90 @@ class DummyDataStore:
     def sync_all(self):
         pass
 
+    def sync_cache_entry(self, key, entry):
+        pass
+
+    def read_cache(self):
+        return []
+
+    def flush(self):
+        pass
+
     def destroy(self):
         pass
 
 
 class SqliteDataStore(DummyDataStore):
+    """
+    Stores the problem and its individuals in the SQLite database.
+
+    Schema versions (PRAGMA user_version):
+     - 1 (or 0): individuals(id, individual json)
+     - 2: individuals with indexed population_id, algorithm_id and state columns, vector, costs and costs_signed are
+          packed float64 arrays (BLOB, json text if the row is not a flat list of numbers), the rest (custom,
+          features, parents and children) is stored as json
+
+    The databases with the older schema are read directly and migrated in the write mode.
+
+    In the lazy read mode the individuals are not loaded to problem.individuals, they are read on demand by
+    iter_individuals() (in pages), read_population() and read_columns() (selected columns into NumPy arrays).
+    """
+    schema_version = 2
+
     sql_main_table = "CREATE TABLE IF NOT EXISTS main (name text NOT NULL, description text NOT NULL);"
     sql_parameters_table = "CREATE TABLE IF NOT EXISTS parameters (name text PRIMARY KEY, parameter json not null);"
     sql_costs_table = "CREATE TABLE IF NOT EXISTS costs (name text PRIMARY KEY, cost json not null);"
-    sql_individuals_table = "CREATE TABLE IF NOT EXISTS individuals (id int PRIMARY KEY, individual json not null);"
+    sql_individuals_table = "CREATE TABLE IF NOT EXISTS individuals (id integer PRIMARY KEY, population_id int, algorithm_id int, state text, vector blob not null, costs blob not null, costs_signed blob not null, data json not null);"
+    sql_individuals_indices = ["CREATE INDEX IF NOT EXISTS individuals_population_id ON individuals (population_id);",
+                               "CREATE INDEX IF NOT EXISTS individuals_algorithm_id ON individuals (algorithm_id);",
+                               "CREATE INDEX IF NOT EXISTS individuals_state ON individuals (state);"]
+    sql_cache_table = "CREATE TABLE IF NOT EXISTS cache (key json PRIMARY KEY, entry json not null);"
 
     sql_main_insert = "INSERT INTO main(name, description) VALUES (?,?)"
     sql_parameters_insert = "INSERT INTO parameters(name, parameter) VALUES (?,?)"
     sql_costs_insert = "INSERT INTO costs(name, cost) VALUES (?,?)"
 
-    sql_individuals_upsert = "INSERT INTO individuals (id, individual) VALUES(?,?) ON CONFLICT(id) DO UPDATE SET individual=excluded.individual;"
+    sql_individuals_upsert = "INSERT INTO individuals (id, population_id, algorithm_id, state, vector, costs, costs_signed, data) VALUES(?,?,?,?,?,?,?,?) ON CONFLICT(id) DO UPDATE SET population_id=excluded.population_id, algorithm_id=excluded.algorithm_id, state=excluded.state, vector=excluded.vector, costs=excluded.costs, costs_signed=excluded.costs_signed, data=excluded.data;"
+    sql_cache_upsert = "INSERT INTO cache (key, entry) VALUES(?,?) ON CONFLICT(key) DO UPDATE SET entry=excluded.entry;"
 
     sql_main_select = "SELECT * FROM main;"
     sql_parameters_select = "SELECT * FROM parameters;"
     sql_costs_select = "SELECT * FROM costs;"
-    sql_individuals_select = "SELECT * FROM individuals;"
-    # SELECT json_extract(individual, '$.costs[0]') as cost FROM individuals where cost>10;
-
-    def __init__(self, problem, database_name, mode="write", thread_safe=True):
+    sql_individuals_select = "SELECT id, population_id, algorithm_id, state, vector, costs, costs_signed, data FROM individuals"
+    sql_individuals_json_select = "SELECT id, individual FROM individuals"
+    individuals_columns = ['id', 'population_id', 'algorithm_id', 'state', 'vector', 'costs', 'costs_signed']
+    individuals_array_columns = ['vector', 'costs', 'costs_signed']
+    sql_cache_select = "SELECT * FROM cache;"
+
+    def __init__(self, problem, database_name, mode="write", thread_safe=True, write_behind=True, batch_size=1000,
+                 flush_interval=1.0, lazy=False, busy_timeout=5.0):
+        """
+        :param lazy: the individuals are not loaded in the read mode, they are read on demand
+        :param write_behind: the writes are queued and committed by the writer thread in batches (group commits)
+        :param batch_size: the number of queued rows, which are committed in one transaction
+        :param flush_interval: the maximal delay (in seconds) of the commit of the queued rows
+        :param busy_timeout: the time (in seconds) for which the write is retried if the database is locked
+        """
         self.problem = problem
         self.database_name = database_name
         self.mode = mode
         self.thread_safe = thread_safe
+        self.lazy = lazy
         # cache
         self._conn = None
 
+        # write-behind queue
+        self.write_behind = write_behind
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.busy_timeout = busy_timeout
+        self._queue = queue.Queue()
+        self._writer = None
+        self._writer_lock = threading.Lock()
+        # guards the queue against the failure of the writer
+        self._error_lock = threading.Lock()
+        self._writer_error = None
+
         if not self.database_name:
             raise RuntimeError("SqliteDataStoreCacheThread: database name is empty.")
 
@@ -56,6 +169,7 @@ class SqliteDataStore(DummyDataStore):
                     self._create_structure()
                 else:
                     self.read_from_datastore()
+                    self.migrate()
             else:
                 self._create_structure()
         elif self.mode == "rewrite":
@@ -63,7 +177,7 @@ class SqliteDataStore(DummyDataStore):
                 os.remove(database_name)
             self._create_structure()
         elif self.mode == "read":
-            self.read_from_datastore()
+            self.read_from_datastore(individuals=not self.lazy)
 
     def conn(self):
         if self.thread_safe:
@@ -105,6 +219,10 @@ class SqliteDataStore(DummyDataStore):
         c.execute(self.sql_costs_table)
         c.execute(self.sql_parameters_table)
         c.execute(self.sql_individuals_table)
+        for sql in self.sql_individuals_indices:
+            c.execute(sql)
+        c.execute(self.sql_cache_table)
+        c.execute("PRAGMA user_version = {};".format(self.schema_version))
         conn.commit()
 
         # data
@@ -115,7 +233,74 @@ class SqliteDataStore(DummyDataStore):
             c.execute(self.sql_costs_insert, [cost["name"], json.dumps(cost)])
         conn.commit()
 
-    def read_from_datastore(self):
+    def _read_schema_version(self, c):
+        c.execute("PRAGMA user_version;")
+        return max(1, c.fetchone()[0])
+
+    def migrate(self):
+        """ Converts the database created by older versions to the current schema (in one transaction). """
+        conn = self.conn()
+        c = conn.cursor()
+
+        if self._read_schema_version(c) >= self.schema_version:
+            return
+
+        try:
+            c.execute("BEGIN EXCLUSIVE;")
+
+            # schema 1 -> 2: individuals are converted from json
+            c.execute(self.sql_individuals_json_select + ";")
+            individuals = [Individual.from_dict(json.loads(row[1])) for row in c.fetchall()]
+            c.execute("DROP TABLE individuals;")
+            c.execute(self.sql_individuals_table)
+            for sql in self.sql_individuals_indices:
+                c.execute(sql)
+            if individuals:
+                c.executemany(self.sql_individuals_upsert, self._individual_rows(individuals))
+
+            # databases created by older versions do not contain the cache table
+            c.execute(self.sql_cache_table)
+            c.execute("PRAGMA user_version = {};".format(self.schema_version))
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+
+    @staticmethod
+    def _individual_rows(individuals):
+        """ Converts the individuals to the rows of the individuals table. """
+        vectors = _pack_arrays([individual.vector for individual in individuals])
+        costs = _pack_arrays([individual.costs for individual in individuals])
+        costs_signed = _pack_arrays([individual.costs_signed for individual in individuals])
+
+        rows = []
+        for i, individual in enumerate(individuals):
+            output = individual.to_dict()
+            data = {'custom': output['custom'], 'features': output['features'], 'parents': output['parents'],
+                    'children': output['children']}
+
+            rows.append([individual.id, individual.population_id, individual.algorithm_id, output['state'],
+                         vectors[i], costs[i], costs_signed[i], json.dumps(data)])
+
+        return rows
+
+    @staticmethod
+    def _individuals_from_rows(rows):
+        """ Converts the rows of the individuals table to the individuals. """
+        vectors = _unpack_arrays([row[4] for row in rows])
+        costs = _unpack_arrays([row[5] for row in rows])
+        costs_signed = _unpack_arrays([row[6] for row in rows])
+
+        individuals = []
+        for i, row in enumerate(rows):
+            dictionary = json.loads(row[7])
+            dictionary.update({'id': row[0], 'population_id': row[1], 'algorithm_id': row[2], 'state': row[3],
+                               'vector': vectors[i], 'costs': costs[i], 'costs_signed': costs_signed[i]})
+            individuals.append(Individual.from_dict(dictionary))
+
+        return individuals
+
+    def read_from_datastore(self, individuals=True):
         conn = self.conn()
         c = conn.cursor()
 
@@ -144,35 +329,331 @@ class SqliteDataStore(DummyDataStore):
 
         # individuals
         self.problem.individuals.clear()
-        c.execute(self.sql_individuals_select)
+        if individuals:
+            self.problem.individuals.extend(self._select_individuals(c)[0])
+
+    def _select_individuals(self, c, population_id=None, after_id=None, limit=None):
+        """
+        Reads the individuals ordered by id. The json individuals (schema 1) are filtered by population_id after
+        parsing, because they are not valid json for SQLite (Infinity).
+
+        :return: individuals, id of the last read row (None if all rows were read)
+        """
+        legacy = self._read_schema_version(c) < self.schema_version
+
+        conditions = []
+        params = []
+        if after_id is not None:
+            conditions.append("id > ?")
+            params.append(after_id)
+        if population_id is not None and not legacy:
+            conditions.append("population_id = ?")
+            params.append(population_id)
+
+        sql = self.sql_individuals_json_select if legacy else self.sql_individuals_select
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        c.execute(sql + ";", params)
         rows = c.fetchall()
-        for row in rows:
-            individual = Individual.from_dict(json.loads(row[1]))
-            self.problem.individuals.append(individual)
+        if legacy:
+            individuals = [Individual.from_dict(json.loads(row[1])) for row in rows]
+            if population_id is not None:
+                individuals = [individual for individual in individuals if individual.population_id == population_id]
+        else:
+            individuals = self._individuals_from_rows(rows)
+
+        for individual in individuals:
+            individual.mark_synced()
+
+        last_id = rows[-1][0] if limit is not None and len(rows) == limit else None
+        return individuals, last_id
+
+    def iter_individuals(self, page_size=1000, population_id=None):
+        """ Iterates the stored individuals (ordered by id), only one page of individuals is held in memory. """
+        c = self.conn().cursor()
+        after_id = None
+        while True:
+            individuals, after_id = self._select_individuals(c, population_id=population_id, after_id=after_id,
+                                                             limit=page_size)
+            yield from individuals
+
+            if after_id is None:
+                break
+
+    def read_population(self, population_id):
+        """ Reads the individuals of one population (uses the population_id index). """
+        return self._select_individuals(self.conn().cursor(), population_id=population_id)[0]
+
+    def population_ids(self):
+        """ Returns the sorted list of the stored population ids. """
+        c = self.conn().cursor()
+        if self._read_schema_version(c) < self.schema_version:
+            return sorted(set(individual.population_id for individual in self.iter_individuals()))
+
+        c.execute("SELECT DISTINCT population_id FROM individuals ORDER BY population_id;")
+        return [row[0] for row in c.fetchall()]
+
+    def _column_pages(self, columns, population_id, page_size):
+        c = self.conn().cursor()
+        if self._read_schema_version(c) < self.schema_version:
+            page = []
+            for individual in self.iter_individuals(page_size=page_size, population_id=population_id):
+                page.append([getattr(individual, column) for column in columns])
+                if len(page) == page_size:
+                    yield page
+                    page = []
+            if page:
+                yield page
+        else:
+            sql = "SELECT {} FROM individuals".format(", ".join(columns))
+            params = []
+            if population_id is not None:
+                sql += " WHERE population_id = ?"
+                params.append(population_id)
+            c.execute(sql + " ORDER BY id;", params)
+
+            while True:
+                rows = c.fetchmany(page_size)
+                if not rows:
+                    break
+                yield rows
+
+    def read_columns(self, columns=('vector', 'costs'), population_id=None, page_size=10000):
+        """
+        Reads the selected columns of the individuals (ordered by id) without creating the individuals.
+
+        :param columns: the names from individuals_columns
+        :return: dictionary of NumPy arrays, vector, costs and costs_signed are (n, k) float64 arrays (or lists of
+                 arrays if the individuals have different lengths)
+        """
+        for column in columns:
+            if column not in self.individuals_columns:
+                raise ValueError("SqliteDataStore: unknown column '{}'.".format(column))
+
+        pages = {column: [] for column in columns}
+        for rows in self._column_pages(columns, population_id, page_size):
+            for i, column in enumerate(columns):
+                values = [row[i] for row in rows]
+                if column in self.individuals_array_columns:
+                    if all(isinstance(value, bytes) for value in values):
+                        values = _unpack_matrix(values)
+                    elif any(isinstance(value, (bytes, str)) for value in values):
+                        # the rows stored as json text (non-numeric values) are not converted to float64
+                        values = [np.frombuffer(value, dtype=np.float64) if isinstance(value, bytes)
+                                  else np.array(json.loads(value), dtype=object) for value in values]
+                    else:
+                        values = [np.array(value, dtype=np.float64) for value in values]
+                        if len(set(len(value) for value in values)) == 1:
+                            values = np.array(values)
+                pages[column].append(values)
+
+        output = {}
+        for column in columns:
+            if column in self.individuals_array_columns:
+                if all(isinstance(page, np.ndarray) for page in pages[column]) \
+                        and len(set(page.shape[1] for page in pages[column])) <= 1:
+                    output[column] = np.concatenate(pages[column]) if pages[column] else np.empty((0, 0))
+                else:
+                    output[column] = [array for page in pages[column] for array in page]
+            else:
+                output[column] = np.array([value for page in pages[column] for value in page])
+
+        return output
 
     def destroy(self):
+        self._stop_writer()
+
         if self._conn is not None:
             self._conn.close()
 
     def sync_individual(self, individual):
         if self.mode == "write" or self.mode == "rewrite":
-            conn = self.conn()
-            c = conn.cursor()
-
-            # data
-            try:
-                c.execute(self.sql_individuals_upsert, [individual.id, json.dumps(individual.to_dict())])
-                conn.commit()
-            except sqlite3.OperationalError as e:
-                # try again
-                self.sync_individual(individual)
+            individual.mark_synced()
+            self._write(self.sql_individuals_upsert, self._individual_rows([individual]))
 
     def sync_all(self):
+        """ Stores the individuals modified since their last sync (in one transaction). """
+        if self.mode == "write" or self.mode == "rewrite":
+            individuals = []
+            for individual in self.problem.individuals:
+                if individual.is_modified():
+                    individual.mark_synced()
+                    individuals.append(individual)
+
+            if individuals:
+                self._write(self.sql_individuals_upsert, self._individual_rows(individuals))
+            self.flush()
+
+    def sync_cache_entry(self, key, entry):
         if self.mode == "write" or self.mode == "rewrite":
+            self._write(self.sql_cache_upsert, [[json.dumps(list(key)), json.dumps(entry)]])
+
+    def flush(self):
+        """ Blocks until all queued rows are committed, raises the error of the writer (if it failed). """
+        with self._error_lock:
+            self._raise_writer_error()
+            if self._writer is None:
+                return
+            committed = threading.Event()
+            self._queue.put(committed)
+
+        committed.wait()
+        self._raise_writer_error()
+
+    def _raise_writer_error(self):
+        # the writer stops after the failed commit (the later rows are not written), the store stays failed
+        if self._writer_error is not None:
+            raise self._writer_error
+
+    def _write(self, sql, rows):
+        if self.write_behind:
+            self._start_writer()
+            with self._error_lock:
+                self._raise_writer_error()
+                self._queue.put((sql, rows))
+        else:
             conn = self.conn()
-            c = conn.cursor()
+            deadline = time.time() + self.busy_timeout
+            while True:
+                try:
+                    c = conn.cursor()
+                    c.executemany(sql, rows)
+                    conn.commit()
+                    return
+                except sqlite3.OperationalError as e:
+                    conn.rollback()
+                    # database is locked, try again
+                    if not _is_busy(e) or time.time() > deadline:
+                        raise
+                    time.sleep(0.01)
+
+    def _start_writer(self):
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_behind, daemon=True)
+                self._writer.start()
+
+    def _stop_writer(self):
+        with self._writer_lock:
+            if self._writer is not None:
+                self._queue.put(None)
+                self._writer.join()
+                self._writer = None
+
+                if self._writer_error is not None:
+                    self.problem.logger.error("SqliteDataStore: write failed: {}".format(self._writer_error))
+
+    def _write_behind(self):
+        """
+        Writer thread. The queued statements are committed in the order of arrival, one transaction per batch, so
+        the database always contains a consistent prefix of the writes. The batch is committed when it contains
+        batch_size rows, flush_interval elapses, flush() is called or the writer is stopped. If a commit fails, the
+        writer stops and the error is raised by the next write or flush().
+        """
+        conn = sqlite3.connect(self.database_name, isolation_level='Exclusive')
+        # the committed transactions survive the crash of the process (WAL is synced at checkpoints)
+        conn.execute('PRAGMA journal_mode = WAL')
+        conn.execute('PRAGMA synchronous = NORMAL')
+
+        batch = []
+        n_rows = 0
+        deadline = None
+        while True:
+            try:
+                if batch:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.time()))
+                else:
+                    item = self._queue.get()
+            except queue.Empty:
+                # time window elapsed
+                if not self._commit(conn, batch):
+                    break
+                batch = []
+                n_rows = 0
+                continue
+
+            if isinstance(item, tuple):
+                if not batch:
+                    deadline = time.time() + self.flush_interval
+                batch.append(item)
+                n_rows += len(item[1])
+                if n_rows < self.batch_size:
+                    continue
+
+            if not self._commit(conn, batch):
+                if isinstance(item, threading.Event):
+                    item.set()
+                break
+            batch = []
+            n_rows = 0
+
+            if isinstance(item, threading.Event):
+                # flush
+                item.set()
+            elif item is None:
+                # stop
+                break
+
+        conn.close()
+
+        if self._writer_error is None:
+            return
+
+        # failed writer: the waiting flushes are released, the queued rows are dropped
+        with self._error_lock:
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if isinstance(item, threading.Event):
+                    item.set()
+
+    def _commit(self, conn, batch):
+        """
+        Commits the batch, returns False if it failed (the error is stored). The commit is retried while the
+        database is locked, at most busy_timeout seconds.
+        """
+        deadline = time.time() + self.busy_timeout
+        while batch:
+            try:
+                c = conn.cursor()
+                for sql, rows in batch:
+                    c.executemany(sql, rows)
+                conn.commit()
+                return True
+            except Exception as e:
+                conn.rollback()
+                # database is locked, try again
+                if _is_busy(e) and time.time() < deadline:
+                    time.sleep(0.01)
+                    continue
+                conn.rollback()
+                with self._error_lock:
+                    self._writer_error = e
+                return False
+
+        return True
+
+    def read_cache(self):
+        self.flush()
 
-            for individual in self.problem.individuals:
-                c.execute(self.sql_individuals_upsert, [individual.id, json.dumps(individual.to_dict())])
+        conn = self.conn()
+        c = conn.cursor()
 
-            conn.commit()
+        try:
+            c.execute(self.sql_cache_select)
+        except sqlite3.OperationalError:
+            # database without cache table
+            return []
+
+        entries = []
+        for row in c.fetchall():
+            entries.append((tuple(json.loads(row[0])), json.loads(row[1])))
+
+        return entries
@@ -1,13 +1,17 @@
+import asyncio
 import string
 import textwrap
 import re
-import tempfile
 import os
 import subprocess
 import datetime
 import time
 import ntpath
 import pathlib
+import hashlib
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
 from string import Template
 from uuid import uuid1
 from sys import platform
@@ -31,6 +35,430 @@ def parse_address(address):
     return ""
 
 
+class ConnectionPool:
+    """
+    Thread-safe pool of the connections (e.g. authenticated rpyc connections to the daemon), which are shared by all
+    evaluations of the executor.
+
+    At most max_size connections are open, acquire() waits for a released one. The idle connections are reused
+    (the last released first), the connections idle longer than health_check_interval are checked by ping before
+    reuse. The closed and broken connections are dropped and replaced by new ones.
+    """
+
+    def __init__(self, connect, max_size=8, health_check_interval=30.0, timeout=None):
+        """
+        :param connect: function, which opens a new connection
+        :param max_size: maximal number of the open connections
+        :param health_check_interval: idle time [s] after which the connection is pinged before reuse
+        :param timeout: maximal time [s] of waiting for a free connection (None - no limit)
+        """
+        self.connect = connect
+        self.max_size = max_size
+        self.health_check_interval = health_check_interval
+        self.timeout = timeout
+
+        # idle connections (connection, time of release)
+        self._idle = []
+        # number of the open connections (idle and in use)
+        self._size = 0
+        self._condition = threading.Condition()
+
+    def __len__(self):
+        return self._size
+
+    def __getstate__(self):
+        # the connections and the lock are not transferred (e.g. to the worker processes)
+        state = self.__dict__.copy()
+        state['_idle'] = []
+        state['_size'] = 0
+        del state['_condition']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        """ Returns an idle (healthy) connection or opens a new one. """
+        while True:
+            with self._condition:
+                while not self._idle and self._size >= self.max_size:
+                    if not self._condition.wait(self.timeout):
+                        raise TimeoutError("ConnectionPool: no free connection in {} s.".format(self.timeout))
+
+                if self._idle:
+                    connection, released = self._idle.pop()
+                else:
+                    # a new connection is opened outside the lock
+                    self._size += 1
+                    connection = None
+
+            if connection is None:
+                try:
+                    return self.connect()
+                except BaseException:
+                    self._drop(None)
+                    raise
+
+            if self._is_healthy(connection, released):
+                return connection
+            self._drop(connection)
+
+    def release(self, connection, broken=False):
+        """ Returns the connection to the pool, the broken (or closed) connection is closed and dropped. """
+        if broken or getattr(connection, 'closed', False):
+            self._drop(connection)
+        else:
+            with self._condition:
+                self._idle.append((connection, time.time()))
+                self._condition.notify()
+
+    @contextmanager
+    def connection(self):
+        """ Context manager of the acquired connection, the connection is dropped on ConnectionError or EOFError. """
+        connection = self.acquire()
+        try:
+            yield connection
+        except (ConnectionError, EOFError):
+            self.release(connection, broken=True)
+            raise
+        except BaseException:
+            self.release(connection)
+            raise
+        else:
+            self.release(connection)
+
+    def close(self):
+        """ Closes the idle connections. """
+        with self._condition:
+            idle = self._idle
+            self._idle = []
+            self._size -= len(idle)
+            self._condition.notify_all()
+
+        for connection, _ in idle:
+            self._close(connection)
+
+    def _is_healthy(self, connection, released):
+        if getattr(connection, 'closed', False):
+            return False
+        if time.time() - released < self.health_check_interval:
+            return True
+
+        try:
+            connection.ping(timeout=min(self.health_check_interval, 5.0))
+            return True
+        except Exception:
+            return False
+
+    def _drop(self, connection):
+        if connection is not None:
+            self._close(connection)
+
+        with self._condition:
+            self._size -= 1
+            self._condition.notify()
+
+    @staticmethod
+    def _close(connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+
+class JobMonitor:
+    """
+    Tracker of the submitted jobs shared by all evaluations of the executor. One thread reads the event logs of all
+    watched jobs in one round (by one call eventlogs(remote_dirs), if the daemon provides it), the evaluations wait
+    for the futures resolved by the monitor.
+
+    The delay between the rounds grows from min_delay to max_delay (by factor backoff) while there are no new
+    events, new events and new jobs reset it.
+    """
+
+    def __init__(self, connections, logger=None, min_delay=0.5, max_delay=5.0, backoff=1.5, max_failures=10):
+        """
+        :param connections: ConnectionPool of the daemon
+        :param logger: logger of the job events (None - not logged)
+        :param max_failures: the waiting evaluations fail after max_failures rounds with the broken connection in a row
+        """
+        self.connections = connections
+        self.logger = logger
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.backoff = backoff
+        self.max_failures = max_failures
+        self.delay = min_delay
+
+        # remote_dir -> watched job (future, number of procs, number of read events, finished procs)
+        self._jobs = {}
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def __len__(self):
+        return len(self._jobs)
+
+    def __getstate__(self):
+        # the watched jobs and the thread are not transferred
+        state = self.__dict__.copy()
+        state['_jobs'] = {}
+        state['_thread'] = None
+        del state['_condition']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._condition = threading.Condition()
+
+    def watch(self, remote_dir, procs=1):
+        """
+        Starts tracking of the job (cluster) in remote_dir.
+
+        :return: future, its result is the dictionary proc -> final event (job_terminated or job_held) of all procs
+        """
+        future = Future()
+        with self._condition:
+            self._jobs[remote_dir] = {"future": future, "procs": procs, "events": 0, "finished": {}}
+            self.delay = self.min_delay
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            self._condition.notify()
+        return future
+
+    def unwatch(self, remote_dir):
+        """ Stops tracking of the job, its future is cancelled. """
+        with self._condition:
+            job = self._jobs.pop(remote_dir, None)
+        if job is not None:
+            job["future"].cancel()
+
+    def cancel(self, remote_dir):
+        """ Stops tracking of the job and removes it from the queue (condor_rm), if the daemon provides remove_job. """
+        self.unwatch(remote_dir)
+        with self.connections.connection() as client:
+            if "remove_job" in dir(client.root):
+                client.root.remove_job(remote_dir)
+
+    def poll(self):
+        """
+        Reads the new events of all watched jobs and resolves the futures of the finished ones.
+
+        :return: True, if there were new events
+        """
+        with self._condition:
+            jobs = dict(self._jobs)
+        if not jobs:
+            return False
+
+        with self.connections.connection() as client:
+            if "eventlogs" in dir(client.root):
+                eventlogs = client.root.eventlogs(list(jobs.keys()))
+            else:
+                eventlogs = {remote_dir: client.root.eventlog(remote_dir) for remote_dir in jobs}
+
+            changed = False
+            for remote_dir, job in jobs.items():
+                eventlog = eventlogs[remote_dir]
+                n = len(eventlog)
+                for i in range(job["events"], n):
+                    self._event(remote_dir, job, eventlog[i])
+                changed = changed or n > job["events"]
+                job["events"] = n
+
+        for remote_dir, job in jobs.items():
+            if len(job["finished"]) >= job["procs"]:
+                with self._condition:
+                    if self._jobs.get(remote_dir) is job:
+                        del self._jobs[remote_dir]
+                if job["future"].set_running_or_notify_cancel():
+                    job["future"].set_result(job["finished"])
+
+        return changed
+
+    def _event(self, remote_dir, job, event):
+        tp = event["type"]
+
+        args = ""
+        if tp == "execute":
+            args = "ExecuteHost: {}".format(event["execute_host"])
+        elif tp in ["job_terminated", "job_held"]:
+            job["finished"][event["proc"]] = event
+
+        if self.logger is not None:
+            if tp == "job_held":
+                self.logger.error("Job {}.{} is '{}' at {}".format(event["cluster"], event["proc"], tp, ""))
+            self.logger.info("Job {}.{} ({}) is '{}' at {}".format(event["cluster"], event["proc"], remote_dir, tp,
+                                                                  args))
+
+    def _run(self):
+        failures = 0
+        try:
+            while True:
+                with self._condition:
+                    if not self._jobs:
+                        self._thread = None
+                        return
+
+                try:
+                    changed = self.poll()
+                    failures = 0
+                except (ConnectionError, EOFError) as e:
+                    # the broken connection was dropped from the pool, the next round reconnects
+                    failures += 1
+                    if failures >= self.max_failures:
+                        raise
+                    if self.logger is not None:
+                        self.logger.warning("JobMonitor: {} - reconnecting ({}/{})".format(e, failures,
+                                                                                          self.max_failures))
+                    changed = False
+
+                with self._condition:
+                    self.delay = self.min_delay if changed else min(self.delay * self.backoff, self.max_delay)
+                    if self._jobs:
+                        self._condition.wait(self.delay)
+        except Exception as e:
+            # the waiting evaluations get the error, the next watch starts a new thread
+            with self._condition:
+                jobs = self._jobs
+                self._jobs = {}
+                self._thread = None
+            for job in jobs.values():
+                if job["future"].set_running_or_notify_cancel():
+                    job["future"].set_exception(e)
+        finally:
+            with self._condition:
+                if self._thread is threading.current_thread():
+                    self._thread = None
+
+
+class UploadCache:
+    """
+    Content-addressed cache of the files uploaded to the daemon. Every file is uploaded once (to
+    <artap_dir>/<directory>/<sha256 of the content>), the job directories get a hard link to it (or a copy made on the
+    server, if the link is not possible). The jobs must not change their input files in place (HTCondor transfers them
+    to the execute node).
+
+    The cache is not evicted by the daemon: cleanup() (called by RemoteExecutor.close()) removes the contents uploaded
+    by this cache, which are not the current content of any transferred file (the previous versions of the changed
+    files). The job directories keep their hard links (copies) of the removed contents.
+    """
+
+    def __init__(self, directory=".cache", link=True):
+        """
+        :param directory: cache directory on the server (relative to artap_dir)
+        :param link: hard links to the cached files (False - copies)
+        """
+        self.directory = directory
+        self.link = link
+
+        # local path -> (mtime, size, digest)
+        self._digests = {}
+        # digests of the files stored on the server
+        self._uploaded = set()
+        # digest -> future of the running upload (the concurrent transfers of the same content wait for it)
+        self._uploading = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        state['_uploading'] = {}
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def digest(self, path):
+        """ SHA-256 of the content of the file (computed again only if the file was changed). """
+        stat = os.stat(path)
+        known = self._digests.get(path)
+        if known is not None and known[:2] == (stat.st_mtime_ns, stat.st_size):
+            return known[2]
+
+        sha = hashlib.sha256()
+        with open(path, 'rb') as file:
+            for chunk in iter(lambda: file.read(1 << 20), b''):
+                sha.update(chunk)
+        digest = sha.hexdigest()
+        self._digests[path] = (stat.st_mtime_ns, stat.st_size, digest)
+        return digest
+
+    def cleanup(self, client):
+        """ Removes the stale contents uploaded by this cache from the server, returns their digests. """
+        current = set(digest for _, _, digest in self._digests.values())
+        with self._lock:
+            stale = self._uploaded - current
+            self._uploaded -= stale
+
+        artap_dir = client.root.artap_dir
+        for digest in stale:
+            try:
+                client.modules.os.remove("{}/{}/{}".format(artap_dir, self.directory, digest))
+            except FileNotFoundError:
+                # cache removed on the server
+                pass
+        return stale
+
+    def transfer(self, source_file, destination_file, client):
+        """ Creates destination_file (relative to artap_dir) on the server from the cached content of source_file. """
+        digest = self.digest(source_file)
+        artap_dir = client.root.artap_dir
+        cached = "{}/{}/{}".format(artap_dir, self.directory, digest)
+        destination = "{}/{}".format(artap_dir, destination_file)
+
+        remote_os = client.modules.os
+        # the lock is held only for the lookup, the files of different content are uploaded concurrently
+        with self._lock:
+            upload = None
+            uploading = False
+            if digest not in self._uploaded:
+                upload = self._uploading.get(digest)
+                if upload is None:
+                    upload = self._uploading[digest] = Future()
+                    uploading = True
+
+        if uploading:
+            try:
+                if not remote_os.path.exists(cached):
+                    remote_os.makedirs("{}/{}".format(artap_dir, self.directory), exist_ok=True)
+                    # the file is renamed after the upload, the partial files are never linked
+                    partial = "{}.{}".format(cached, uuid1().hex)
+                    upload_file(client, localpath=source_file, remotepath=partial)
+                    remote_os.replace(partial, cached)
+            except BaseException as e:
+                with self._lock:
+                    del self._uploading[digest]
+                upload.set_exception(e)
+                raise
+
+            with self._lock:
+                self._uploaded.add(digest)
+                del self._uploading[digest]
+            upload.set_result(digest)
+        elif upload is not None:
+            # the same content is being uploaded by another evaluation
+            upload.result()
+
+        try:
+            if self.link:
+                remote_os.link(cached, destination)
+            else:
+                client.modules.shutil.copyfile(cached, destination)
+        except FileNotFoundError:
+            # cache removed on the server (e.g. restart of the daemon), the file is uploaded again
+            with self._lock:
+                self._uploaded.discard(digest)
+            if remote_os.path.exists(cached):
+                raise
+            self.transfer(source_file, destination_file, client)
+        except OSError:
+            # file system without hard links
+            client.modules.shutil.copyfile(cached, destination)
+
+
 class Executor(metaclass=ABCMeta):
     """
     Function is a class representing objective or cost function for
@@ -255,6 +683,10 @@ class RemoteExecutor(Executor):
                              desc='Username')
         self.options.declare(name='port', default=15900, lower=0,
                              desc='Port')
+        self.options.declare(name='max_connections', default=16, lower=1,
+                             desc='Maximal number of the connections to the daemon (shared by the evaluations)')
+        self.options.declare(name='cache_uploads', default=True,
+                             desc='Upload every input file once, the job directories link to it (UploadCache)')
 
         # command
         self.command = command
@@ -263,10 +695,38 @@ class RemoteExecutor(Executor):
         self.input_files = files_to_server
         self.output_files = files_from_server
 
+        self._connections = None
+        self.upload_cache = UploadCache()
+
     @abstractmethod
     def eval(self, individual):
         super().eval(individual)
 
+    async def eval_async(self, individual):
+        """
+        Evaluates the individual in the asyncio loop (e.g. problem.evaluate_async), the blocking eval() runs in the
+        default executor of the loop. The subclasses can wait for the remote jobs without threads.
+        """
+        return await asyncio.get_running_loop().run_in_executor(None, self.eval, individual)
+
+    @property
+    def connections(self):
+        """ Pool of the connections to the daemon (created at the first use). """
+        if self._connections is None:
+            self._connections = ConnectionPool(self._create_client, max_size=self.options["max_connections"])
+        return self._connections
+
+    def close(self):
+        """ Removes the stale uploads from the server cache (UploadCache.cleanup), closes the idle connections. """
+        if self._connections is not None:
+            if self.options["cache_uploads"]:
+                try:
+                    with self._connections.connection() as client:
+                        self.upload_cache.cleanup(client)
+                except (ConnectionError, EOFError) as e:
+                    self.problem.logger.warning("RemoteExecutor: upload cache was not cleaned up: {}".format(e))
+            self._connections.close()
+
     def _create_client(self):
         # key = os.path.join(os.path.dirname(__file__), "cert/artap.key")
         # cert = os.path.join(os.path.dirname(__file__), "cert/artap.crt")
@@ -295,13 +755,10 @@ class RemoteExecutor(Executor):
 
     @staticmethod
     def _create_file_on_remote(destination_file, content, remote_dir, client):
-        fp = tempfile.NamedTemporaryFile(mode='w+t', delete=False, newline="\n")
-        fp.write(content)
-        fp.close()
-
-        RemoteExecutor._transfer_file_to_remote(fp.name, destination_file, remote_dir, client)
-
-        os.unlink(fp.name)
+        # small generated files are written directly (without temporary file)
+        remote_path = "{}/{}/{}".format(client.root.artap_dir, remote_dir, destination_file)
+        with client.builtin.open(remote_path, "w", newline="\n") as file:
+            file.write(content)
 
     @staticmethod
     def _transfer_file_to_remote(source_file, destination_file, remote_dir, client):
@@ -335,8 +792,12 @@ class RemoteExecutor(Executor):
         # transfer input files
         if self.input_files:
             for file in self.input_files:
-                self._transfer_file_to_remote("{}/{}".format(self.problem.working_dir, file), "./{}".format(file),
-                                              remote_dir=remote_dir, client=client)
+                source_file = "{}/{}".format(self.problem.working_dir, file)
+                if self.options["cache_uploads"]:
+                    self.upload_cache.transfer(source_file, "{}/{}".format(remote_dir, file), client)
+                else:
+                    self._transfer_file_to_remote(source_file, "./{}".format(file),
+                                                  remote_dir=remote_dir, client=client)
 
     def _transfer_files_from_remote(self, client):
         pass
@@ -359,6 +820,14 @@ class CondorJobExecutor(RemoteExecutor):
         self.request_memory = -1
         self.hold_on_start = False
 
+        self.options.declare(name='min_poll_delay', default=0.5, lower=0.0,
+                             desc='Delay [s] between the reads of the job events after a change')
+        self.options.declare(name='max_poll_delay', default=5.0, lower=0.0,
+                             desc='Maximal delay [s] between the reads of the job events (without changes)')
+        self.options.declare(name='max_reconnects', default=10, lower=1,
+                             desc='Maximal number of the attempts to reconnect to the daemon in a row')
+        self._monitor = None
+
         # executor id -  create client
         # check if running on condor
         if os.path.exists('.job.ad'):
@@ -368,12 +837,45 @@ class CondorJobExecutor(RemoteExecutor):
                     # update remote dir with executor_id
                     if line.startswith("OrigIwd = "):
                         remote_dir = line[11:-2].split("/")[-1]
-                        client = self._create_client()
-                        client.root.log_update_executor(remote_dir, self.uuid)
+                        with self.connections.connection() as client:
+                            client.root.log_update_executor(remote_dir, self.uuid)
+
+    def _job_description(self, individual):
+        """
+        Returns the description of the job of the individual (dictionary):
+            executable - name of the executable (self.executable is stored in it)
+            files - generated files of the individual (name -> content)
+            input_files - input files of the job (self.input_files and the generated files)
+            arguments - arguments of the executable
+            desc - description of the job (_create_desc)
+
+        The subclasses, which override _create_job_file instead, are evaluated by the single jobs (no clusters).
+        """
+        raise NotImplementedError("CondorJobExecutor: override _job_description (or _create_job_file).")
+
+    def _has_job_description(self):
+        return type(self)._job_description is not CondorJobExecutor._job_description
 
-    @abstractmethod
     def _create_job_file(self, remote_dir, individual, client):
-        pass
+        job = self._job_description(individual)
+
+        # create input files with parameters
+        for name, content in job["files"].items():
+            self._create_file_on_remote(name, content, remote_dir=remote_dir, client=client)
+
+        # create executable
+        self._create_file_on_remote(job["executable"], self.executable, remote_dir=remote_dir, client=client)
+
+        client.root.submit_job(remote_dir=remote_dir,
+                               executable="{}/{}/{}".format(client.root.artap_dir, remote_dir, job["executable"]),
+                               arguments=job["arguments"],
+                               input_files=job["input_files"],
+                               output_files=self.output_files,
+                               requirements=self.requirements,
+                               request_cpus=self.request_cpus,
+                               request_memory=self.request_memory,
+                               hold_on_start=self.hold_on_start,
+                               desc=job["desc"])
 
     def _create_desc(self, individual):
         desc = {}
@@ -385,18 +887,56 @@ class CondorJobExecutor(RemoteExecutor):
 
         return desc
 
-    def eval(self, individual):
-        if self.options["hostname"] is None:
-            raise Exception("Condor host is not defined.")
-
-        super().eval(individual)
+    @property
+    def monitor(self):
+        """ Tracker of the submitted jobs (created at the first use). """
+        if self._monitor is None:
+            self._monitor = JobMonitor(self.connections, logger=self.problem.logger,
+                                       min_delay=self.options["min_poll_delay"],
+                                       max_delay=self.options["max_poll_delay"],
+                                       max_failures=self.options["max_reconnects"])
+        return self._monitor
+
+    def _reconnect(self, error, attempt):
+        """ Logs the broken connection, returns False if the number of the attempts reached max_reconnects. """
+        if attempt > self.options["max_reconnects"]:
+            return False
+        self.problem.logger.warning("CondorJobExecutor: {} - reconnecting ({}/{})".format(
+            error, attempt, self.options["max_reconnects"]))
+        return True
+
+    def _wait_for_jobs(self, remote_dir, procs=1):
+        """ Waits for the job (cluster) in remote_dir, returns dictionary proc -> final event. """
+        future = self.monitor.watch(remote_dir, procs)
+        try:
+            return future.result(timeout=self.problem.options["time_out"])
+        except FutureTimeoutError:
+            self._cancel_job(remote_dir)
+            raise TimeoutError
 
-        success = False
-        while not success:
-            try:
-                # create client
-                client = self._create_client()
+    async def _wait_for_jobs_async(self, remote_dir, procs=1):
+        future = self.monitor.watch(remote_dir, procs)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.problem.options["time_out"])
+        except asyncio.TimeoutError:
+            await asyncio.get_running_loop().run_in_executor(None, self._cancel_job, remote_dir)
+            raise TimeoutError
 
+    def _cancel_job(self, remote_dir):
+        """ Removes the timed out job from the queue and its directory, it is not watched anymore. """
+        try:
+            self.monitor.cancel(remote_dir)
+            with self.connections.connection() as client:
+                client.root.remove_job_dir(remote_dir)
+        except (ConnectionError, EOFError) as e:
+            # the time out is reported anyway
+            self.problem.logger.warning("CondorJobExecutor: job {} was not removed: {}".format(remote_dir, e))
+
+    def _submit(self, individual):
+        """ Submits the job of the individual, returns its remote directory. """
+        while True:
+            # connection from the pool of the executor
+            with self.connections.connection() as client:
                 # init remote
                 remote_dir = self._init_remote(client=client)
                 # self.problem.logger.info("RemoteDir {}".format(remote_dir))
@@ -407,127 +947,236 @@ class CondorJobExecutor(RemoteExecutor):
                 # submit job
                 try:
                     self._create_job_file(remote_dir, individual, client)
+                    return remote_dir
                 except AsyncResultTimeout as e:
                     print("ERROR - {} - try again ({})".format(e, remote_dir))
                     # remove job dir
                     client.root.remove_job_dir(remote_dir)
+                    # the closed connection is not returned to the pool
                     client.close()
-                    # resubmit
-                    return self.eval(individual)
-
-                start = time.time()
-
-                events = []
-                cnt = 0
-                successful_job = False
-                delay = 0.5
-
-                run = True
-                while run:
-                    eventlog = client.root.eventlog(remote_dir)
-                    for e in eventlog:
-                        if {e["timestamp"], e["type"]} not in events:
-                            events.append({e["timestamp"], e["type"]})
-
-                    # print("len(events) = {}".format(len(events)))
-                    if len(events) > 0:
-                        for i in range(cnt, len(events)):
-                            event = eventlog[i]
-                            tp = event["type"]
-
-                            args = ""
-
-                            if tp == "submit":
-                                # SUBMIT
-                                pass
-                            elif tp == "execute":
-                                # EXECUTE
-                                args += "ExecuteHost: {}, ".format(event["execute_host"])
-                                pass
-                            elif tp == "image_size":
-                                # IMAGE_SIZE
-                                pass
-                            elif tp == "job_terminated":
-                                # JOB_TERMINATED
-                                successful_job = event["successful"]
-                                run = False
-                            elif tp == "job_held":
-                                # JOB_HELD
-
-                                self.problem.logger.error(
-                                    "Job {}.{} is '{}' at {}".format(event["cluster"], event["proc"], event["type"],
-                                                                     ""))
-                                run = False
-                                # read log
-                                # content_log = self._read_file_from_remote("{}.log".format(self.output_files[0]),
-                                #                                          remote_dir=remote_dir, client=client)
-                                # self.problem.logger.error(content_log)
-                                # remove job
-                                # self._run_command_on_remote("condor_rm {}".format(process_id),
-                                #                            remote_dir=remote_dir, client=client)
-                                raise RuntimeError
-
-                            if len(args) > 0:
-                                args = args[:-2]
-
-                            self.problem.logger.info(
-                                "Job {}.{} ({}) is '{}' at {}".format(event["cluster"], event["proc"], remote_dir,
-                                                                      event["type"], args))
-                            # print("{}: {} ({})".format(eventlog[i].timestamp, eventlog[i].type, args))
-
-                    if run:
-                        cnt = len(events)
-                        time.sleep(delay)
-
-                end = time.time()
-                if (end - start) > self.problem.options["time_out"]:
-                    raise TimeoutError
-
-                if successful_job:
-                    if len(self.output_files) > 0:
-                        output_files = []
-                        d = datetime.datetime.now()
-                        ts = d.strftime("%Y-%m-%d-%H-%M-%S-%f")
-                        path = self.problem.working_dir + 'artap' + ts + str(individual.id)
-
-                        if os.path.exists(path):
-                            pass
-                        else:
-                            os.mkdir(path)
-
-                        for file in self.output_files:
-                            self._transfer_file_from_remote(source_file=file,
-                                                            destination_file="{}/{}".format(path, file),
-                                                            remote_dir=remote_dir, client=client)
-                            output_files.append("{}/{}".format(path, file))
-                        success = True
-                        result = self.parse_results(output_files, individual)
-                        # update cost on remote server
-
-                        # ToDo: resolve this, database is sometimes locked under Windows
-                        # client.root.log_update_cost(remote_dir, individual, result)
 
-                    # remove job dir
-                    if result is not None:
-                        client.root.remove_job_dir(remote_dir)
+    @staticmethod
+    def _check_job(events):
+        event = list(events.values())[0]
+        if event["type"] == "job_held":
+            raise RuntimeError
+        if not event["successful"]:
+            assert 0
+
+    def _collect(self, remote_dir, individual):
+        """ Downloads and parses the output files of the finished job. """
+        with self.connections.connection() as client:
+            result = None
+            if len(self.output_files) > 0:
+                output_files = []
+                d = datetime.datetime.now()
+                ts = d.strftime("%Y-%m-%d-%H-%M-%S-%f")
+                path = self.problem.working_dir + 'artap' + ts + str(individual.id)
+
+                if not os.path.exists(path):
+                    os.mkdir(path)
+
+                for file in self.output_files:
+                    self._transfer_file_from_remote(source_file=file,
+                                                    destination_file="{}/{}".format(path, file),
+                                                    remote_dir=remote_dir, client=client)
+                    output_files.append("{}/{}".format(path, file))
+                result = self.parse_results(output_files, individual)
+                # update cost on remote server
+
+                # ToDo: resolve this, database is sometimes locked under Windows
+                # client.root.log_update_cost(remote_dir, individual, result)
+
+                if self.problem.options['save_data_files'] is False:
+                    self._remove_dir(path)
+
+            # remove job dir
+            if result is not None:
+                client.root.remove_job_dir(remote_dir)
 
-                    if self.problem.options['save_data_files'] is False:
-                        self._remove_dir(path)
-                else:
-                    assert 0
+            return result
 
-                # remove job dir
-                # client.root.remove_job_dir(remote_dir)
+    def eval(self, individual):
+        if self.options["hostname"] is None:
+            raise Exception("Condor host is not defined.")
 
-                client.close()
+        super().eval(individual)
 
-                return result
+        attempt = 0
+        while True:
+            try:
+                remote_dir = self._submit(individual)
+                # the connection is returned to the pool while the job is running
+                self._check_job(self._wait_for_jobs(remote_dir))
+                return self._collect(remote_dir, individual)
+
+            except (ConnectionError, EOFError) as e:
+                # the broken connection was dropped from the pool, the job is submitted again
+                attempt += 1
+                if not self._reconnect(e, attempt):
+                    raise
+                time.sleep(1.0)
 
-            except ConnectionError as e:
-                print(e)
+    async def eval_async(self, individual):
+        """
+        Asynchronous evaluation: the submission and the download run in the default executor of the loop, the waiting
+        for the job does not hold any thread (future of the monitor).
+        """
+        if self.options["hostname"] is None:
+            raise Exception("Condor host is not defined.")
+
+        loop = asyncio.get_running_loop()
+        attempt = 0
+        while True:
+            try:
+                remote_dir = await loop.run_in_executor(None, self._submit, individual)
+                self._check_job(await self._wait_for_jobs_async(remote_dir))
+                return await loop.run_in_executor(None, self._collect, remote_dir, individual)
+
+            except (ConnectionError, EOFError) as e:
+                # the broken connection was dropped from the pool, the job is submitted again
+                attempt += 1
+                if not self._reconnect(e, attempt):
+                    raise
+                await asyncio.sleep(1.0)
+
+    def eval_batch(self, individuals, attempts=5):
+        """
+        Evaluates the individuals (e.g. the whole population) by one cluster of jobs (one proc per individual), the
+        problem can use it in the batch evaluation (the individuals are passed, if evaluate_batch accepts them):
+
+            def evaluate_batch(self, x, individuals=None):
+                return self.executor.eval_batch(individuals)
+
+        The shared input files and the executable are uploaded once to the cluster directory, the job of the proc i
+        runs in the directory <cluster directory>/i with its generated files (parameters). The cluster is submitted
+        by submit_cluster() of the daemon, the individuals are evaluated by the single jobs (eval), if the daemon does
+        not provide it (or the executor does not implement _job_description).
+
+        :param individuals: list of individuals
+        :param attempts: the failed procs are submitted again as one smaller cluster, at most attempts clusters
+        :return: list of the results of parse_results()
+        """
+        if self.options["hostname"] is None:
+            raise Exception("Condor host is not defined.")
+
+        if len(individuals) == 0:
+            return []
+        if not self._has_job_description():
+            return self._eval_single(individuals)
+
+        results = [None] * len(individuals)
+        failed = list(range(len(individuals)))
+        for attempt in range(attempts):
+            cluster = [individuals[i] for i in failed]
+            remote_dir = self._submit_cluster_retrying(cluster)
+            if remote_dir is None:
+                for i, result in zip(failed, self._eval_single(cluster)):
+                    results[i] = result
+                return results
+
+            events = self._wait_for_jobs(remote_dir, len(cluster))
+            if any(event["type"] == "job_held" for event in events.values()):
+                # the held procs stay in the queue, they are removed before the failed procs are submitted again
+                self.monitor.cancel(remote_dir)
+            with self.connections.connection() as client:
+                for i, result in zip(failed, self._collect_cluster(remote_dir, cluster, events, client)):
+                    results[i] = result
+
+            failed = [i for i in failed if results[i] is None]
+            if len(failed) == 0:
+                return results
+
+        raise RuntimeError("CondorJobExecutor: {} procs of the cluster failed.".format(len(failed)))
+
+    def _eval_single(self, individuals):
+        """ Evaluates the individuals by the single jobs, at most max_connections at once. """
+        with ThreadPoolExecutor(max_workers=self.options["max_connections"]) as pool:
+            return list(pool.map(self.eval, individuals))
+
+    def _submit_cluster_retrying(self, individuals):
+        """ Submits the cluster, the broken connections are replaced. Returns its remote directory (or None). """
+        attempt = 0
+        while True:
+            try:
+                with self.connections.connection() as client:
+                    if "submit_cluster" in dir(client.root):
+                        return self._submit_cluster(individuals, client)
+                    return None
+            except (ConnectionError, EOFError) as e:
+                # the broken connection was dropped from the pool, the cluster is submitted again
+                attempt += 1
+                if not self._reconnect(e, attempt):
+                    raise
                 time.sleep(1.0)
+
+    def _submit_cluster(self, individuals, client):
+        """ Submits the cluster of the individuals, returns its remote directory (None - not submitted). """
+        remote_dir = self._init_remote(client=client)
+
+        # shared files (input files and executable)
+        self._transfer_files_to_remote(remote_dir, client)
+        jobs = [self._job_description(individual) for individual in individuals]
+        executable = jobs[0]["executable"]
+        self._create_file_on_remote(executable, self.executable, remote_dir=remote_dir, client=client)
+
+        # generated files of the procs
+        shared_files = set(self.input_files or [])
+        input_files = []
+        for proc, job in enumerate(jobs):
+            client.modules.os.makedirs("{}/{}/{}".format(client.root.artap_dir, remote_dir, proc), exist_ok=True)
+            for name, content in job["files"].items():
+                self._create_file_on_remote("{}/{}".format(proc, name), content, remote_dir=remote_dir, client=client)
+            input_files.append(["../{}".format(file) if file in shared_files else file
+                                for file in job["input_files"]])
+
+        try:
+            client.root.submit_cluster(remote_dir=remote_dir,
+                                       executable="{}/{}/{}".format(client.root.artap_dir, remote_dir, executable),
+                                       arguments=[job["arguments"] for job in jobs],
+                                       input_files=input_files,
+                                       output_files=self.output_files,
+                                       requirements=self.requirements,
+                                       request_cpus=self.request_cpus,
+                                       request_memory=self.request_memory,
+                                       hold_on_start=self.hold_on_start,
+                                       desc=[job["desc"] for job in jobs])
+        except AsyncResultTimeout as e:
+            self.problem.logger.error("CondorJobExecutor: {} - evaluated by single jobs ({})".format(e, remote_dir))
+            client.root.remove_job_dir(remote_dir)
+            return None
+
+        return remote_dir
+
+    def _collect_cluster(self, remote_dir, individuals, events, client):
+        """ Parses the results of the successful procs (None - failed proc), the cluster directory is removed. """
+        results = []
+        d = datetime.datetime.now()
+        ts = d.strftime("%Y-%m-%d-%H-%M-%S-%f")
+        for proc, individual in enumerate(individuals):
+            event = events.get(proc)
+            if event is None or event["type"] != "job_terminated" or not event["successful"]:
+                results.append(None)
                 continue
 
+            output_files = []
+            path = self.problem.working_dir + 'artap' + ts + str(individual.id)
+            if not os.path.exists(path):
+                os.mkdir(path)
+
+            for file in self.output_files:
+                self._transfer_file_from_remote(source_file="{}/{}".format(proc, file),
+                                                destination_file="{}/{}".format(path, file),
+                                                remote_dir=remote_dir, client=client)
+                output_files.append("{}/{}".format(path, file))
+            results.append(self.parse_results(output_files, individual))
+
+            if self.problem.options['save_data_files'] is False:
+                self._remove_dir(path)
+
+        client.root.remove_job_dir(remote_dir)
+        return results
+
 
 class CondorPythonJobExecutor(CondorJobExecutor):
     def __init__(self, problem, script, parameter_file, output_files=None, python_path="python3"):
@@ -545,27 +1194,19 @@ class CondorPythonJobExecutor(CondorJobExecutor):
 
         self.requirements = "(OpSys == \"LINUX\" && Arch == \"X86_64\")"
 
-    def _create_job_file(self, remote_dir, individual, client):
-        condor_output_files = self.output_files
-
-        condor_input_files = [self.script]
-        # create input file with parameters
+    def _job_description(self, individual):
+        files = {}
+        input_files = [self.script]
 
         if self.parameter_file:
-            # parameters
-            # create remote file
-            param_values_string = Executor._join_parameters_values(individual.vector, "\n")
-            condor_input_files.append(self.parameter_file)
+            # create input file with parameters
+            files[self.parameter_file] = Executor._join_parameters_values(individual.vector, "\n")
+            input_files.append(self.parameter_file)
             arguments = self.script + " " + self.parameter_file
-            self._create_file_on_remote(self.parameter_file, param_values_string, remote_dir=remote_dir,
-                                        client=client)
         else:
             param_values_string = Executor._join_parameters_values(individual.vector, ",")
             arguments = self.script + " " + param_values_string
 
-        # create executable
-        self._create_file_on_remote("run.sh", self.executable, remote_dir=remote_dir, client=client)
-
         # desc
         desc = self._create_desc(individual)
         desc["type"] = "python"
@@ -573,16 +1214,8 @@ class CondorPythonJobExecutor(CondorJobExecutor):
         desc["editor"] = True
         desc["name"] = "Python"
 
-        client.root.submit_job(remote_dir=remote_dir,
-                               executable="{}/{}/run.sh".format(client.root.artap_dir, remote_dir),
-                               arguments=arguments,
-                               input_files=condor_input_files,
-                               output_files=condor_output_files,
-                               requirements=self.requirements,
-                               request_cpus=self.request_cpus,
-                               request_memory=self.request_memory,
-                               hold_on_start=self.hold_on_start,
-                               desc=desc)
+        return {"executable": "run.sh", "files": files, "input_files": input_files, "arguments": arguments,
+                "desc": desc}
 
 
 class CondorMatlabJobExecutor(CondorJobExecutor):
@@ -602,19 +1235,13 @@ class CondorMatlabJobExecutor(CondorJobExecutor):
 
         self.requirements = "(OpSys == \"LINUX\" && Arch == \"X86_64\")"
 
-    def _create_job_file(self, remote_dir, individual, client):
-        condor_input_files = [self.parameter_file, self.input_files[0]]
-        condor_output_files = self.output_files
+    def _job_description(self, individual):
+        files = {}
+        input_files = [self.parameter_file, self.input_files[0]]
 
-        # create input file with parameters
         if self.parameter_file:
-            # parameters
-            param_values_string = Executor._join_parameters_values(individual.vector, "\n")
-            # create remote file
-            self._create_file_on_remote(self.parameter_file, param_values_string, remote_dir=remote_dir, client=client)
-
-        # create executable
-        self._create_file_on_remote("run.sh", self.executable, remote_dir=remote_dir, client=client)
+            # create input file with parameters
+            files[self.parameter_file] = Executor._join_parameters_values(individual.vector, "\n")
 
         # desc
         desc = self._create_desc(individual)
@@ -623,16 +1250,8 @@ class CondorMatlabJobExecutor(CondorJobExecutor):
         desc["editor"] = False
         desc["name"] = "Matlab"
 
-        client.root.submit_job(remote_dir=remote_dir,
-                               executable="{}/{}/run.sh".format(client.root.artap_dir, remote_dir),
-                               arguments=self.script,
-                               input_files=condor_input_files,
-                               output_files=condor_output_files,
-                               requirements=self.requirements,
-                               request_cpus=self.request_cpus,
-                               request_memory=self.request_memory,
-                               hold_on_start=self.hold_on_start,
-                               desc=desc)
+        return {"executable": "run.sh", "files": files, "input_files": input_files, "arguments": self.script,
+                "desc": desc}
 
 
 class CondorComsolJobExecutor(CondorJobExecutor):
@@ -651,19 +1270,13 @@ class CondorComsolJobExecutor(CondorJobExecutor):
         self.request_memory = 30
         self.requirements = "(OpSys == \"LINUX\" && Arch == \"X86_64\")"
 
-    def _create_job_file(self, remote_dir, individual, client):
-        condor_input_files = [self.model_file]
-        condor_output_files = self.output_files
-
+    def _job_description(self, individual):
         param_names_string = Executor._join_parameters_names(self.problem.parameters)
         param_values_string = Executor._join_parameters_values(individual.vector)
         arguments = self.arguments.substitute(input_file=os.path.basename(self.model_file),
                                               param_names=param_names_string,
                                               param_values=param_values_string)
 
-        # create executable
-        self._create_file_on_remote("run.sh", self.executable, remote_dir=remote_dir, client=client)
-
         # desc
         desc = self._create_desc(individual)
         desc["type"] = "comsol"
@@ -671,16 +1284,8 @@ class CondorComsolJobExecutor(CondorJobExecutor):
         desc["editor"] = False
         desc["name"] = "Comsol Multiphysics"
 
-        client.root.submit_job(remote_dir=remote_dir,
-                               executable="{}/{}/run.sh".format(client.root.artap_dir, remote_dir),
-                               arguments=arguments,
-                               input_files=condor_input_files,
-                               output_files=condor_output_files,
-                               requirements=self.requirements,
-                               request_cpus=self.request_cpus,
-                               request_memory=self.request_memory,
-                               hold_on_start=self.hold_on_start,
-                               desc=desc)
+        return {"executable": "run.sh", "files": {}, "input_files": [self.model_file], "arguments": arguments,
+                "desc": desc}
 
 
 class LocalCSTExecutor(Executor):
@@ -735,21 +1340,12 @@ class CondorCSTJobExecutor(CondorJobExecutor):
         self.request_memory = 10
         self.requirements = "(OpSys == \"WINDOWS\" && Arch == \"X86_64\")"
 
-    def _create_job_file(self, remote_dir, individual, client):
-        condor_input_files = [self.model_file]
-        condor_output_files = self.output_files
-
+    def _job_description(self, individual):
         parameters = ""
         for parameter, value in zip(self.problem.parameters, individual.vector):
             parameters += "{}={}\n".format(parameter['name'], value)
 
         parameter_file = "parameters.txt"
-        condor_input_files.append(parameter_file)
-        self._create_file_on_remote(parameter_file, parameters, remote_dir=remote_dir,
-                                    client=client)
-
-        # create executable
-        self._create_file_on_remote("run.bat", self.executable, remote_dir=remote_dir, client=client)
 
         # desc
         desc = self._create_desc(individual)
@@ -758,13 +1354,5 @@ class CondorCSTJobExecutor(CondorJobExecutor):
         desc["editor"] = False
         desc["name"] = "CST"
 
-        client.root.submit_job(remote_dir=remote_dir,
-                               executable="{}/{}/run.bat".format(client.root.artap_dir, remote_dir),
-                               arguments="",
-                               input_files=condor_input_files,
-                               output_files=condor_output_files,
-                               requirements=self.requirements,
-                               request_cpus=self.request_cpus,
-                               request_memory=self.request_memory,
-                               hold_on_start=self.hold_on_start,
-                               desc=desc)
+        return {"executable": "run.bat", "files": {parameter_file: parameters},
+                "input_files": [self.model_file, parameter_file], "arguments": "", "desc": desc}
@@ -1,11 +1,66 @@
 from abc import *
 from collections.abc import Iterable
 from enum import Enum
+from array import array
+from itertools import count
+import pickle
 import numpy as np
 
 
+_unique_fingerprints = count()
+
+
+def _fingerprint(value):
+    """ Hash of the content of the value, the lists, dicts and arrays are compared element-wise. """
+    if type(value) is list:
+        try:
+            # fast path for the lists of numbers
+            return hash(array('d', value).tobytes())
+        except (TypeError, OverflowError):
+            return hash(tuple(_fingerprint(item) for item in value))
+    if type(value) is dict:
+        return hash(tuple((key, _fingerprint(item)) for key, item in value.items()))
+    if type(value) is tuple:
+        return hash(tuple(_fingerprint(item) for item in value))
+    if isinstance(value, (set, frozenset)):
+        return hash(frozenset(value))
+    if isinstance(value, np.ndarray):
+        return hash((value.shape, value.tobytes()))
+    try:
+        return hash(value)
+    except TypeError:
+        pass
+    # other unhashable values are compared by their pickled content
+    try:
+        return hash(pickle.dumps(value))
+    except Exception:
+        # the content can not be compared, the value is always reported as modified
+        return next(_unique_fingerprints)
+
+
+def _indexed(name):
+    """ Attribute, whose changes are reported to the population index of the problem (if any). """
+
+    def get(self):
+        return self.__dict__[name]
+
+    def set(self, value):
+        if self._index is not None:
+            self._index.move(self, name, self.__dict__[name], value)
+        self.__dict__[name] = value
+
+    return property(get, set)
+
+
 class Individual(metaclass=ABCMeta):
-    """ Collects information about one point in design space. """
+    """
+    Collects information about one point in design space.
+
+    is_modified() returns True, if the content of the individual (vector, costs, state, features, custom, ...) was
+    changed since the last mark_synced() call, the values are compared by their fingerprints (element-wise).
+
+    The changes of population_id and algorithm_id are reported to the population index of the problem (if any).
+    """
 
     class State(Enum):
         EMPTY = 0
@@ -26,6 +81,13 @@ class Individual(metaclass=ABCMeta):
 
     counter: int = 0
 
+    # fingerprint of the last synced content
+    _synced = None
+    # population index of the problem
+    _index = None
+    population_id = _indexed('population_id')
+    algorithm_id = _indexed('algorithm_id')
+
     def __init__(self, vector: list = None):
         self.id = Individual.counter
         Individual.counter += 1
@@ -44,14 +106,32 @@ class Individual(metaclass=ABCMeta):
         self.parents = []
         self.children = []
 
-        self.features = dict()
-        self.features["start_time"] = 0.0
-        self.features["finish_time"] = 0.0
-        self.features["feasible"] = 0.0  # the distance from the feasibility region in min norm, its an index, not a
-        self.features["precision"] = 7  # the default value of the considered decimals
+        self.features = {"start_time": 0.0,
+                         "finish_time": 0.0,
+                         "feasible": 0.0,  # the distance from the feasibility region in min norm, its an index, not a
+                         "precision": 7}  # the default value of the considered decimals
         self.add_features()
         self.custom = {}
 
+    def __getstate__(self):
+        # the index is not transferred (e.g. to the worker processes)
+        state = self.__dict__.copy()
+        state.pop('_index', None)
+        return state
+
+    def _modification_stamp(self):
+        return hash((_fingerprint(self.vector), _fingerprint(self.costs), _fingerprint(self.costs_signed), self.state,
+                     self.population_id, self.algorithm_id, _fingerprint(self.features), _fingerprint(self.custom),
+                     tuple(id(parent) for parent in self.parents), tuple(id(child) for child in self.children)))
+
+    def is_modified(self):
+        """ Returns True if the individual was changed since the last mark_synced() call. """
+        return self._synced != self._modification_stamp()
+
+    def mark_synced(self):
+        """ Marks the current state of the individual as stored (e.g. in the data store). """
+        self._synced = self._modification_stamp()
+
     def copy(self):
         """Create a new Individual instance from a single individual"""
         new_individual = self.__class__(self.vector)
@@ -105,10 +185,9 @@ class Individual(metaclass=ABCMeta):
         return string
 
     def __eq__(self, other):
-        diff = 1
-        for i in range(len(self.vector)):
-            diff = abs(self.vector[i] - other.vector[i])
-        return diff < 1e-10
+        if len(self.vector) != len(other.vector):
+            return False
+        return all(abs(a - b) < 1e-10 for a, b in zip(self.vector, other.vector))
 
     def __hash__(self):
         return hash(tuple(self.vector))
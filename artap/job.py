@@ -1,9 +1,12 @@
 import time
 import sys
+import inspect
 from abc import ABCMeta
 from .individual import Individual
 from .utils import VectorAndNumbers
+from .surrogate import SurrogateModelEval
 from math import inf
+import numpy as np
 
 
 class Job(metaclass=ABCMeta):
@@ -18,49 +21,170 @@ class Job(metaclass=ABCMeta):
         if individual.state == individual.State.EVALUATED:
             return
 
+        # Skips calculation of already visited point
+        if self.restore_from_cache(individual):
+            return
+
         for i in range(5):
-            # info
-            individual.features["start_time"] = time.time()
-            t_s = time.time()
+            self._start(individual)
 
-            # set in progress
-            individual.state = individual.State.IN_PROGRESS
+            # problem cost function evaluate only in that case when the problem fits the constraints
+            try:
+                self._finish(individual, self.problem.surrogate.evaluate(individual))
+                return
+            except (TimeoutError, RuntimeError) as e:
+                self._fail(individual, e)
+                continue
+            except:
+                print("Job: unexpected error:", sys.exc_info()[0])
+                raise
 
-            # check the constraints
-            constraints = self.problem.evaluate_inequality_constraints(individual.vector)
+        raise RuntimeError("To many failures has appeared.")
 
-            if len(constraints) > 0:
-                # sum(map(abs, constraints)) - original version
-                eps = 0.0
-                individual.features["feasible"] = all(v < eps for (v) in constraints)
+    async def evaluate_async(self, individual):
+        """ Evaluates the individual by problem.evaluate_async() (coroutine), the failures are handled as in evaluate. """
+        # Skips calculation of already calculated or visited individual
+        if individual.state == individual.State.EVALUATED or self.restore_from_cache(individual):
+            return
+
+        for i in range(5):
+            self._start(individual)
 
-            # problem cost function evaluate only in that case when the problem fits the constraints
             try:
-                costs = self.problem.surrogate.evaluate(individual)
-                individual.costs = costs
-                if self.problem is not None:
-                    individual.calc_signed_costs(self.problem.signs)  # the idea is to make this conversion only once
-
-                # set evaluated
-                individual.state = individual.State.EVALUATED
-                # info
-                individual.features["finish_time"] = time.time()
-                # write to store
-                self.problem.data_store.sync_individual(individual)
+                self.problem.surrogate.eval_counter += 1
+                self._finish(individual, await self.problem.evaluate_async(individual))
                 return
             except (TimeoutError, RuntimeError) as e:
-                print("Job: error:", e)
-                failed_individual = Individual(individual.vector)
-                failed_individual.state = individual.State.FAILED
-                individual.features["feasible"] = False  # TODO: genetic algorithms uses this information, i dont know the correct solution
-                self.problem.failed.append(failed_individual)
-                # in the case of failure generate new random individual
-                # TODO: create different strategies
-                individual.vector = VectorAndNumbers.gen_vector(self.problem.parameters)
-                individual.state = individual.State.EMPTY
+                self._fail(individual, e)
                 continue
             except:
                 print("Job: unexpected error:", sys.exc_info()[0])
                 raise
 
         raise RuntimeError("To many failures has appeared.")
+
+    def async_evaluation(self):
+        """ True if the problem offers evaluate_async and it is not hidden behind a surrogate model. """
+        return "evaluate_async" in dir(self.problem) and isinstance(self.problem.surrogate, SurrogateModelEval)
+
+    def _start(self, individual):
+        # info
+        individual.features["start_time"] = time.time()
+
+        # set in progress
+        individual.state = individual.State.IN_PROGRESS
+
+        # check the constraints
+        constraints = self.problem.evaluate_inequality_constraints(individual.vector)
+
+        if len(constraints) > 0:
+            # sum(map(abs, constraints)) - original version
+            eps = 0.0
+            individual.features["feasible"] = all(v < eps for (v) in constraints)
+
+    def _finish(self, individual, costs):
+        individual.costs = costs
+        if self.problem is not None:
+            individual.calc_signed_costs(self.problem.signs)  # the idea is to make this conversion only once
+
+        # set evaluated
+        individual.state = individual.State.EVALUATED
+        # info
+        individual.features["finish_time"] = time.time()
+        # add to cache
+        self.store_to_cache(individual)
+        # write to store
+        self.problem.data_store.sync_individual(individual)
+
+    def _fail(self, individual, e):
+        print("Job: error:", e)
+        failed_individual = Individual(individual.vector)
+        failed_individual.state = individual.State.FAILED
+        individual.features["feasible"] = False  # TODO: genetic algorithms uses this information, i dont know the correct solution
+        self.problem.failed.append(failed_individual)
+        # in the case of failure generate new random individual
+        # TODO: create different strategies
+        individual.vector = VectorAndNumbers.gen_vector(self.problem.parameters)
+        individual.state = individual.State.EMPTY
+
+    def batch_evaluation(self):
+        """ True if the problem offers evaluate_batch and it is not hidden behind a surrogate model. """
+        return "evaluate_batch" in dir(self.problem) and isinstance(self.problem.surrogate, SurrogateModelEval)
+
+    def evaluate_batch(self, individuals):
+        """
+        Evaluates the individuals by one call of problem.evaluate_batch(X), where X is (n, d) array of vectors and
+        the result is (n, m) array of costs. The individuals are passed too, if the problem accepts them
+        (evaluate_batch(X, individuals)). If the batch evaluation fails, the individuals are evaluated one by one.
+        """
+        # Skips calculation of already calculated or visited individuals
+        individuals = [individual for individual in individuals if individual.state != individual.State.EVALUATED
+                       and not self.restore_from_cache(individual)]
+        if len(individuals) == 0:
+            return
+
+        t_s = time.time()
+        for individual in individuals:
+            individual.features["start_time"] = t_s
+            # set in progress
+            individual.state = individual.State.IN_PROGRESS
+
+            # check the constraints
+            constraints = self.problem.evaluate_inequality_constraints(individual.vector)
+            if len(constraints) > 0:
+                eps = 0.0
+                individual.features["feasible"] = all(v < eps for (v) in constraints)
+
+        try:
+            x = np.array([individual.vector for individual in individuals], dtype=float)
+            if "individuals" in inspect.signature(self.problem.evaluate_batch).parameters:
+                costs = np.asarray(self.problem.evaluate_batch(x, individuals=individuals), dtype=float)
+            else:
+                costs = np.asarray(self.problem.evaluate_batch(x), dtype=float)
+            costs = costs.reshape(len(individuals), -1)
+        except (TimeoutError, RuntimeError) as e:
+            print("Job: batch error:", e)
+            for individual in individuals:
+                individual.state = individual.State.EMPTY
+                self.evaluate(individual)
+            return
+
+        self.problem.surrogate.eval_counter += len(individuals)
+
+        t = time.time()
+        for individual, values in zip(individuals, costs.tolist()):
+            individual.costs = values
+            individual.calc_signed_costs(self.problem.signs)
+            # set evaluated
+            individual.state = individual.State.EVALUATED
+            # info
+            individual.features["finish_time"] = t
+            # add to cache
+            self.store_to_cache(individual)
+            # write to store
+            self.problem.data_store.sync_individual(individual)
+
+    def restore_from_cache(self, individual):
+        """ Sets costs of the individual from the evaluation cache, returns False if the vector was not evaluated. """
+        if not self.problem.options['evaluation_cache']:
+            return False
+
+        entry = self.problem.evaluation_cache.get(individual)
+        if entry is None:
+            return False
+
+        individual.features["start_time"] = time.time()
+        individual.costs = entry['costs']
+        individual.features["feasible"] = entry['feasible']
+        individual.custom.update(entry['custom'])
+        individual.calc_signed_costs(self.problem.signs)
+        individual.state = individual.State.EVALUATED
+        individual.features["finish_time"] = individual.features["start_time"]
+
+        # write to store
+        self.problem.data_store.sync_individual(individual)
+        return True
+
+    def store_to_cache(self, individual):
+        if self.problem.options['evaluation_cache']:
+            self.problem.evaluation_cache.add(individual)
@@ -1,5 +1,6 @@
 from _ast import operator
-from abc import abstractmethod, ABC
+from abc import abstractmethod, ABC, ABCMeta
+import asyncio
 import copy
 import sys
 import random
@@ -7,14 +8,22 @@ import math
 from math import exp
 import numpy as np
 import functools
+import io
 import itertools
+import pickle
+import time
+from bisect import bisect_right
 from copy import deepcopy
 
 from .utils import VectorAndNumbers
 from .doe import build_box_behnken, build_lhs, build_full_fact, build_plackett_burman, build_gsd, build_halton
 from .job import Job
 from joblib import Parallel, delayed
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from .individual import Individual
+from .quality_indicator import hypervolume, igd
+from .datastore import DummyDataStore
+from .problem import PopulationIndex, IndividualList
 
 
 EPSILON = sys.float_info.epsilon
@@ -23,6 +32,94 @@ EPSILON = sys.float_info.epsilon
 QDOM = 1
 PDOM = 2
 
+# job of the worker process, created once per worker by _init_process_worker
+_process_worker_job = None
+
+
+class _WorkerPickler(pickle.Pickler):
+    """ The references to the problem (e.g. executor.problem) are stored as persistent id. """
+
+    def __init__(self, file, problem):
+        super().__init__(file)
+        self.problem = problem
+
+    def persistent_id(self, obj):
+        return "problem" if obj is self.problem else None
+
+
+class _WorkerUnpickler(pickle.Unpickler):
+    def __init__(self, file, problem):
+        super().__init__(file)
+        self.problem = problem
+
+    def persistent_load(self, pid):
+        return self.problem
+
+
+def _worker_problem(problem):
+    """
+    Returns the class and the pickled state of the problem for the worker processes, the history (individuals,
+    failed) and the data store stay in the parent process.
+    """
+    state = problem.__dict__.copy()
+    state['_individuals'] = IndividualList()
+    state['population_index'] = PopulationIndex()
+    state['failed'] = []
+    state['data_store'] = DummyDataStore()
+
+    file = io.BytesIO()
+    _WorkerPickler(file, problem).dump(state)
+    return type(problem), file.getvalue()
+
+
+def _init_process_worker(cls, state):
+    global _process_worker_job
+    problem = cls.__new__(cls)
+    problem.__dict__.update(_WorkerUnpickler(io.BytesIO(state), problem).load())
+    _process_worker_job = Job(problem)
+
+
+def _evaluate_in_process_worker(vector):
+    """
+    Evaluates one vector in a worker process.
+
+    :param vector: design vector
+    :return: tuple (vector, costs, state, features, custom, failed vectors), the vector can differ from the
+             input one if the evaluation failed and a new point was generated
+    """
+    problem = _process_worker_job.problem
+    problem.failed = []
+
+    individual = Individual(vector)
+    _process_worker_job.evaluate(individual)
+
+    features = {"start_time": individual.features["start_time"],
+                "finish_time": individual.features["finish_time"],
+                "feasible": individual.features["feasible"]}
+    failed = [failed_individual.vector for failed_individual in problem.failed]
+
+    return individual.vector, individual.costs, individual.state, features, individual.custom, failed
+
+
+def _run_coroutine(coroutine):
+    """
+    Runs the coroutine to completion by asyncio.run(). Inside a running event loop (e.g. Jupyter), where asyncio.run()
+    is not allowed, the coroutine runs on a new event loop in a separate thread.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coroutine).result()
+
+
+def parameter_bounds(parameters):
+    """ :return: arrays of the lower and upper bounds of the parameters """
+    return np.array([parameter['bounds'][0] for parameter in parameters], dtype=float), \
+        np.array([parameter['bounds'][1] for parameter in parameters], dtype=float)
+
 
 class Operator(ABC):
 
@@ -42,6 +139,17 @@ class Evaluator(Operator):
         self.algorithm = algorithm
         self.individuals = []
         self.job = Job(self.algorithm.problem)
+        self._pool = None
+        # evaluations of the problem before the start of the algorithm
+        self._eval_counter_start = 0
+
+    @property
+    def n_eval(self):
+        """ Number of the evaluations of the problem (the cached values are not counted) since the last start(). """
+        return self.algorithm.problem.surrogate.eval_counter - self._eval_counter_start
+
+    def start(self):
+        self._eval_counter_start = self.algorithm.problem.surrogate.eval_counter
 
     def add(self, individual):
         self.individuals.append(individual)
@@ -50,8 +158,15 @@ class Evaluator(Operator):
         self.evaluate(self.individuals)
 
     def evaluate(self, individuals):
-        if self.algorithm.options["max_processes"] > 1:
-            self.evaluate_parallel(individuals)
+        if self.job.batch_evaluation():
+            self.job.evaluate_batch(individuals)
+        elif self.job.async_evaluation():
+            self.evaluate_async(individuals)
+        elif self.algorithm.options["max_processes"] > 1:
+            if self.algorithm.options["parallel_backend"] == "process":
+                self.evaluate_process_pool(individuals)
+            else:
+                self.evaluate_parallel(individuals)
         else:
             self.evaluate_serial(individuals)
 
@@ -66,13 +181,97 @@ class Evaluator(Operator):
             delayed(self.job.evaluate)(individual)
             for individual in individuals)
 
+    def evaluate_async(self, individuals: list):
+        """
+        Evaluates individuals by problem.evaluate_async() on one asyncio event loop, at most max_concurrency
+        evaluations are in progress at once.
+        """
+        async def evaluate_all():
+            semaphore = asyncio.Semaphore(self.algorithm.options["max_concurrency"])
+
+            async def evaluate(individual):
+                async with semaphore:
+                    await self.job.evaluate_async(individual)
+
+            await asyncio.gather(*[evaluate(individual) for individual in individuals])
+
+        _run_coroutine(evaluate_all())
+
+    def process_pool(self):
+        """
+        Returns the pool of worker processes. The pool is created on the first call and reused for the next
+        populations, the problem is sent to every worker only once, when the worker starts.
+        """
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.algorithm.options["max_processes"],
+                                             initializer=_init_process_worker,
+                                             initargs=_worker_problem(self.algorithm.problem))
+        return self._pool
+
+    def close(self):
+        """ Shuts down the worker processes (if any). """
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # the worker processes live only during the run of the algorithm
+        self.close()
+
+    def evaluate_process_pool(self, individuals: list):
+        """
+        Evaluates individuals in worker processes. Only vectors are sent to the workers, costs, features, state and
+        custom values are merged back into the given individuals.
+
+        The workers own a copy of the problem, changes of the problem made in the workers (e.g. training data of the
+        surrogate model) are not propagated back.
+        """
+        problem = self.algorithm.problem
+        individuals = [individual for individual in individuals if individual.state != individual.State.EVALUATED
+                       and not self.job.restore_from_cache(individual)]
+        if len(individuals) == 0:
+            return
+
+        pool = self.process_pool()
+        chunk_size = max(1, len(individuals) // (4 * self.algorithm.options["max_processes"]))
+        results = pool.map(_evaluate_in_process_worker, [list(individual.vector) for individual in individuals],
+                           chunksize=chunk_size)
+
+        for individual, (vector, costs, state, features, custom, failed) in zip(individuals, results):
+            individual.vector = vector
+            individual.costs = costs
+            individual.state = state
+            individual.features.update(features)
+            individual.custom.update(custom)
+            individual.calc_signed_costs(problem.signs)
+
+            for failed_vector in failed:
+                failed_individual = Individual(failed_vector)
+                failed_individual.state = individual.State.FAILED
+                problem.failed.append(failed_individual)
+
+            problem.surrogate.eval_counter += 1
+            # add to cache
+            if state == individual.State.EVALUATED:
+                self.job.store_to_cache(individual)
+            # write to store
+            problem.data_store.sync_individual(individual)
+
     def evaluate_scalar(self, vector):
         individual = Individual(list(vector))
 
         # add to problem
         self.algorithm.problem.individuals.append(individual)
 
-        self.job.evaluate(individual)
+        if self.job.batch_evaluation():
+            self.job.evaluate_batch([individual])
+        elif self.job.async_evaluation():
+            _run_coroutine(self.job.evaluate_async(individual))
+        else:
+            self.job.evaluate(individual)
         return individual.costs_signed[0]
 
 
@@ -170,10 +369,8 @@ class WorstCaseEvaluator(Evaluator):
 
     def evaluate_scalar(self, x):
         parent_individual = Individual(x)
-        parent_individual.costs.append(self.job.evaluate(parent_individual))
         self.add(parent_individual)
-        for individual in self.to_evaluate:
-            individual.costs.append(self.job.evaluate(individual))
+        super().evaluate(self.to_evaluate)
         self.algorithm.problem.individuals.append(parent_individual)
         self.to_evaluate = []
         return parent_individual.costs[0]
@@ -497,6 +694,10 @@ class Mutator(Operator):
     def mutate(self, p, current_iteration=0):
         pass
 
+    def bounds(self):
+        """ :return: arrays of the lower and upper bounds of the parameters """
+        return parameter_bounds(self.parameters)
+
 
 class SimpleMutator(Mutator):
     def __init__(self, parameters, probability):
@@ -548,6 +749,41 @@ class PmMutator(Mutator):
 
         return vector
 
+    def mutate_batch(self, vectors, lower=None, upper=None):
+        """
+        Polynomial mutation of the whole population at once, the same distribution as mutate().
+
+        :param vectors: (n, d) array of vectors
+        :param lower: (d,) array of the lower bounds (default - bounds of the parameters)
+        :param upper: (d,) array of the upper bounds
+        :return: (n, d) array of the mutated vectors
+        """
+        if lower is None or upper is None:
+            lower, upper = self.bounds()
+
+        x = np.array(vectors, dtype=float)
+        mutated = np.random.random_sample(x.shape) < self.probability
+        rnd = np.random.random_sample(x.shape)
+
+        dx = upper - lower
+        with np.errstate(divide='ignore', invalid='ignore'):
+            delta1 = (x - lower) / dx
+            delta2 = (upper - x) / dx
+            mut_pow = 1.0 / (self.distribution_index + 1.0)
+
+            lower_half = rnd < 0.5
+            val = np.where(lower_half,
+                           2.0 * rnd + (1.0 - 2.0 * rnd) * np.power(1.0 - delta1, self.distribution_index + 1.0),
+                           2.0 * (1.0 - rnd) + 2.0 * (rnd - 0.5) * np.power(1.0 - delta2,
+                                                                            self.distribution_index + 1.0))
+            deltaq = np.where(lower_half, np.power(val, mut_pow) - 1.0, 1.0 - np.power(val, mut_pow))
+
+        # the parameters with zero range are not mutated
+        mutated &= dx > 0
+        x[mutated] = np.clip(x + deltaq * dx, lower, upper)[mutated]
+
+        return x
+
     def pm_mutation(self, x, lb, ub):
         """
         Polynomial mutation for float and integer parameters.
@@ -607,6 +843,25 @@ class UniformMutator(Mutator):
 
         return vector
 
+    def mutate_batch(self, vectors, lower=None, upper=None):
+        """
+        Uniform mutation of the whole population at once, the same distribution as mutate().
+
+        :param vectors: (n, d) array of vectors
+        :param lower: (d,) array of the lower bounds (default - bounds of the parameters)
+        :param upper: (d,) array of the upper bounds
+        :return: (n, d) array of the mutated vectors
+        """
+        if lower is None or upper is None:
+            lower, upper = self.bounds()
+
+        x = np.array(vectors, dtype=float)
+        mutated = np.random.random_sample(x.shape) < self.probability
+        perturbed = np.clip(x + (np.random.random_sample(x.shape) - 0.5) * self.perturbation, lower, upper)
+        x[mutated] = perturbed[mutated]
+
+        return x
+
     def uniform_mutation(self, x, lb, ub):
 
         x = x + (random.random() - 0.5) * self.perturbation
@@ -639,6 +894,28 @@ class NonUniformMutation(Mutator):
 
         return vector
 
+    def mutate_batch(self, vectors, current_iteration=0, lower=None, upper=None):
+        """
+        Non-uniform mutation of the whole population at once, the same distribution as mutate().
+
+        :param vectors: (n, d) array of vectors
+        :param current_iteration: number of the current iteration
+        :param lower: (d,) array of the lower bounds (default - bounds of the parameters)
+        :param upper: (d,) array of the upper bounds
+        :return: (n, d) array of the mutated vectors
+        """
+        if lower is None or upper is None:
+            lower, upper = self.bounds()
+
+        x = np.array(vectors, dtype=float)
+        mutated = np.random.random_sample(x.shape) < self.probability
+        y = np.where(np.random.random_sample(x.shape) <= 0.5, upper - x, lower - x)
+        exponent = pow((1.0 - 1.0 * current_iteration / self.max_iterations), self.perturbation)
+        delta = y * (1.0 - np.power(np.random.random_sample(x.shape), exponent))
+        x[mutated] = np.clip(delta, lower, upper)[mutated]
+
+        return x
+
     def non_uniform_mutation(self, x, lb, ub, current_iteration):
 
         rand = random.random()
@@ -1112,6 +1389,215 @@ class ParetoDominance(Dominance):
             return 2
 
 
+def pareto_dominance_matrix(costs_signed):
+    """
+    ParetoDominance.compare of all pairs of the rows at once.
+
+    :param costs_signed: (n, m + 1) array of signed costs, the last column is the constraint violation
+    :return: (n, n) boolean array, [i, j] is True if the i-th row dominates the j-th one
+    """
+    costs_signed = np.asarray(costs_signed, dtype=float)
+    n = costs_signed.shape[0]
+
+    # first check constraint violation, zero (feasible) wins, then the smaller absolute value
+    violation = costs_signed[:, -1]
+    feasible = violation == 0
+    magnitude = np.abs(violation)
+    constraint = (violation[:, None] != violation[None, :]) \
+        & (feasible[:, None] | (~feasible[None, :] & (magnitude[:, None] < magnitude[None, :])))
+    decided = constraint | constraint.T
+
+    # [i, j] is True if i is worse than j in some objective
+    worse = np.zeros((n, n), dtype=bool)
+    for k in range(costs_signed.shape[1] - 1):
+        costs = costs_signed[:, k]
+        worse |= costs[:, None] > costs[None, :]
+
+    return constraint | (~decided & worse.T & ~worse)
+
+
+# the smallest populations sorted by the sweep (1 or 2 objectives) and by the efficient non-dominated sort
+# (3 and more objectives), the smaller ones are sorted by the dominance matrix
+SWEEP_SORTING_MIN_SIZE = 64
+ENS_SORTING_MIN_SIZE = 4000
+
+
+def matrix_nondominated_ranks(costs_signed):
+    """
+    Non-dominated sorting by the dominance matrix, O(m n^2) time and O(n^2) memory.
+
+    :param costs_signed: (n, m + 1) array of signed costs, the last column is the constraint violation
+    :return: front numbers (1 - non-dominated front), numbers of the dominating rows
+    """
+    dominance = pareto_dominance_matrix(costs_signed)
+    domination_counter = dominance.sum(axis=0)
+
+    # peel the fronts
+    front_numbers = np.zeros(len(costs_signed), dtype=int)
+    remaining = domination_counter.copy()
+    current = np.flatnonzero(remaining == 0)
+    front_number = 0
+    while current.size > 0:
+        front_number += 1
+        front_numbers[current] = front_number
+        remaining -= dominance[current].sum(axis=0)
+        current = np.flatnonzero((remaining == 0) & (front_numbers == 0))
+
+    return front_numbers, domination_counter
+
+
+def sweep_nondominated_ranks(objectives):
+    """
+    Sweep-line non-dominated sorting of one or two objectives (Jensen), O(n log n).
+
+    The rows are swept in the lexicographic order, every row is placed to the first front whose last row does not
+    dominate it (binary search), the dominating rows are counted by a Fenwick tree over the ranks of the second
+    objective.
+
+    :param objectives: (n, 1) or (n, 2) array of signed costs
+    :return: front numbers (1 - non-dominated front), numbers of the dominating rows
+    """
+    n = objectives.shape[0]
+    if objectives.shape[1] == 1:
+        objectives = np.column_stack([objectives, np.zeros(n)])
+
+    order = np.lexsort((objectives[:, 1], objectives[:, 0]))
+    first = objectives[order, 0].tolist()
+    second = objectives[order, 1].tolist()
+    second_ranks = (np.unique(objectives[:, 1], return_inverse=True)[1][order] + 1).tolist()
+
+    fronts_second = []  # second objective of the last row of the fronts (non-decreasing)
+    tree = [0] * (max(second_ranks) + 1)
+    ranks = [0] * n
+    counters = [0] * n
+    duplicates = 0
+    for k in range(n):
+        if k > 0 and first[k] == first[k - 1] and second[k] == second[k - 1]:
+            # the same point as the previous one
+            duplicates += 1
+            front = ranks[k - 1]
+        else:
+            duplicates = 0
+            front = bisect_right(fronts_second, second[k])
+            if front == len(fronts_second):
+                fronts_second.append(second[k])
+            else:
+                fronts_second[front] = second[k]
+        ranks[k] = front
+
+        # previous rows with the second objective not greater (except the same points) dominate the row
+        i = second_ranks[k]
+        counter = 0
+        while i > 0:
+            counter += tree[i]
+            i -= i & -i
+        counters[k] = counter - duplicates
+
+        i = second_ranks[k]
+        while i < len(tree):
+            tree[i] += 1
+            i += i & -i
+
+    front_numbers = np.empty(n, dtype=int)
+    front_numbers[order] = np.array(ranks) + 1
+    domination_counter = np.empty(n, dtype=int)
+    domination_counter[order] = counters
+
+    return front_numbers, domination_counter
+
+
+def ens_nondominated_ranks(objectives):
+    """
+    Efficient non-dominated sort with the binary search (Zhang et al., ENS-BS), O(m n) memory.
+
+    The rows are processed in the lexicographic order (no row is dominated by a later one), every row is placed to
+    the first front which does not dominate it. The dominating rows are not counted.
+
+    :param objectives: (n, m) array of signed costs
+    :return: front numbers (1 - non-dominated front)
+    """
+    n, m = objectives.shape
+    order = np.lexsort(objectives.T[::-1])
+    rows = objectives[order]
+
+    fronts = []  # buffers of the rows of the fronts
+    sizes = []
+    ranks = np.empty(n, dtype=int)
+    for k in range(n):
+        row = rows[k]
+
+        low = 0
+        high = len(fronts)
+        while low < high:
+            middle = (low + high) // 2
+            front = fronts[middle][:sizes[middle]]
+            if np.any(np.all(front <= row, axis=1) & np.any(front < row, axis=1)):
+                low = middle + 1
+            else:
+                high = middle
+
+        if low == len(fronts):
+            fronts.append(np.empty((16, m)))
+            sizes.append(0)
+        elif sizes[low] == len(fronts[low]):
+            fronts[low] = np.concatenate([fronts[low], np.empty_like(fronts[low])])
+        fronts[low][sizes[low]] = row
+        sizes[low] += 1
+        ranks[k] = low
+
+    front_numbers = np.empty(n, dtype=int)
+    front_numbers[order] = ranks + 1
+
+    return front_numbers
+
+
+def nondominated_ranks(costs_signed, algorithm='auto'):
+    """
+    Non-dominated sorting with the semantics of ParetoDominance: the smaller absolute value of the constraint
+    violation wins (zero - feasible), the Pareto dominance decides among the rows with the same absolute violation.
+
+    :param costs_signed: (n, m + 1) array of signed costs, the last column is the constraint violation
+    :param algorithm: 'matrix', 'sweep' (up to 2 objectives), 'ens' or 'auto' - picked by the number of objectives
+                      and the size of the population
+    :return: front numbers (1 - non-dominated front), numbers of the dominating rows (None for 'ens')
+    """
+    costs_signed = np.asarray(costs_signed, dtype=float)
+    n, m = costs_signed.shape[0], costs_signed.shape[1] - 1
+
+    if algorithm == 'auto':
+        if m == 0 or np.isnan(costs_signed).any():
+            algorithm = 'matrix'
+        elif m <= 2:
+            algorithm = 'sweep' if n >= SWEEP_SORTING_MIN_SIZE else 'matrix'
+        else:
+            algorithm = 'ens' if n >= ENS_SORTING_MIN_SIZE else 'matrix'
+
+    if algorithm == 'matrix':
+        return matrix_nondominated_ranks(costs_signed)
+
+    # the groups of the same absolute violation are sorted separately, each group is dominated by the previous ones
+    magnitudes, groups = np.unique(np.abs(costs_signed[:, -1]), return_inverse=True)
+    front_numbers = np.empty(n, dtype=int)
+    domination_counter = np.empty(n, dtype=int) if algorithm == 'sweep' else None
+    front_offset = 0
+    dominated = 0
+    for group in range(len(magnitudes)):
+        indices = np.flatnonzero(groups == group)
+        objectives = costs_signed[indices, :-1]
+
+        if algorithm == 'sweep':
+            group_fronts, group_counters = sweep_nondominated_ranks(objectives)
+            domination_counter[indices] = group_counters + dominated
+        else:
+            group_fronts = ens_nondominated_ranks(objectives)
+
+        front_numbers[indices] = group_fronts + front_offset
+        front_offset += group_fronts.max()
+        dominated += len(indices)
+
+    return front_numbers, domination_counter
+
+
 class Selector(Operator):
 
     def __init__(self, parameters, sign=None, part_num=2, dominance=ParetoDominance):
@@ -1126,6 +1612,8 @@ class Selector(Operator):
         self.parameters = parameters
         self.comparator = dominance()  # ParetoDominance()
         self.signs = sign
+        # algorithm of the non-dominated sorting, see nondominated_ranks()
+        self.sorting_algorithm = 'auto'
 
     @abstractmethod
     def select(self, population):
@@ -1166,6 +1654,41 @@ class Selector(Operator):
         return None
 
     def fast_nondominated_sorting(self, individuals):
+        """
+        Sets the features 'front_number' (1 - non-dominated front), 'domination_counter' (number of the individuals
+        which dominate the individual, None if it was not counted) and 'crowding_distance' of the individuals.
+
+        The Pareto dominance (with constraints) is evaluated on the matrix of signed costs by nondominated_ranks(),
+        which picks the algorithm (self.sorting_algorithm = 'auto'), the other comparators use
+        pairwise_nondominated_sorting().
+        """
+        if type(self.comparator) is not ParetoDominance or len(individuals) < 2:
+            return self.pairwise_nondominated_sorting(individuals)
+
+        # costs of different lengths or not numbers (e.g. arrays returned by the surrogate models)
+        try:
+            costs_signed = np.array([individual.costs_signed for individual in individuals], dtype=float)
+        except (ValueError, TypeError):
+            return self.pairwise_nondominated_sorting(individuals)
+        if costs_signed.ndim != 2 or costs_signed.shape[1] == 0:
+            return self.pairwise_nondominated_sorting(individuals)
+
+        front_numbers, domination_counter = nondominated_ranks(costs_signed, self.sorting_algorithm)
+        if domination_counter is None:
+            domination_counter = [None] * len(individuals)
+        else:
+            domination_counter = domination_counter.tolist()
+
+        distances = crowding_distances(costs_signed[:, :-1], front_numbers)
+        for individual, number, counter, distance in zip(individuals, front_numbers.tolist(), domination_counter,
+                                                         distances.tolist()):
+            individual.features['front_number'] = number
+            individual.features['domination_counter'] = counter
+            individual.features['dominate'] = []
+            individual.features['crowding_distance'] = distance
+
+    def pairwise_nondominated_sorting(self, individuals):
+        """ Non-dominated sorting by the pairwise comparison of the individuals (any comparator). """
         pareto_front = [[]]
         front_number = 1
 
@@ -1191,12 +1714,16 @@ class Selector(Operator):
                 p.features['front_number'] = front_number
                 pareto_front[front_number - 1].append(p)
 
+        by_id = {}
+        for individual in individuals:
+            by_id.setdefault(individual.id, individual)
+
         while len(pareto_front[front_number - 1]) > 0:
             front_number += 1
             pareto_front.append([])
             for p in pareto_front[front_number - 2]:
                 for individual_id in p.features['dominate']:
-                    q = self.individual(individuals, individual_id)
+                    q = by_id[individual_id]
                     q.features['domination_counter'] -= 1
                     if q.features['domination_counter'] == 0 and q.features['front_number'] is None:
                         q.features['front_number'] = front_number
@@ -1208,14 +1735,81 @@ class Selector(Operator):
             crowding_distance(sub_front)
 
 
+def crowding_distances(costs, front_numbers=None):
+    """
+    Crowding distances of the rows of the cost matrix, computed separately in every front.
+
+    The same arithmetic as crowding_distance(): the rows of the front are stably sorted by every objective in turn
+    (np.lexsort), the boundary rows get inf, the others the sum of the normalized distances of their neighbours.
+
+    :param costs: (n, m) array of signed costs (without the constraint violation)
+    :param front_numbers: front of every row, None - all rows are one front
+    :return: (n,) array of crowding distances
+    """
+    costs = np.asarray(costs, dtype=float)
+    n, m = costs.shape
+    distances = np.zeros(n)
+
+    if front_numbers is None:
+        fronts = [np.arange(n)]
+    else:
+        order = np.argsort(front_numbers, kind='stable')
+        boundaries = np.flatnonzero(np.diff(np.asarray(front_numbers)[order])) + 1
+        fronts = np.split(order, boundaries)
+
+    for indices in fronts:
+        if len(indices) <= 2:
+            distances[indices] = math.inf
+            continue
+
+        front_costs = costs[indices]
+        front_distances = np.zeros(len(indices))
+        for dim in range(m):
+            # the order after the stable sorts by the objectives 0, ..., dim
+            front_order = np.lexsort(front_costs[:, dim::-1].T[::-1])
+            values = front_costs[front_order, dim]
+
+            front_distances[front_order[0]] = math.inf
+            front_distances[front_order[-1]] = math.inf
+            max_distance = values[-1] - values[0]
+            if max_distance > 0.0:
+                with np.errstate(invalid='ignore'):
+                    front_distances[front_order[1:-1]] += (values[2:] - values[:-2]) / max_distance
+        distances[indices] = front_distances
+
+    return distances
+
+
 def crowding_distance(front):
     """
     Crowding distance calculates the solution density on a front, a subset of the population.
+    The front is sorted by the objectives (in place, as the original implementation did).
     :param front: list of individuals
                   which is a subset of the total population
     :return:
     """
     n = len(front)
+    if n <= 2:
+        return _crowding_distance_loop(front)
+
+    # costs of different lengths or not numbers (e.g. arrays returned by the surrogate models)
+    try:
+        costs = np.array([individual.costs_signed[:-1] for individual in front], dtype=float)
+    except (ValueError, TypeError):
+        return _crowding_distance_loop(front)
+    if costs.ndim != 2:
+        return _crowding_distance_loop(front)
+
+    distances = crowding_distances(costs)
+    for individual, distance in zip(front, distances.tolist()):
+        individual.features['crowding_distance'] = distance
+
+    if costs.shape[1] > 0:
+        front[:] = [front[i] for i in np.lexsort(costs.T)]
+
+
+def _crowding_distance_loop(front):
+    n = len(front)
 
     if n == 0:
         return
@@ -1425,6 +2019,10 @@ class Crossover(Operator):
     def cross(self, p1, p2):
         pass
 
+    def bounds(self):
+        """ :return: arrays of the lower and upper bounds of the parameters """
+        return parameter_bounds(self.parameters)
+
 
 class SimpleCrossover(Crossover):
     def __init__(self, parameters, probability):
@@ -1529,6 +2127,51 @@ class SimulatedBinaryCrossover(Crossover):
 
         return x1, x2
 
+    def cross_batch(self, parents1, parents2, lower=None, upper=None):
+        """
+        Simulated binary crossover of the pairs of parents at once, the same distribution as cross().
+
+        :param parents1: (n, d) array of the first parents
+        :param parents2: (n, d) array of the second parents
+        :param lower: (d,) array of the lower bounds (default - bounds of the parameters)
+        :param upper: (d,) array of the upper bounds
+        :return: two (n, d) arrays of the offsprings
+        """
+        if lower is None or upper is None:
+            lower, upper = self.bounds()
+
+        x1 = np.array(parents1, dtype=float)
+        x2 = np.array(parents2, dtype=float)
+        n, d = x1.shape
+
+        # the pairs crossed with the probability, then every gene with the probability 0.5
+        crossed = (np.random.random_sample((n, 1)) <= self.probability) & (np.random.random_sample((n, d)) <= 0.5) \
+            & (np.abs(x2 - x1) > EPSILON)
+        rand = np.random.random_sample((n, d))
+        swap = np.random.random_sample((n, d)) <= 0.5
+
+        y1 = np.minimum(x1, x2)
+        y2 = np.maximum(x1, x2)
+        exponent = self.distribution_index + 1.0
+
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            def spread(beta):
+                alpha = 2.0 - np.power(beta, -exponent)
+                return np.where(rand <= 1.0 / alpha, np.power(rand * alpha, 1.0 / exponent),
+                                np.power(1.0 / (2.0 - rand * alpha), 1.0 / exponent))
+
+            c1 = 0.5 * (y1 + y2 - spread(1.0 + 2.0 * (y1 - lower) / (y2 - y1)) * (y2 - y1))
+            c2 = 0.5 * (y1 + y2 + spread(1.0 + 2.0 * (upper - y2) / (y2 - y1)) * (y2 - y1))
+
+        # check the boundaries
+        c1 = np.clip(c1, lower, upper)
+        c2 = np.clip(c2, lower, upper)
+
+        offsprings1 = np.where(crossed, np.where(swap, c2, c1), x1)
+        offsprings2 = np.where(crossed, np.where(swap, c1, c2), x2)
+
+        return offsprings1, offsprings2
+
 
 class Normalization(Operator):
 
@@ -1656,6 +2299,10 @@ class Termination:
         else:
             return self._do_continue(algorithm)
 
+    def start(self, algorithm):
+        """ Called at the start of the algorithm, resets the state of the criterion. """
+        pass
+
     # the concrete implementation of the algorithm
     def _do_continue(self, algorithm, **kwargs):
         pass
@@ -1699,6 +2346,152 @@ class MaximumFunctionCallTermination(Termination):
         return algorithm.evaluator.n_eval < self.n_max_evals
 
 
+class TimeTermination(Termination):
+    """ Wall-clock budget of the algorithm in seconds. """
+
+    def __init__(self, max_time) -> None:
+        super().__init__()
+        self.max_time = max_time
+
+        if self.max_time is None:
+            self.max_time = float("inf")
+
+    def _do_continue(self, algorithm, **kwargs):
+        return time.time() - algorithm.start_time < self.max_time
+
+
+def _front_costs(population):
+    """ Returns the (n, m) array of the signed costs of the non-dominated evaluated individuals. """
+    # the copies of the evaluated individuals (e.g. NSGA-II) hold the costs, but they are not in the evaluated state
+    costs_signed = [individual.costs_signed for individual in population
+                    if individual.state != individual.State.FAILED and len(individual.costs_signed) > 0]
+    if len(costs_signed) == 0:
+        return None
+
+    costs_signed = np.array(costs_signed, dtype=float)
+    front_numbers, _ = nondominated_ranks(costs_signed)
+    return costs_signed[front_numbers == 1, :-1]
+
+
+class StagnationTermination(Termination, metaclass=ABCMeta):
+    """
+    Stops the algorithm, if the monitored value (a number or a vector) did not change more than the tolerance during
+    the last window generations.
+    """
+
+    def __init__(self, tolerance, window=10) -> None:
+        super().__init__()
+        self.tolerance = tolerance
+        self.window = window
+        self.history = []
+
+    def start(self, algorithm):
+        self.history = []
+
+    @abstractmethod
+    def value(self, algorithm):
+        """ The monitored value of the current population of the algorithm (None - not available). """
+        pass
+
+    def _do_continue(self, algorithm, **kwargs):
+        value = self.value(algorithm)
+        if value is None:
+            return True
+
+        self.history.append(value)
+        if len(self.history) <= self.window:
+            return True
+
+        del self.history[:-(self.window + 1)]
+        return np.max(np.ptp(np.array(self.history, dtype=float), axis=0)) > self.tolerance
+
+
+class CostToleranceTermination(StagnationTermination):
+    """ The best values of all objectives (signed costs) of the population did not improve more than tolerance. """
+
+    def value(self, algorithm):
+        costs = _front_costs(algorithm.population)
+        if costs is None:
+            return None
+        return np.min(costs, axis=0)
+
+
+class HypervolumeStagnationTermination(StagnationTermination):
+    """
+    The hypervolume of the non-dominated individuals of the population did not change more than tolerance.
+
+    The objectives are normalized by the ideal and nadir point of the first population, the reference point is 1.1
+    in the normalized objectives. The given reference point (signed costs) replaces the nadir point and it is 1.0 in
+    the normalized objectives.
+    """
+
+    def __init__(self, tolerance=1e-3, window=10, reference_point=None) -> None:
+        super().__init__(tolerance, window)
+        self.reference_point = reference_point
+        self.ideal = None
+        self.scale = None
+        self._normalized_reference = 1.1
+
+    def start(self, algorithm):
+        super().start(algorithm)
+        self.ideal = None
+        self.scale = None
+
+    def value(self, algorithm):
+        costs = _front_costs(algorithm.population)
+        if costs is None:
+            return None
+
+        if self.ideal is None:
+            self.ideal = np.min(costs, axis=0)
+            if self.reference_point is None:
+                nadir = np.max(costs, axis=0)
+            else:
+                nadir = np.asarray(self.reference_point, dtype=float)
+                self._normalized_reference = 1.0
+            self.scale = np.where(nadir > self.ideal, nadir - self.ideal, 1.0)
+
+        return hypervolume((costs - self.ideal) / self.scale, np.full(costs.shape[1], self._normalized_reference))
+
+
+class IGDStagnationTermination(Termination):
+    """
+    The non-dominated individuals of the population did not move more than tolerance during the last window
+    generations, the movement is the IGD of the previous front from the current front (normalized by the ranges of
+    the current front).
+    """
+
+    def __init__(self, tolerance=1e-3, window=10) -> None:
+        super().__init__()
+        self.tolerance = tolerance
+        self.window = window
+        self.front = None
+        self.history = []
+
+    def start(self, algorithm):
+        self.front = None
+        self.history = []
+
+    def _do_continue(self, algorithm, **kwargs):
+        front = _front_costs(algorithm.population)
+        if front is None:
+            return True
+
+        previous, self.front = self.front, front
+        if previous is None:
+            return True
+
+        ideal = np.min(front, axis=0)
+        scale = np.max(front, axis=0) - ideal
+        scale[scale <= 0] = 1.0
+        self.history.append(igd((previous - ideal) / scale, (front - ideal) / scale))
+        if len(self.history) < self.window:
+            return True
+
+        del self.history[:-self.window]
+        return max(self.history) > self.tolerance
+
+
 def derivative(problem, points):
     """
         Compute derivative of func at points using finite differences
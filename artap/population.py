@@ -0,0 +1,418 @@
+"""
+ Compact storage of the individuals of the problem.
+"""
+
+import numpy as np
+from .individual import Individual
+
+_STATES = {Individual.to_string(state): state for state in Individual.State}
+
+
+def _state_code(state):
+    """ State of the individual (State, its value or the string of the data store) as integer. """
+    if isinstance(state, Individual.State):
+        return state.value
+    if isinstance(state, str):
+        return _STATES[state].value
+    return int(state)
+
+
+def _read_only(*args, **kwargs):
+    raise TypeError("IndividualView: in-place changes are not stored, assign the changed value.")
+
+
+class _ViewList(list):
+    """ Copy of the stored list, which can not be changed in place (the copies are plain lists). """
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = pop = remove = clear = sort = reverse = _read_only
+
+    def __reduce__(self):
+        return list, (list(self),)
+
+
+class _ViewDict(dict):
+    """ Copy of the stored dictionary, which can not be changed in place (the copies are plain dicts). """
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    pop = popitem = setdefault = update = clear = _read_only
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+
+def _resized(array, capacity):
+    resized = np.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+    resized[:len(array)] = array[:capacity]
+    return resized
+
+
+class _Rows:
+    """ Rows of float64 numbers (vectors, costs), the rows without value (empty list) are marked as not present. """
+
+    def __init__(self, name):
+        self.name = name
+        self.data = None
+        self.present = np.zeros(0, dtype=bool)
+
+    def resize(self, capacity):
+        self.present = _resized(self.present, capacity)
+        if self.data is not None:
+            self.data = _resized(self.data, capacity)
+
+    def set(self, row, value):
+        if value is None or len(value) == 0:
+            self.present[row] = False
+            return
+
+        if self.data is None:
+            self.data = np.full((len(self.present), len(value)), np.nan)
+        elif len(value) != self.data.shape[1]:
+            raise ValueError("PopulationArray: length of {} is {}, expected {}.".format(self.name, len(value),
+                                                                                       self.data.shape[1]))
+        self.data[row] = np.asarray(value, dtype=float)
+        self.present[row] = True
+
+    def get(self, row):
+        return self.data[row].tolist() if self.present[row] else []
+
+    def array(self, size):
+        if self.data is None:
+            return np.zeros((size, 0))
+        return self.data[:size]
+
+
+class PopulationArray:
+    """
+    Compact store of the individuals (struct of arrays), which can replace the list problem.individuals:
+
+        problem.individuals = PopulationArray()
+
+    Vectors, costs and signed costs are stored in contiguous float64 arrays, ids, population_id and state in integer
+    arrays, algorithm_id (uuid) as the integer code of the algorithm and the features given by name (numbers only)
+    in float64 columns. Custom data, parents,
+    children and the other features are not stored.
+
+    The recently appended individuals are kept as they are (the algorithms and the evaluators still change them),
+    they are moved to the arrays by compact() or, when more than 2 * buffer_size individuals are waiting, if they
+    are evaluated and their generation is finished: the algorithm appended two newer populations (it works only
+    with the parents and the offsprings). The later changes of the original objects (e.g. kept in an archive of an
+    algorithm) are not stored. The stored individuals are returned as IndividualView, which reads and writes the
+    arrays, see its limitations.
+    """
+
+    def __init__(self, features=('feasible', 'precision', 'front_number'), buffer_size=1000):
+        self.feature_names = tuple(features)
+        self.buffer_size = buffer_size
+
+        self._size = 0
+        self._capacity = 0
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._population_ids = np.zeros(0, dtype=np.int64)
+        self._algorithm_codes = np.zeros(0, dtype=np.int32)
+        # algorithm_id <-> code
+        self._algorithms = []
+        self._algorithm_index = {}
+        self._states = np.zeros(0, dtype=np.int8)
+        self._modified = np.zeros(0, dtype=bool)
+        self._rows = {'vector': _Rows('vector'), 'costs': _Rows('costs'), 'costs_signed': _Rows('costs_signed')}
+        self._features = {name: np.zeros(0) for name in self.feature_names}
+
+        # row -> individual, which is not stored in the arrays yet
+        self._pending = {}
+
+    @classmethod
+    def from_individuals(cls, individuals, **kwargs):
+        """ Creates the compacted store of the individuals. """
+        population = cls(**kwargs)
+        population.extend(individuals)
+        population.compact()
+        return population
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        for row in range(self._size):
+            yield self._item(row)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [self._item(row) for row in range(*key.indices(self._size))]
+
+        row = key + self._size if key < 0 else key
+        if row < 0 or row >= self._size:
+            raise IndexError("PopulationArray: index {} out of range.".format(key))
+        return self._item(row)
+
+    def _item(self, row):
+        individual = self._pending.get(row)
+        return individual if individual is not None else IndividualView(self, row)
+
+    def append(self, individual):
+        if self._size == self._capacity:
+            self._resize(max(2 * self._capacity, 64))
+
+        self._pending[self._size] = individual
+        self._size += 1
+
+        if len(self._pending) > 2 * self.buffer_size:
+            self._compact_evaluated()
+
+    def extend(self, individuals):
+        for individual in individuals:
+            self.append(individual)
+
+    def clear(self):
+        self.__init__(self.feature_names, self.buffer_size)
+
+    def compact(self):
+        """ Moves all waiting individuals to the arrays. """
+        for row, individual in self._pending.items():
+            self._store(row, individual)
+        self._pending.clear()
+
+    def _compact_evaluated(self):
+        # the last population of every algorithm
+        latest = {}
+        for individual in self._pending.values():
+            latest[individual.algorithm_id] = max(latest.get(individual.algorithm_id, individual.population_id),
+                                                  individual.population_id)
+
+        for row in list(self._pending):
+            if len(self._pending) <= self.buffer_size:
+                break
+            individual = self._pending[row]
+            if individual.state in [Individual.State.EVALUATED, Individual.State.FAILED] \
+                    and individual.population_id + 2 <= latest[individual.algorithm_id]:
+                self._store(row, individual)
+                del self._pending[row]
+
+    def _refresh(self):
+        """ Copies the waiting individuals to the arrays (they stay waiting). """
+        for row, individual in self._pending.items():
+            self._store(row, individual)
+
+    def _resize(self, capacity):
+        self._ids = _resized(self._ids, capacity)
+        self._population_ids = _resized(self._population_ids, capacity)
+        self._algorithm_codes = _resized(self._algorithm_codes, capacity)
+        self._states = _resized(self._states, capacity)
+        self._modified = _resized(self._modified, capacity)
+        for rows in self._rows.values():
+            rows.resize(capacity)
+        for name in self.feature_names:
+            self._features[name] = _resized(self._features[name], capacity)
+        self._capacity = capacity
+
+    def _store(self, row, individual):
+        self._ids[row] = individual.id
+        self._population_ids[row] = individual.population_id
+        self._algorithm_codes[row] = self._algorithm_code(individual.algorithm_id)
+        self._states[row] = _state_code(individual.state)
+        self._modified[row] = individual.is_modified()
+        for name, rows in self._rows.items():
+            rows.set(row, getattr(individual, name))
+        for name in self.feature_names:
+            self._set_feature(row, name, individual.features.get(name))
+
+    def _algorithm_code(self, algorithm_id):
+        code = self._algorithm_index.get(algorithm_id)
+        if code is None:
+            code = len(self._algorithms)
+            self._algorithms.append(algorithm_id)
+            self._algorithm_index[algorithm_id] = code
+        return code
+
+    def _set_feature(self, row, name, value):
+        try:
+            self._features[name][row] = np.nan if value is None else float(value)
+        except (TypeError, ValueError):
+            self._features[name][row] = np.nan
+
+    # arrays (the waiting individuals are included)
+    @property
+    def ids(self):
+        self._refresh()
+        return self._ids[:self._size]
+
+    @property
+    def population_ids(self):
+        self._refresh()
+        return self._population_ids[:self._size]
+
+    @property
+    def algorithm_codes(self):
+        """ :return: array of the codes of algorithm_id (index to algorithms) """
+        self._refresh()
+        return self._algorithm_codes[:self._size]
+
+    @property
+    def algorithms(self):
+        """ :return: list of algorithm_id of the stored individuals, the code is the index """
+        return list(self._algorithms)
+
+    @property
+    def states(self):
+        """ :return: array of the values of Individual.State """
+        self._refresh()
+        return self._states[:self._size]
+
+    @property
+    def vectors(self):
+        self._refresh()
+        return self._rows['vector'].array(self._size)
+
+    @property
+    def costs(self):
+        """ :return: (n, m) array of costs, the rows of the individuals without costs are not valid (see evaluated) """
+        self._refresh()
+        return self._rows['costs'].array(self._size)
+
+    @property
+    def costs_signed(self):
+        self._refresh()
+        return self._rows['costs_signed'].array(self._size)
+
+    @property
+    def evaluated(self):
+        """ :return: mask of the individuals with costs """
+        self._refresh()
+        return self._rows['costs'].present[:self._size]
+
+    def feature(self, name):
+        """ :return: array of the stored feature (nan - not set) """
+        self._refresh()
+        return self._features[name][:self._size]
+
+    # queries of the population index (population_id, algorithm_id)
+    def _key_column(self, key):
+        """ :return: column of the key and the function, which converts its items to the values of key """
+        if key == 'population_id':
+            return self.population_ids, int
+        if key == 'algorithm_id':
+            return self.algorithm_codes, self._algorithms.__getitem__
+        raise KeyError("PopulationArray: '{}' is not indexed.".format(key))
+
+    def select(self, key, value):
+        """ Returns the individuals with the given value of key (population_id or algorithm_id), in list order. """
+        column, _ = self._key_column(key)
+        if key == 'algorithm_id':
+            value = self._algorithm_index.get(value, -1)
+        return [self._item(row) for row in np.flatnonzero(column == value)]
+
+    def groups(self, key):
+        """ Returns the dictionary value -> individuals, the values are ordered by the first occurrence. """
+        column, decode = self._key_column(key)
+        if len(column) == 0:
+            return {}
+
+        order = np.argsort(column, kind='stable')
+        _, starts = np.unique(column[order], return_index=True)
+        groups = np.split(order, starts[1:])
+        groups.sort(key=lambda rows: rows[0])
+        return {decode(column[rows[0]]): [self._item(row) for row in rows] for rows in groups}
+
+    def values(self, key):
+        column, decode = self._key_column(key)
+        return [decode(value) for value in np.unique(column)]
+
+    # access of IndividualView
+    def get(self, row, name):
+        if name in self._rows:
+            return self._rows[name].get(row)
+        if name == 'id':
+            return int(self._ids[row])
+        if name == 'population_id':
+            return int(self._population_ids[row])
+        if name == 'algorithm_id':
+            return self._algorithms[self._algorithm_codes[row]]
+        if name == 'state':
+            return Individual.State(int(self._states[row]))
+        if name == 'features':
+            features = {}
+            for feature in self.feature_names:
+                value = self._features[feature][row]
+                if not np.isnan(value):
+                    # the integer features (precision, front_number) are restored as int
+                    features[feature] = int(value) if value.is_integer() else value.item()
+            return features
+        raise AttributeError(name)
+
+    def set(self, row, name, value):
+        if name in self._rows:
+            self._rows[name].set(row, value)
+        elif name == 'id':
+            self._ids[row] = value
+        elif name == 'population_id':
+            self._population_ids[row] = value
+        elif name == 'algorithm_id':
+            self._algorithm_codes[row] = self._algorithm_code(value)
+        elif name == 'state':
+            self._states[row] = _state_code(value)
+        elif name == 'features':
+            for feature in self.feature_names:
+                self._set_feature(row, feature, value.get(feature))
+        else:
+            raise AttributeError(name)
+        self._modified[row] = True
+
+
+def _stored(name):
+    def get(self):
+        value = self._store.get(self._row, name)
+        if type(value) is list:
+            return _ViewList(value)
+        if type(value) is dict:
+            return _ViewDict(value)
+        return value
+
+    def set(self, value):
+        self._store.set(self._row, name, value)
+
+    return property(get, set)
+
+
+def _not_stored(factory):
+    def get(self):
+        return factory()
+
+    def set(self, value):
+        raise TypeError("IndividualView: the attribute is not stored in PopulationArray.")
+
+    return property(get, set)
+
+
+class IndividualView(Individual):
+    """
+    Individual stored in PopulationArray, the attributes are read from (and assigned to) the arrays.
+
+    Limitations: only the assignment of vector, costs, costs_signed, state, population_id, algorithm_id and features
+    is stored. The returned lists and features are read-only copies, their in-place changes raise TypeError (assign
+    the changed copy instead). Only the features of PopulationArray.feature_names (numbers) are kept. Custom data,
+    parents and children are not stored, they are empty and their assignment raises TypeError.
+    """
+
+    id = _stored('id')
+    vector = _stored('vector')
+    costs = _stored('costs')
+    costs_signed = _stored('costs_signed')
+    state = _stored('state')
+    population_id = _stored('population_id')
+    algorithm_id = _stored('algorithm_id')
+    features = _stored('features')
+
+    parents = _not_stored(_ViewList)
+    children = _not_stored(_ViewList)
+    custom = _not_stored(_ViewDict)
+
+    def __init__(self, store, row):
+        object.__setattr__(self, '_store', store)
+        object.__setattr__(self, '_row', row)
+
+    def is_modified(self):
+        return bool(self._store._modified[self._row])
+
+    def mark_synced(self):
+        self._store._modified[self._row] = False
+
+    def copy(self):
+        return Individual(self.vector)
@@ -5,7 +5,10 @@
 from .datastore import SqliteDataStore, DummyDataStore
 from .utils import ConfigDictionary
 from .surrogate import SurrogateModelEval
+from .cache import EvaluationCache
+from .population import PopulationArray
 from abc import abstractmethod
+from bisect import insort, bisect_left
 
 import logging
 import datetime
@@ -27,6 +30,108 @@ NOTSET = logging.NOTSET
 _log_level = [CRITICAL, ERROR, WARNING, INFO, DEBUG]
 
 
+def _reindexing(name):
+    method = getattr(list, name)
+
+    def wrapper(self, *args, **kwargs):
+        self.version += 1
+        return method(self, *args, **kwargs)
+
+    wrapper.__name__ = name
+    return wrapper
+
+
+class IndividualList(list):
+    """
+    List of the individuals (problem.individuals), the version is increased by the changes other than appending
+    (assignment, deletion, insertion, sorting, ...).
+    """
+    version = 0
+
+    __setitem__ = _reindexing('__setitem__')
+    __delitem__ = _reindexing('__delitem__')
+    __imul__ = _reindexing('__imul__')
+    insert = _reindexing('insert')
+    pop = _reindexing('pop')
+    remove = _reindexing('remove')
+    clear = _reindexing('clear')
+    sort = _reindexing('sort')
+    reverse = _reindexing('reverse')
+
+
+class PopulationIndex:
+    """
+    Index of problem.individuals by population_id and algorithm_id.
+
+    The individuals appended to the list are indexed at the next query, the indexed individuals report the changes
+    of population_id and algorithm_id. The index is rebuilt if the list is replaced or its version is changed
+    (IndividualList), the plain lists are reindexed whenever their length changes.
+    PopulationArray answers the queries from its arrays.
+    """
+    keys = ('population_id', 'algorithm_id')
+
+    def __init__(self):
+        self._individuals = None
+        self._version = None
+        self._count = 0
+        # id(individual) -> positions in the list
+        self._positions = {}
+        # key -> value -> sorted positions
+        self._values = {key: {} for key in self.keys}
+
+    def update(self, individuals):
+        """ Indexes the individuals appended since the last update. """
+        version = getattr(individuals, 'version', None)
+        if individuals is not self._individuals or version != self._version or len(individuals) < self._count \
+                or (version is None and len(individuals) != self._count):
+            self.__init__()
+            self._individuals = individuals
+            self._version = version
+
+        for position in range(self._count, len(individuals)):
+            individual = individuals[position]
+            self._positions.setdefault(id(individual), []).append(position)
+            for key in self.keys:
+                self._values[key].setdefault(getattr(individual, key), []).append(position)
+            object.__setattr__(individual, '_index', self)
+        self._count = len(individuals)
+
+    def move(self, individual, key, old_value, new_value):
+        positions = self._positions.get(id(individual))
+        if positions is None or old_value == new_value:
+            return
+
+        for position in positions:
+            old_positions = self._values[key][old_value]
+            del old_positions[bisect_left(old_positions, position)]
+            insort(self._values[key].setdefault(new_value, []), position)
+
+    def select(self, individuals, key, value):
+        """ Returns the individuals with the given value of key (population_id or algorithm_id), in list order. """
+        if isinstance(individuals, PopulationArray):
+            return individuals.select(key, value)
+
+        self.update(individuals)
+        return [individuals[position] for position in self._values[key].get(value, [])]
+
+    def groups(self, individuals, key):
+        """ Returns the dictionary value -> individuals, the values are ordered by the first occurrence. """
+        if isinstance(individuals, PopulationArray):
+            return individuals.groups(key)
+
+        self.update(individuals)
+        items = sorted(((value, positions) for value, positions in self._values[key].items() if positions),
+                       key=lambda item: item[1][0])
+        return {value: [individuals[position] for position in positions] for value, positions in items}
+
+    def values(self, individuals, key):
+        if isinstance(individuals, PopulationArray):
+            return individuals.values(key)
+
+        self.update(individuals)
+        return [value for value, positions in self._values[key].items() if positions]
+
+
 class Problem:
     """ The Class Problem Is a main class which collects information about optimization task """
 
@@ -50,6 +155,12 @@ class Problem:
                              desc='Maximal time for calculation')
         self.options.declare(name='save_data_files', default=False,
                              desc='Saving data from computation')
+        self.options.declare(name='evaluation_cache', default=False,
+                             desc='Reuse costs of already evaluated vectors')
+        self.options.declare(name='evaluation_cache_size', default=100000, lower=0,
+                             desc='Maximal number of cached evaluations (0 - unlimited)')
+        self.options.declare(name='evaluation_cache_persistent', default=False,
+                             desc='Store cached evaluations in the data store')
 
         # tmp name
         d = datetime.datetime.now()
@@ -98,6 +209,7 @@ class Problem:
 
         # populations
         self.individuals = []
+        self.population_index = PopulationIndex()
         self.data_store = None
         self.executor = None
         self.failed = []  # storage for failed individuals
@@ -111,6 +223,9 @@ class Problem:
         # surrogate model (default - only simple eval)
         self.surrogate = SurrogateModelEval(self)
 
+        # cache of evaluated vectors
+        self.evaluation_cache = EvaluationCache(self)
+
         # self._freeze()
         self.set(**kwargs)
         for cost in self.costs:
@@ -128,32 +243,32 @@ class Problem:
     def __del__(self):
         pass
 
-    def populations(self):
-        individuals = {}
-        for individual in self.individuals:
-            if individual.population_id not in individuals:
-                individuals[individual.population_id] = []
-            individuals[individual.population_id].append(individual)
+    @property
+    def individuals(self):
+        return self._individuals
 
-        return individuals
+    @individuals.setter
+    def individuals(self, individuals):
+        # the plain lists are converted to track the changes for the population index
+        if type(individuals) is list:
+            individuals = IndividualList(individuals)
+        self._individuals = individuals
 
-    def population(self, population_id):
-        individuals = []
-        for individual in self.individuals:
-            if individual.population_id == population_id:
-                individuals.append(individual)
+    def populations(self):
+        return self.population_index.groups(self.individuals, 'population_id')
 
-        return individuals
+    def population(self, population_id):
+        return self.population_index.select(self.individuals, 'population_id', population_id)
 
     def last_population(self):
         # find max index
-        max_index = -1
-        for individual in self.individuals:
-            if individual.population_id > max_index:
-                max_index = individual.population_id
+        max_index = max(self.population_index.values(self.individuals, 'population_id'), default=-1)
 
         # add to population
-        return self.population(max_index)
+        return self.population(max(max_index, -1))
+
+    def algorithm_individuals(self, algorithm_id):
+        return self.population_index.select(self.individuals, 'algorithm_id', algorithm_id)
 
     def to_dict(self):
         parameters = list(self.parameters)
@@ -237,9 +352,36 @@ class Problem:
 
 
 class ProblemViewDataStore(Problem):
-    def __init__(self, database_name):
+    """
+    Problem read from the database. With lazy=True the individuals are not loaded, the populations are read on demand
+    and the whole history can be iterated by iter_individuals() or read column-wise by read_columns().
+    """
+    def __init__(self, database_name, lazy=False):
         super().__init__()
-        self.data_store = SqliteDataStore(self, database_name=database_name, mode="read")
+        self.lazy = lazy
+        self.data_store = SqliteDataStore(self, database_name=database_name, mode="read", lazy=lazy)
+
+    def populations(self):
+        if self.lazy:
+            return {population_id: self.data_store.read_population(population_id)
+                    for population_id in self.data_store.population_ids()}
+        return super().populations()
+
+    def population(self, population_id):
+        if self.lazy:
+            return self.data_store.read_population(population_id)
+        return super().population(population_id)
+
+    def last_population(self):
+        if self.lazy:
+            return self.population(max(self.data_store.population_ids(), default=-1))
+        return super().last_population()
+
+    def iter_individuals(self, page_size=1000, population_id=None):
+        return self.data_store.iter_individuals(page_size=page_size, population_id=population_id)
+
+    def read_columns(self, columns=('vector', 'costs'), population_id=None):
+        return self.data_store.read_columns(columns=columns, population_id=population_id)
 
     def set(self, **kwargs):
         pass
@@ -7,9 +7,23 @@ Contains different quality indicators to benchmark the multi-objective optimizat
 Indicators:
 
     - Generational Distance
+    - Inverted Generational Distance (IGD, IGD+)
     - Additive unary epsilon indicator
+    - Hypervolume (exact and Monte Carlo approximation)
 """
 
+# the hypervolume of more objectives is approximated by the Monte Carlo method (method='auto')
+HYPERVOLUME_EXACT_MAX_DIMENSION = 5
+# maximal number of the elements of the temporary arrays of the pairwise comparisons
+CHUNK_SIZE = 2 ** 22
+
+
+def _chunks(n, row_size):
+    """ Slices of the rows, the temporary arrays of the rows do not exceed CHUNK_SIZE elements. """
+    step = max(1, CHUNK_SIZE // max(1, row_size))
+    for start in range(0, n, step):
+        yield slice(start, min(n, start + step))
+
 
 def gd(reference: list, computed: list, norm='euclidean'):
     """
@@ -71,13 +85,203 @@ def epsilon_add(reference: list, computed: list):
          "Performance indicators in multiobjective optimization." Optimization Online (2018).
     """
 
+    # the empty fronts: no reference point to cover, or no computed point covering the reference
+    if len(reference) == 0:
+        return 0.0
+    if len(computed) == 0:
+        return float(np.inf)
+
+    # the scalar values are compared with all the objectives
+    reference = np.asarray(reference, dtype=float).reshape(len(reference), -1)
+    computed = np.asarray(computed, dtype=float).reshape(len(computed), -1)
+
     eps = 0.0
-    for ref_val in reference:
-        eps_j = np.infty
-        for comp_val in computed:
-            eps_k = max(np.subtract(comp_val, ref_val))
-            eps_j = min(eps_k, eps_j)
-        eps = max(eps, eps_j)
+    for rows in _chunks(len(reference), computed.size):
+        # [i, j] = max_k computed[j, k] - reference[i, k]
+        differences = np.max(computed[np.newaxis, :, :] - reference[rows, np.newaxis, :], axis=2)
+        eps = max(eps, np.max(np.min(differences, axis=1)))
+
+    return float(eps)
+
+
+def igd(reference: list, computed: list, norm='euclidean'):
+    r"""
+    :param reference: list of the reference points (a discrete representation of the Pareto-front)
+    :param computed: list of the computed pareto-front values
+    :param norm: see gd
+    :return: inverted generational distance, the mean distance of the reference points from the closest computed
+             point
+
+    .. math::
+
+        IGD(S,P) = \frac{1}{|P|} \Sigma_{r \in P} min_{s \in S} ||F(s) - F(r)||
+
+    Type: Convergence and Diversity Indicator
+
+    [1] C. A. Coello Coello, N. C. Cortes: Solving multiobjective optimization problems using an artificial immune
+        system. Genetic Programming and Evolvable Machines 6 (2) (2005) 163-190.
+    """
+
+    # the empty fronts: no reference point to cover, or no computed point covering the reference
+    if len(reference) == 0:
+        return 0.0
+    if len(computed) == 0:
+        return float(np.inf)
+
+    distances = spatial.distance.cdist(reference, computed, metric=norm)
+    return float(np.mean(np.nanmin(distances, axis=1)))
+
+
+def igd_plus(reference: list, computed: list):
+    r"""
+    :param reference: list of the reference points (a discrete representation of the Pareto-front)
+    :param computed: list of the computed pareto-front values
+    :return: IGD+, only the components, in which the computed point is worse than the reference point, are measured
+             (minimization), so the indicator is weakly Pareto compliant
+
+    .. math::
+
+        IGD^+(S,P) = \frac{1}{|P|} \Sigma_{r \in P} min_{s \in S} \sqrt{\Sigma_i max(F_i(s) - F_i(r), 0)^2}
+
+    [1] H. Ishibuchi, H. Masuda, Y. Tanigaki, Y. Nojima: Modified Distance Calculation in Generational Distance
+        and Inverted Generational Distance. Evolutionary Multi-Criterion Optimization (2015) 110-125.
+    """
+    # the empty fronts: no reference point to cover, or no computed point covering the reference
+    if len(reference) == 0:
+        return 0.0
+    if len(computed) == 0:
+        return float(np.inf)
+
+    reference = np.asarray(reference, dtype=float)
+    computed = np.asarray(computed, dtype=float)
+
+    distances = np.empty(len(reference))
+    for rows in _chunks(len(reference), computed.size):
+        worse = np.maximum(computed[np.newaxis, :, :] - reference[rows, np.newaxis, :], 0.0)
+        distances[rows] = np.sqrt(np.min(np.sum(worse ** 2, axis=2), axis=1))
+
+    return float(np.mean(distances))
+
+
+def _nondominated(points):
+    """ Returns the non-dominated (minimization) unique rows of the points. """
+    points = np.unique(points, axis=0)
+    if len(points) < 2:
+        return points
+
+    if points.shape[1] == 2:
+        # the second objective has to be better than of all the previous rows
+        best = np.minimum.accumulate(points[:, 1])
+        return points[np.concatenate(([True], points[1:, 1] < best[:-1]))]
+
+    # the rows are sorted lexicographically, a row can be dominated only by the previous rows
+    kept = np.empty_like(points)
+    kept[0] = points[0]
+    count = 1
+    for point in points[1:]:
+        if not np.any(np.all(kept[:count] <= point, axis=1)):
+            kept[count] = point
+            count += 1
+
+    return kept[:count]
+
+
+def _hypervolume_2d(points, reference_point):
+    """ Sweep along the first objective, O(n log n). """
+    points = points[np.lexsort((points[:, 1], points[:, 0]))]
+    best = np.minimum.accumulate(points[:, 1])
+    heights = np.concatenate(([reference_point[1]], best[:-1])) - best
+    return float(np.sum((reference_point[0] - points[:, 0]) * heights))
+
+
+def _hypervolume_wfg(points, reference_point):
+    """
+    WFG algorithm [1], the hypervolume is the sum of the exclusive contributions of the points with respect to the
+    following points. The points are sorted by the last objective (the worst first), so the contribution is computed
+    in one dimension less.
+
+    [1] L. While, L. Bradstreet, L. Barone: A Fast Way of Calculating Exact Hypervolumes. IEEE Transactions on
+        Evolutionary Computation 16 (1) (2012) 86-95.
+    """
+    n, dimension = points.shape
+    if n == 0:
+        return 0.0
+    if dimension == 1:
+        return float(reference_point[0] - np.min(points[:, 0]))
+    if dimension == 2:
+        return _hypervolume_2d(points, reference_point)
+
+    points = points[np.argsort(-points[:, -1], kind='stable')]
+    volume = 0.0
+    for i, point in enumerate(points):
+        # the following points limited by the point, the last objective of them is the last objective of the point
+        limited = _nondominated(np.maximum(points[i + 1:, :-1], point[:-1]))
+        exclusive = np.prod(reference_point[:-1] - point[:-1]) - _hypervolume_wfg(limited, reference_point[:-1])
+        volume += (reference_point[-1] - point[-1]) * exclusive
+
+    return float(volume)
+
+
+def hypervolume_monte_carlo(points, reference_point, samples=100000, seed=None):
+    """
+    Monte Carlo approximation of the hypervolume, the fraction of the uniform samples from the box between the ideal
+    point and the reference point, which are dominated by some of the points.
+
+    :param points: list of the computed pareto-front values (minimization)
+    :param reference_point: the upper bound of the measured region
+    :param samples: number of the samples, the standard error is proportional to 1 / sqrt(samples)
+    :param seed: seed of the random numbers
+    """
+    reference_point = np.asarray(reference_point, dtype=float)
+    points = np.asarray(points, dtype=float).reshape(-1, len(reference_point))
+    points = points[np.all(points < reference_point, axis=1)]
+    if len(points) == 0:
+        return 0.0
+
+    ideal = np.min(points, axis=0)
+    box = np.prod(reference_point - ideal)
+    generator = np.random.default_rng(seed)
+
+    dominated = 0
+    for rows in _chunks(samples, points.size):
+        size = rows.stop - rows.start
+        sample = generator.uniform(ideal, reference_point, size=(size, len(reference_point)))
+        dominated += np.count_nonzero(np.any(np.all(points[np.newaxis, :, :] <= sample[:, np.newaxis, :], axis=2),
+                                             axis=1))
+
+    return float(box * dominated / samples)
+
+
+def hypervolume(points: list, reference_point: list, method='auto', samples=100000, seed=None):
+    """
+    :param points: list of the computed pareto-front values (minimization), list of tuples
+    :param reference_point: the point dominated by all the measured points, the points, which do not dominate it,
+                            do not contribute
+    :param method: 'exact', 'monte_carlo' or 'auto' - exact up to HYPERVOLUME_EXACT_MAX_DIMENSION objectives
+    :param samples: number of the samples of the Monte Carlo method
+    :param seed: seed of the Monte Carlo method
+    :return: the volume of the objective space dominated by the points and bounded by the reference point
+
+    Type: Convergence and Diversity Indicator, Pareto compliant
+
+    The exact hypervolume of two objectives is computed by the sweep in O(n log n), the WFG algorithm is used for more
+    objectives.
+
+    [1] E. Zitzler, L. Thiele: Multiobjective Evolutionary Algorithms: A Comparative Case Study and the Strength
+        Pareto Approach. IEEE Transactions on Evolutionary Computation 3 (4) (1999) 257-271.
+    """
+    reference_point = np.asarray(reference_point, dtype=float)
+    points = np.asarray(points, dtype=float).reshape(-1, len(reference_point))
+
+    if method == 'auto':
+        method = 'exact' if len(reference_point) <= HYPERVOLUME_EXACT_MAX_DIMENSION else 'monte_carlo'
 
-    return eps
+    if method == 'monte_carlo':
+        return hypervolume_monte_carlo(points, reference_point, samples, seed)
+    if method != 'exact':
+        raise ValueError("Unknown method '{}'.".format(method))
 
+    points = points[np.all(points < reference_point, axis=1)]
+    if len(reference_point) > 2:
+        points = _nondominated(points)
+    return _hypervolume_wfg(points, reference_point)
@@ -239,86 +239,87 @@ class FORM(GeneralEvolutionaryAlgorithm):
         return std_g
 
     def run(self):
-        iteration = 1
-        convergence = False
-        mean = []
-        individuals = self.generate()
-        for individual in individuals:
-            # append to problem
-            self.problem.individuals.append(individual)
-            # add to population
-            individual.population_id = 0
-
-            self.problem.data_store.sync_individual(individual)
-            mean.append(np.mean(individual.vector))
-        # X = self.generate()
-        # initialize beta and alpha
-        grad_g_x = self.derivative(self.problem, self.mean)
-        self.evaluate(individuals)
-        self.make_individual()
-        mu_g = self.problem.evaluate(self.mean)
-        grad_g_x = self.derivative(self.problem, self.mean)
-        sig_g = self.std_linear(grad_g_x, self.std)
-        beta = mu_g / sig_g
-        alpha = - grad_g_x * self.std / sig_g
-
-        # Initialize design points
-        individuals = self.mean + beta * self.std * alpha
-        start = time.time()
-        self.problem.logger.info("CMA_ES: {}/{}".format(self.options['max_population_number'],
-                                                        self.options['max_population_size']))
-        while not convergence:
-
-            for it in range(self.options['max_population_number']):
-                # for i, dist in enumerate(X.dist_name):
-                #     if dist != 'norm':
-                #         # equivalent values
-                #         X.std[i] = (1 / (X.dist_func[i].pdf(x[i]))
-                #                     * stats.norm.pdf(
-                #                     stats.norm.ppf(
-                #                         X.dist_func[i].cdf(x[i]))))
-                #         X.mean[i] = x[i] - X.std[i] * (stats.norm.ppf(
-                #             X.dist_func[i].cdf(x[i])))
-
-                # transform to standard space
-                transform_individuals = (individuals - self.mean) / self.std
-
-                # compute gradient of g with respect to z
-                grad_g_x = self.derivative(self.problem, individuals)
-                grad_g_z = grad_g_x * self.std
-
-                beta_previous = beta
-                beta = (self.problem.evaluate(*individuals) - grad_g_z @ transform_individuals) \
-                       / np.linalg.norm(grad_g_z)
-                alpha = - grad_g_z / np.linalg.norm(grad_g_z)
-
-                # update design points in standard space
-                transform_individuals = alpha * beta
-                # transform to physical space
-                physical_transform = self.mean + transform_individuals * self.std
-
-                condition1 = np.linalg.norm(physical_transform - individuals)\
-                             / np.linalg.norm(physical_transform) < self.tol
-                condition2 = abs(np.round(beta, 3) - np.round(beta_previous, 3)) < self.tol
-                if condition2 or condition1:
-                    convergence = True
-                if not convergence:
-                    individuals = physical_transform
-                    # iteration += 1
-                    for individual in individuals:
-                        # add to population
-                        individual.population_id = it + 1
-                        # append to problem
-                        self.problem.individuals.append(individual)
-                        # sync to datastore
-                        self.problem.data_store.sync_individual(individual)
-
-                # for individual in individuals:
-                #     # add to population
-                #     individual.population_id = it + 1
-                #     # append to problem
-                #     self.problem.individuals.append(individual)
-                #     # sync to datastore
-                #     self.problem.data_store.sync_individual(individual)
-
-        return individuals, beta, iteration
+        with self.evaluator:
+            iteration = 1
+            convergence = False
+            mean = []
+            individuals = self.generate()
+            for individual in individuals:
+                # append to problem
+                self.problem.individuals.append(individual)
+                # add to population
+                individual.population_id = 0
+
+                self.problem.data_store.sync_individual(individual)
+                mean.append(np.mean(individual.vector))
+            # X = self.generate()
+            # initialize beta and alpha
+            grad_g_x = self.derivative(self.problem, self.mean)
+            self.evaluate(individuals)
+            self.make_individual()
+            mu_g = self.problem.evaluate(self.mean)
+            grad_g_x = self.derivative(self.problem, self.mean)
+            sig_g = self.std_linear(grad_g_x, self.std)
+            beta = mu_g / sig_g
+            alpha = - grad_g_x * self.std / sig_g
+
+            # Initialize design points
+            individuals = self.mean + beta * self.std * alpha
+            start = time.time()
+            self.problem.logger.info("CMA_ES: {}/{}".format(self.options['max_population_number'],
+                                                            self.options['max_population_size']))
+            while not convergence:
+
+                for it in range(self.options['max_population_number']):
+                    # for i, dist in enumerate(X.dist_name):
+                    #     if dist != 'norm':
+                    #         # equivalent values
+                    #         X.std[i] = (1 / (X.dist_func[i].pdf(x[i]))
+                    #                     * stats.norm.pdf(
+                    #                     stats.norm.ppf(
+                    #                         X.dist_func[i].cdf(x[i]))))
+                    #         X.mean[i] = x[i] - X.std[i] * (stats.norm.ppf(
+                    #             X.dist_func[i].cdf(x[i])))
+
+                    # transform to standard space
+                    transform_individuals = (individuals - self.mean) / self.std
+
+                    # compute gradient of g with respect to z
+                    grad_g_x = self.derivative(self.problem, individuals)
+                    grad_g_z = grad_g_x * self.std
+
+                    beta_previous = beta
+                    beta = (self.problem.evaluate(*individuals) - grad_g_z @ transform_individuals) \
+                           / np.linalg.norm(grad_g_z)
+                    alpha = - grad_g_z / np.linalg.norm(grad_g_z)
+
+                    # update design points in standard space
+                    transform_individuals = alpha * beta
+                    # transform to physical space
+                    physical_transform = self.mean + transform_individuals * self.std
+
+                    condition1 = np.linalg.norm(physical_transform - individuals)\
+                                 / np.linalg.norm(physical_transform) < self.tol
+                    condition2 = abs(np.round(beta, 3) - np.round(beta_previous, 3)) < self.tol
+                    if condition2 or condition1:
+                        convergence = True
+                    if not convergence:
+                        individuals = physical_transform
+                        # iteration += 1
+                        for individual in individuals:
+                            # add to population
+                            individual.population_id = it + 1
+                            # append to problem
+                            self.problem.individuals.append(individual)
+                            # sync to datastore
+                            self.problem.data_store.sync_individual(individual)
+
+                    # for individual in individuals:
+                    #     # add to population
+                    #     individual.population_id = it + 1
+                    #     # append to problem
+                    #     self.problem.individuals.append(individual)
+                    #     # sync to datastore
+                    #     self.problem.data_store.sync_individual(individual)
+
+            return individuals, beta, iteration
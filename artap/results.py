@@ -1,8 +1,9 @@
 import csv
 import numpy as np
-from .quality_indicator import gd, epsilon_add
+from .quality_indicator import gd, igd, igd_plus, epsilon_add
 from .operators import derivative, std_linear
 from .individual import Individual
+from .population import PopulationArray
 
 
 class Results:
@@ -60,6 +61,10 @@ class Results:
                 costs = results.costs()
                 plt.plot(costs, '.')
         """
+        if isinstance(self.problem.individuals, PopulationArray):
+            individuals = self.problem.individuals
+            return individuals.costs[individuals.evaluated].T.tolist()
+
         out = []
         n = len(self.problem.individuals[0].costs)
         for i in range(n):
@@ -299,6 +304,15 @@ class Results:
         if 'criteria' in self.problem.costs[index]:
             criteria = self.problem.costs[index]['criteria']
 
+        if isinstance(self.problem.individuals, PopulationArray) and len(self.problem.individuals) > 0:
+            individuals = self.problem.individuals
+            rows = np.flatnonzero(individuals.evaluated)
+            values = individuals.costs[rows, index]
+            if criteria == 'minimize' or criteria is None:
+                return individuals[int(rows[np.argmin(values)])]
+            else:
+                return individuals[int(rows[np.argmax(values)])]
+
         if criteria == 'minimize' or criteria is None:
             if len(self.problem.individuals) > 0:
                 min_l = [min(self.problem.individuals, key=lambda x: x.costs[index])]
@@ -338,7 +352,7 @@ class Results:
         an epsilon measure, but other metrics can be selected.
 
         :param reference: list of tuples, which are similar to the data of the calculated pareto-front
-        :param type:
+        :param type: 'epsilon', 'gd', 'igd' or 'igd+'
         :return:
         """
 
@@ -349,10 +363,17 @@ class Results:
             result = epsilon_add(reference, computed)
         if type == 'gd':
             result = gd(reference, computed)
+        if type == 'igd':
+            result = igd(reference, computed)
+        if type == 'igd+':
+            result = igd_plus(reference, computed)
 
         return result
 
     def get_population_ids(self):
+        if isinstance(self.problem.individuals, PopulationArray):
+            return set(self.problem.individuals.population_ids.tolist())
+
         ids = set()
         for individual in self.problem.individuals:
             ids.add(individual.population_id)
@@ -1,4 +1,7 @@
+import asyncio
+import pickle
 import unittest
+import numpy as np
 from ..problem import Problem
 from ..individual import Individual
 from ..operators import CustomGenerator, LHSGenerator, Evaluator
@@ -21,6 +24,60 @@ class SweepProblem(Problem):
         return [result]
 
 
+class BatchProblem(Problem):
+    """ Problem evaluated by whole populations. """
+    def set(self):
+        self.name = "BatchProblem"
+        self.parameters = [{'name': 'x_1', 'initial_value': 10, 'bounds': [-10, 30]},
+                           {'name': 'x_2', 'initial_value': 10, 'bounds': [-10, 30]}]
+        self.costs = [{'name': 'F_1', 'criteria': 'minimize'},
+                      {'name': 'F_2', 'criteria': 'maximize'}]
+        self.batches = []
+
+    def evaluate(self, individual: Individual):
+        raise NotImplementedError
+
+    def evaluate_batch(self, x):
+        self.batches.append(x.shape)
+        return np.column_stack((np.sum(x ** 2, axis=1), x[:, 0]))
+
+
+class AsyncProblem(Problem):
+    """ Problem evaluated by coroutines (e.g. remote jobs). """
+    def set(self):
+        self.name = "AsyncProblem"
+        self.parameters = [{'name': 'x_1', 'initial_value': 10, 'bounds': [-10, 30]}]
+        self.costs = [{'name': 'F_1', 'criteria': 'minimize'}]
+        self.running = 0
+        self.max_running = 0
+
+    def evaluate(self, individual: Individual):
+        raise NotImplementedError
+
+    async def evaluate_async(self, individual):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        return [individual.vector[0] ** 2]
+
+
+class ExecutorProblem(SweepProblem):
+    """ Problem referenced by its executor (the references are restored in the worker processes). """
+    def set(self):
+        super().set()
+        self.executor = Sentinel(self)
+
+    def evaluate(self, individual: Individual):
+        assert self.executor.problem is self
+        return super().evaluate(individual)
+
+
+class Sentinel:
+    def __init__(self, problem):
+        self.problem = problem
+
+
 class TestJob(unittest.TestCase):
     """ Tests simple one objective optimization problem."""
 
@@ -83,6 +140,93 @@ class TestJob(unittest.TestCase):
         self.assertEqual(individuals[0].costs, [9])
         self.assertEqual(individuals[1].costs, [22])
 
+    def test_sweep_evaluate_process_pool(self):
+        problem = SweepProblem()
+        generator = LHSGenerator(problem.parameters)
+        generator.init(8)
+
+        algorithm = SweepAlgorithm(problem, generator=generator)
+        algorithm.options['max_processes'] = 2
+        algorithm.options['parallel_backend'] = 'process'
+        algorithm.run()
+
+        # the worker processes are shut down at the end of the run
+        self.assertIsNone(algorithm.evaluator._pool)
+
+        individuals = problem.individuals
+        self.assertEqual(len(individuals), 8)
+        for individual in individuals:
+            self.assertEqual(individual.state, Individual.State.EVALUATED)
+            self.assertAlmostEqual(individual.costs[0], individual.vector[0] ** 2)
+            self.assertAlmostEqual(individual.costs_signed[0], individual.vector[0] ** 2, 5)
+            self.assertGreater(individual.features['finish_time'], 0.0)
+
+    def test_process_pool_problem(self):
+        problem = ExecutorProblem()
+        problem.individuals = [Individual([1.0])]
+
+        algorithm = DummyAlgorithm(problem)
+        algorithm.options['max_processes'] = 2
+        algorithm.options['parallel_backend'] = 'process'
+        individuals = [Individual([float(i)]) for i in range(4)]
+        algorithm.evaluator.evaluate(individuals)
+        algorithm.evaluator.close()
+
+        self.assertEqual([individual.costs[0] for individual in individuals], [0, 1, 4, 9])
+        # the problem is pickled completely outside of the evaluator
+        self.assertEqual(len(pickle.loads(pickle.dumps(problem)).individuals), 1)
+
+    def test_sweep_evaluate_batch(self):
+        problem = BatchProblem()
+        generator = LHSGenerator(problem.parameters)
+        generator.init(6)
+
+        algorithm = SweepAlgorithm(problem, generator=generator)
+        algorithm.options['max_processes'] = 2
+        algorithm.run()
+
+        self.assertEqual(problem.batches, [(6, 2)])
+        self.assertEqual(problem.surrogate.eval_counter, 6)
+        for individual in problem.individuals:
+            self.assertEqual(individual.state, Individual.State.EVALUATED)
+            self.assertAlmostEqual(individual.costs[0], individual.vector[0] ** 2 + individual.vector[1] ** 2)
+            self.assertAlmostEqual(individual.costs_signed[1], -individual.vector[0], 5)
+
+    def test_dummy_evaluate_scalar_batch(self):
+        problem = BatchProblem()
+        algorithm = DummyAlgorithm(problem)
+
+        self.assertAlmostEqual(algorithm.evaluator.evaluate_scalar([1.0, 2.0]), 5.0)
+        self.assertEqual(problem.batches, [(1, 2)])
+
+    def test_sweep_evaluate_async(self):
+        problem = AsyncProblem()
+        generator = LHSGenerator(problem.parameters)
+        generator.init(50)
+
+        algorithm = SweepAlgorithm(problem, generator=generator)
+        algorithm.options['max_concurrency'] = 10
+        algorithm.run()
+
+        self.assertEqual(problem.max_running, 10)
+        self.assertEqual(problem.surrogate.eval_counter, 50)
+        for individual in problem.individuals:
+            self.assertEqual(individual.state, Individual.State.EVALUATED)
+            self.assertAlmostEqual(individual.costs[0], individual.vector[0] ** 2)
+
+    def test_evaluate_async_running_loop(self):
+        problem = AsyncProblem()
+        algorithm = DummyAlgorithm(problem)
+        individuals = [Individual([float(i)]) for i in range(5)]
+
+        # e.g. Jupyter, the evaluation is called inside a running event loop
+        async def evaluate():
+            algorithm.evaluator.evaluate(individuals)
+            return algorithm.evaluator.evaluate_scalar([3.0])
+
+        self.assertAlmostEqual(asyncio.run(evaluate()), 9.0)
+        self.assertEqual([individual.costs[0] for individual in individuals], [0.0, 1.0, 4.0, 9.0, 16.0])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,8 +1,9 @@
-from ..archive import Archive
+from ..archive import Archive, EpsilonBoxArchive, NDTree, SortedFront
 from ..individual import Individual
-from ..operators import crowding_distance
+from ..operators import crowding_distance, ParetoDominance, Dominance
 
 import unittest
+import random
 
 
 class TestArchive(unittest.TestCase):
@@ -157,3 +158,108 @@ class TestArchive(unittest.TestCase):
         x3.costs_signed = [1.5, 11., 0.]
 
         self.assertIn(x3, self.archive._contents)
+
+
+class ComparedDominance(Dominance):
+    """ Pareto dominance, which is not recognized by the archive, the members are compared one by one. """
+
+    def compare(self, p, q):
+        return ParetoDominance().compare(p, q)
+
+
+class TestIndexedArchive(unittest.TestCase):
+
+    @staticmethod
+    def individual(costs, violation=0):
+        individual = Individual([random.random()])
+        individual.costs = list(costs)
+        individual.costs_signed = list(costs) + [violation]
+        return individual
+
+    def test_indexed_archive_equals_compared_archive(self):
+        for dimension in [1, 2, 3, 4]:
+            indexed = Archive(dominance=ParetoDominance())
+            compared = Archive(dominance=ComparedDominance())
+            for i in range(500):
+                individual = self.individual([round(random.random(), 1) for _ in range(dimension)],
+                                             random.choice([0, 0, 0, 1]))
+                self.assertEqual(indexed.add(individual), compared.add(individual))
+
+                if i % 20 == 0:
+                    member = indexed.rand_choice()
+                    self.assertTrue(indexed.remove(member))
+                    self.assertTrue(compared.remove(member))
+
+            self.assertEqual(set(map(id, indexed)), set(map(id, compared)))
+
+            individual = self.individual([0.5] * dimension)
+            self.assertEqual(indexed.is_dominated(individual), compared.is_dominated(individual))
+
+    def test_fronts(self):
+        for front in [SortedFront(), NDTree(2, leaf_size=4)]:
+            points = [(i / 100.0, 1.0 - i / 100.0) for i in range(101)]
+            random.shuffle(points)
+            for point in points:
+                self.assertTrue(front.add(point, point)[0])
+            self.assertEqual(len(front), 101)
+
+            self.assertTrue(front.is_dominated((0.5, 0.6)))
+            self.assertFalse(front.is_dominated((0.5, 0.4)))
+
+            # dominates 41 points (0.3, 0.7) ... (0.7, 0.3)
+            accepted, removed = front.add((0.3, 0.3), None)
+            self.assertTrue(accepted)
+            self.assertEqual(len(removed), 41)
+            self.assertEqual(len(front), 61)
+
+            point = next(point for point in points if point[0] == 0.0)
+            self.assertTrue(front.remove(point, point))
+            self.assertFalse(front.remove(point, point))
+            self.assertEqual(len(front), 60)
+
+
+class TestEpsilonBoxArchive(unittest.TestCase):
+
+    def setUp(self):
+        self.archive = EpsilonBoxArchive(epsilons=[0.1, 0.1])
+
+    @staticmethod
+    def individual(costs):
+        individual = Individual([random.random()])
+        individual.costs = list(costs)
+        individual.costs_signed = list(costs) + [0]
+        return individual
+
+    def test_same_box(self):
+        x = self.individual([0.18, 0.12])
+        y = self.individual([0.12, 0.18])
+        z = self.individual([0.11, 0.11])
+
+        self.assertTrue(self.archive.add(x))
+        self.assertEqual(self.archive.box(x), (1, 1))
+        # non-dominated, but farther from the corner of the box
+        self.assertFalse(self.archive.add(self.individual([0.19, 0.11])))
+        # the same distance
+        self.assertFalse(self.archive.add(y))
+        # dominates the member of the box
+        self.assertTrue(self.archive.add(z))
+        self.assertEqual(self.archive._contents, [z])
+
+    def test_box_dominance(self):
+        x = self.individual([0.35, 0.35])
+        y = self.individual([0.05, 0.55])
+        self.assertTrue(self.archive.add(x))
+        self.assertTrue(self.archive.add(y))
+
+        # the box (3, 4) is dominated by the box of x
+        self.assertTrue(self.archive.is_dominated(self.individual([0.31, 0.45])))
+        self.assertFalse(self.archive.add(self.individual([0.31, 0.45])))
+
+        # the box (2, 3) dominates the box of x
+        self.assertTrue(self.archive.add(self.individual([0.29, 0.39])))
+        self.assertEqual(self.archive.size(), 2)
+        self.assertNotIn(x, self.archive._contents)
+
+        self.assertTrue(self.archive.remove(y))
+        self.assertEqual(self.archive.size(), 1)
+        self.assertTrue(self.archive.add(self.individual([0.05, 0.55])))
@@ -1,6 +1,8 @@
 import unittest
+import numpy as np
 from ..individual import Individual
-from ..benchmark_pareto import BiObjectiveTestProblem, DTLZI,DTLZII, DTLZIII, DTLZIV
+from ..benchmark_pareto import BiObjectiveTestProblem, DTLZI,DTLZII, DTLZIII, DTLZIV, PoloniFunction, CEC2020MMF1, \
+    CEC2020MMF2, ZDT1
 
 
 class TestBiobjective(unittest.TestCase):
@@ -82,3 +84,31 @@ class TestDTLZIV(unittest.TestCase):
         f2 = test2d.evaluate(Individual(x))[2]
 
         self.assertAlmostEqual(f0**2.0+f1**2.0+f2**2.0, 1.0)
+
+
+class TestEvaluateBatch(unittest.TestCase):
+    """ Vectorized evaluate_batch gives the same results as evaluate """
+
+    def check_batch(self, problem, n=50):
+        rng = np.random.default_rng(1)
+        lb = np.array([parameter['bounds'][0] for parameter in problem.parameters])
+        ub = np.array([parameter['bounds'][1] for parameter in problem.parameters])
+        x = lb + (ub - lb) * rng.random((n, len(problem.parameters)))
+
+        costs = problem.evaluate_batch(x)
+
+        self.assertEqual(costs.shape, (n, len(problem.costs)))
+        for vector, batch_costs in zip(x, costs):
+            np.testing.assert_allclose(batch_costs, problem.evaluate(Individual(list(vector))), rtol=1e-10,
+                                       atol=1e-12)
+
+    def test_two_dimensional(self):
+        for benchmark in [BiObjectiveTestProblem, PoloniFunction, CEC2020MMF1, CEC2020MMF2, ZDT1]:
+            with self.subTest(benchmark=benchmark.__name__):
+                self.check_batch(benchmark())
+
+    def test_dtlz(self):
+        for benchmark in [DTLZI, DTLZII, DTLZIII, DTLZIV]:
+            for dimension, m in [(8, 3), (12, 3), (14, 5)]:
+                with self.subTest(benchmark=benchmark.__name__, dimension=dimension, m=m):
+                    self.check_batch(benchmark(**{'dimension': dimension, 'm': m}))
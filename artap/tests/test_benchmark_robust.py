@@ -1,4 +1,5 @@
 import unittest
+import numpy as np
 from ..individual import Individual
 from ..benchmark_robust import Synthetic1D, Synthetic2D, Synthetic5D, Synthetic10D
 
@@ -52,3 +53,23 @@ class TestSynthetic10D(unittest.TestCase):
         self.assertAlmostEqual(test.evaluate(Individual([1.0, 3.0, 8.0, 9.5, 2.0, 1.0, 3.0, 8.0, 9.5, 2.0]))[0], 0.75)
         self.assertAlmostEqual(test.evaluate(Individual([3.0, 1.0, 3.0, 2.0, 5.0, 3.0, 1.0, 3.0, 2.0, 5.0]))[0], 1.0)
         self.assertAlmostEqual(test.evaluate(Individual([3.0, 4.0, 1.3, 5.0, 5.0, 3.0, 4.0, 1.3, 5.0, 5.0]))[0], 1.2)
+
+
+class TestEvaluateBatch(unittest.TestCase):
+    """ Vectorized evaluate_batch gives the same results as evaluate """
+
+    def test_synthetic(self):
+        rng = np.random.default_rng(1)
+        for benchmark in [Synthetic1D, Synthetic2D, Synthetic5D, Synthetic10D]:
+            with self.subTest(benchmark=benchmark.__name__):
+                problem = benchmark()
+                lb = np.array([parameter['bounds'][0] for parameter in problem.parameters])
+                ub = np.array([parameter['bounds'][1] for parameter in problem.parameters])
+                x = lb + (ub - lb) * rng.random((50, len(problem.parameters)))
+
+                costs = problem.evaluate_batch(x)
+
+                self.assertEqual(costs.shape, (50, 1))
+                for vector, batch_costs in zip(x, costs):
+                    np.testing.assert_allclose(batch_costs, problem.evaluate(Individual(list(vector))), rtol=1e-10,
+                                               atol=1e-12)
@@ -1,4 +1,5 @@
 import unittest
+import numpy as np
 from ..individual import Individual
 from ..benchmark_functions import Rosenbrock, Ackley, Schwefel, Sphere, ModifiedEasom, Michaelwicz, Perm, Rastrigin, \
     SixHump, EqualityConstr, Griewank, Schubert, Zakharov, XinSheYang, XinSheYang2, XinSheYang3, Booth, GramacyLee, \
@@ -181,5 +182,50 @@ class TestAlpine(unittest.TestCase):
         self.assertAlmostEqual(test2d.evaluate(Individual(test2d.global_optimum_coords))[0], test2d.global_optimum, 3)
 
 
+class TestEvaluateBatch(unittest.TestCase):
+    """ Vectorized evaluate_batch gives the same results as evaluate """
+
+    def random_vectors(self, problem, n=50):
+        rng = np.random.default_rng(1)
+        lb = np.array([parameter['bounds'][0] for parameter in problem.parameters])
+        ub = np.array([parameter['bounds'][1] for parameter in problem.parameters])
+        return lb + (ub - lb) * rng.random((n, len(problem.parameters)))
+
+    def check_batch(self, problem):
+        x = self.random_vectors(problem)
+        costs = problem.evaluate_batch(x)
+
+        self.assertEqual(costs.shape, (len(x), len(problem.costs)))
+        for vector, batch_costs in zip(x, costs):
+            np.testing.assert_allclose(batch_costs, problem.evaluate(Individual(list(vector))), rtol=1e-10,
+                                       atol=1e-12)
+
+    def test_scalable(self):
+        for benchmark in [Rosenbrock, Ackley, Sphere, Schwefel, ModifiedEasom, EqualityConstr, Griewank, Perm,
+                          Rastrigin, Zakharov, XinSheYang, XinSheYang2, AlpineFunction]:
+            for dimension in [2, 10]:
+                with self.subTest(benchmark=benchmark.__name__, dimension=dimension):
+                    self.check_batch(benchmark(**{'dimension': dimension}))
+
+    def test_michaelwicz(self):
+        self.check_batch(Michaelwicz(**{'dimension': 2}))
+        self.check_batch(Michaelwicz(**{'dimension': 10}))
+
+    def test_fixed_dimension(self):
+        for benchmark in [SixHump, Schubert, Booth, GramacyLee]:
+            with self.subTest(benchmark=benchmark.__name__):
+                self.check_batch(benchmark())
+
+    def test_xinsheyang3(self):
+        # random weights, only the bounds can be compared
+        problem = XinSheYang3(**{'dimension': 10})
+        x = self.random_vectors(problem)
+        costs = problem.evaluate_batch(x)
+
+        self.assertEqual(costs.shape, (len(x), 1))
+        self.assertTrue(np.all(costs[:, 0] >= 0.))
+        self.assertTrue(np.all(costs[:, 0] <= np.fabs(x[:, -1] - 1. / 10.)))
+
+
 if __name__ == '__main__':
     unittest.main()
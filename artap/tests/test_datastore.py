@@ -2,9 +2,10 @@ import os
 import unittest
 import tempfile
 import time
-import json
+import shutil
 import sqlite3
 import pathlib
+import numpy as np
 
 from ..problem import Problem, ProblemViewDataStore
 from ..individual import Individual
@@ -21,6 +22,13 @@ else:
     __platform__ = 'Linux'
 
 
+def remove_database(database_name):
+    """ Removes the database and the files of its write-ahead log. """
+    for name in [database_name, database_name + "-wal", database_name + "-shm"]:
+        if os.path.exists(name):
+            os.remove(name)
+
+
 class MyProblem(Problem):
     """ Describe simple one objective optimization problem. """
     def set(self):
@@ -61,12 +69,11 @@ class TestDataStoreSqlite(unittest.TestCase):
         # remove datastore
         problem.data_store.destroy()
 
-        # check json
-        conn = sqlite3.connect(database_name)
-        c = conn.cursor()
-        c.execute("SELECT * FROM individuals WHERE ID = ?", [list(individuals.keys())[6]])
-        row = c.fetchall()
-        individual = Individual.from_dict(json.loads(row[0][1]))
+        # check database
+        problem_view = ProblemViewDataStore(database_name=database_name)
+        individual = [individual for individual in problem_view.individuals
+                      if individual.id == list(individuals.keys())[6]][0]
+        problem_view.data_store.destroy()
         # print(individual)
 
         # result
@@ -80,8 +87,7 @@ class TestDataStoreSqlite(unittest.TestCase):
             self.assertEqual(value, individual.features[key])
 
         # remove file
-        conn.close()
-        os.remove(database_name)
+        remove_database(database_name)
 
     def test_read_datastore(self):
         # Path to this script file location
@@ -97,6 +103,290 @@ class TestDataStoreSqlite(unittest.TestCase):
         self.assertAlmostEqual(individuals[1].vector[0], 1.8944488, 4)
         self.assertAlmostEqual(individuals[0].costs[0], 49.0245242, 4)
 
+    def test_migrate_datastore(self):
+        # data/data.sqlite uses the json schema (version 1)
+        file_path = str(pathlib.Path(__file__).parent.absolute())
+        database_name = tempfile.NamedTemporaryFile(mode="w", delete=False, dir=None, suffix=".sqlite").name
+        shutil.copyfile(os.path.join(file_path, "data/data.sqlite"), database_name)
+
+        problem_json = ProblemViewDataStore(database_name=database_name)
+        problem = MyProblem()
+        problem.data_store = SqliteDataStore(problem, database_name=database_name, mode="write")
+        problem.data_store.destroy()
+
+        conn = sqlite3.connect(database_name)
+        c = conn.cursor()
+        c.execute("PRAGMA user_version;")
+        self.assertEqual(c.fetchone()[0], SqliteDataStore.schema_version)
+        c.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'individuals';")
+        indices = [row[0] for row in c.fetchall()]
+        conn.close()
+        for column in ['population_id', 'algorithm_id', 'state']:
+            self.assertIn("individuals_" + column, indices)
+
+        problem_columns = ProblemViewDataStore(database_name=database_name)
+        remove_database(database_name)
+
+        self.assertEqual(len(problem_columns.individuals), len(problem_json.individuals))
+        for individual, individual_json in zip(problem_columns.individuals, problem_json.individuals):
+            self.assertEqual(individual.id, individual_json.id)
+            self.assertEqual(individual.population_id, individual_json.population_id)
+            self.assertEqual(individual.vector, individual_json.vector)
+            self.assertEqual(individual.costs, individual_json.costs)
+            self.assertEqual(individual.features, individual_json.features)
+
+
+class TestDataStoreWriteBehind(unittest.TestCase):
+    def setUp(self):
+        self.database_name = tempfile.NamedTemporaryFile(mode="w", delete=False, dir=None, suffix=".sqlite").name
+
+    def tearDown(self):
+        remove_database(self.database_name)
+
+    def count_individuals(self):
+        conn = sqlite3.connect(self.database_name)
+        c = conn.cursor()
+        c.execute("SELECT COUNT(*) FROM individuals;")
+        count = c.fetchone()[0]
+        conn.close()
+        return count
+
+    def test_flush(self):
+        problem = MyProblem()
+        problem.data_store = SqliteDataStore(problem, database_name=self.database_name, batch_size=10,
+                                             flush_interval=60.0)
+
+        individuals = [Individual([float(i), 0.0]) for i in range(25)]
+        for individual in individuals:
+            problem.data_store.sync_individual(individual)
+
+        # the last batch is waiting for the time window
+        problem.data_store.flush()
+        self.assertEqual(self.count_individuals(), 25)
+
+        # the writes are applied in order, the last one wins
+        individuals[0].costs = [1.0]
+        problem.data_store.sync_individual(individuals[0])
+        individuals[0].costs = [2.0]
+        problem.data_store.sync_individual(individuals[0])
+        problem.data_store.destroy()
+
+        problem_view = ProblemViewDataStore(database_name=self.database_name)
+        individual = [individual for individual in problem_view.individuals if individual.id == individuals[0].id][0]
+        self.assertEqual(individual.costs, [2.0])
+
+    def test_flush_interval(self):
+        problem = MyProblem()
+        problem.data_store = SqliteDataStore(problem, database_name=self.database_name, batch_size=1000,
+                                             flush_interval=0.05)
+        problem.data_store.sync_individual(Individual([1.0, 0.0]))
+
+        for i in range(100):
+            if self.count_individuals() == 1:
+                break
+            time.sleep(0.05)
+        self.assertEqual(self.count_individuals(), 1)
+        problem.data_store.destroy()
+
+    def test_write_error(self):
+        problem = MyProblem()
+        problem.data_store = SqliteDataStore(problem, database_name=self.database_name, batch_size=1,
+                                             flush_interval=60.0)
+        problem.data_store.sync_individual(Individual([1.0, 0.0]))
+        problem.data_store.flush()
+
+        # the failed batch stops the writer, the database contains the rows written before the failure
+        problem.data_store._write(problem.data_store.sql_cache_upsert, [[object(), "{}"]])
+        with self.assertRaises(sqlite3.ProgrammingError):
+            problem.data_store.flush()
+        with self.assertRaises(sqlite3.ProgrammingError):
+            problem.data_store.sync_individual(Individual([2.0, 0.0]))
+        self.assertEqual(self.count_individuals(), 1)
+        with self.assertLogs(problem.logger, level='ERROR'):
+            problem.data_store.destroy()
+
+    def test_operational_error(self):
+        problem = MyProblem()
+        problem.data_store = SqliteDataStore(problem, database_name=self.database_name, batch_size=1,
+                                             flush_interval=60.0)
+
+        # only the locked database is retried, the other errors fail the writer
+        problem.data_store._write("INSERT INTO missing_table VALUES (?)", [[1]])
+        with self.assertRaises(sqlite3.OperationalError):
+            problem.data_store.flush()
+        with self.assertLogs(problem.logger, level='ERROR'):
+            problem.data_store.destroy()
+
+    def test_non_numeric_costs(self):
+        problem = MyProblem()
+        problem.data_store = SqliteDataStore(problem, database_name=self.database_name)
+
+        # the rows, which can not be packed to float64, are stored as json
+        individuals = [Individual([float(i), 0.0]) for i in range(3)]
+        individuals[0].costs = [1.0]
+        individuals[1].costs = ["failed"]
+        individuals[2].costs = [[1.0, 2.0], [3.0]]
+        for individual in individuals:
+            problem.data_store.sync_individual(individual)
+        problem.data_store.destroy()
+
+        problem_view = ProblemViewDataStore(database_name=self.database_name)
+        self.assertEqual([individual.costs for individual in problem_view.individuals],
+                         [individual.costs for individual in individuals])
+        columns = problem_view.data_store.read_columns(['costs'])
+        self.assertEqual(columns['costs'][1].tolist(), ["failed"])
+
+    def test_write_through(self):
+        problem = MyProblem()
+        problem.data_store = SqliteDataStore(problem, database_name=self.database_name, write_behind=False)
+        problem.data_store.sync_individual(Individual([1.0, 0.0]))
+        self.assertEqual(self.count_individuals(), 1)
+        problem.data_store.destroy()
+
+
+class TestDataStoreLazy(unittest.TestCase):
+    def setUp(self):
+        self.database_name = tempfile.NamedTemporaryFile(mode="w", delete=False, dir=None, suffix=".sqlite").name
+        problem = MyProblem()
+        problem.data_store = SqliteDataStore(problem, database_name=self.database_name)
+
+        self.individuals = []
+        for i in range(25):
+            individual = Individual([float(i), -float(i)])
+            individual.population_id = i % 3
+            individual.costs = [float(i) ** 2]
+            self.individuals.append(individual)
+        problem.individuals = self.individuals
+        problem.data_store.sync_all()
+        problem.data_store.destroy()
+
+    def tearDown(self):
+        remove_database(self.database_name)
+
+    def test_iter_individuals(self):
+        problem = ProblemViewDataStore(database_name=self.database_name, lazy=True)
+        self.assertEqual(len(problem.individuals), 0)
+
+        ids = [individual.id for individual in problem.iter_individuals(page_size=7)]
+        self.assertEqual(ids, [individual.id for individual in self.individuals])
+        ids = [individual.id for individual in problem.iter_individuals(page_size=5, population_id=1)]
+        self.assertEqual(ids, [individual.id for individual in self.individuals if individual.population_id == 1])
+
+    def test_population(self):
+        problem = ProblemViewDataStore(database_name=self.database_name, lazy=True)
+        self.assertEqual(sorted(problem.populations().keys()), [0, 1, 2])
+        population = problem.last_population()
+        self.assertEqual([individual.vector for individual in population],
+                         [individual.vector for individual in self.individuals if individual.population_id == 2])
+
+    def test_read_columns(self):
+        problem = ProblemViewDataStore(database_name=self.database_name, lazy=True)
+        columns = problem.data_store.read_columns(['id', 'vector', 'costs'], page_size=4)
+        self.assertEqual(columns['vector'].shape, (25, 2))
+        self.assertEqual(columns['costs'].shape, (25, 1))
+        np.testing.assert_array_equal(columns['id'], [individual.id for individual in self.individuals])
+        np.testing.assert_array_equal(columns['vector'][:, 1], -columns['vector'][:, 0])
+
+        columns = problem.read_columns(['costs'], population_id=0)
+        np.testing.assert_array_equal(columns['costs'][:, 0], [float(i) ** 2 for i in range(0, 25, 3)])
+
+    def test_read_columns_json(self):
+        # data/data.sqlite uses the json schema (version 1)
+        file_path = str(pathlib.Path(__file__).parent.absolute())
+        database_name = os.path.join(file_path, "data/data.sqlite")
+        problem = ProblemViewDataStore(database_name=database_name)
+        problem_lazy = ProblemViewDataStore(database_name=database_name, lazy=True)
+
+        self.assertEqual([individual.vector for individual in problem_lazy.last_population()],
+                         [individual.vector for individual in problem.last_population()])
+        columns = problem_lazy.read_columns(['vector', 'costs'])
+        np.testing.assert_allclose(columns['costs'], [individual.costs for individual in problem.individuals])
+
+
+class TestDataStoreModified(unittest.TestCase):
+    def test_individual_modified(self):
+        individual = Individual([1.0, 2.0])
+        self.assertTrue(individual.is_modified())
+        individual.mark_synced()
+        self.assertFalse(individual.is_modified())
+
+        # in-place changes
+        individual.features["front_number"] = 1
+        self.assertTrue(individual.is_modified())
+        individual.mark_synced()
+        individual.vector[0] = 3.0
+        self.assertTrue(individual.is_modified())
+        individual.features["velocity"] = [0.0, 0.0]
+        individual.mark_synced()
+        individual.features["velocity"][1] = 1.0
+        self.assertTrue(individual.is_modified())
+        # same length, non-numeric values
+        individual.custom["labels"] = ["a", "b"]
+        individual.mark_synced()
+        individual.custom["labels"][0] = "c"
+        self.assertTrue(individual.is_modified())
+
+        # assignment
+        individual.mark_synced()
+        individual.costs = [1.0]
+        self.assertTrue(individual.is_modified())
+
+    def test_individual_modified_unhashable(self):
+        individual = Individual([1.0, 2.0])
+        individual.custom["pairs"] = ({"a": 1}, [1, 2])
+        individual.custom["tags"] = {"a"}
+        individual.custom["buffer"] = bytearray(b"ab")
+        individual.mark_synced()
+        self.assertFalse(individual.is_modified())
+
+        # in-place changes of the values, which can not be hashed
+        individual.custom["pairs"][0]["a"] = 2
+        self.assertTrue(individual.is_modified())
+        individual.mark_synced()
+        individual.custom["tags"].add("b")
+        self.assertTrue(individual.is_modified())
+        individual.mark_synced()
+        individual.custom["buffer"][0] = ord("c")
+        self.assertTrue(individual.is_modified())
+
+        # the content, which can not be compared, is always stored
+        class Local:
+            __hash__ = None
+
+        individual.custom["local"] = Local()
+        individual.mark_synced()
+        self.assertTrue(individual.is_modified())
+
+    def test_sync_all_modified(self):
+        database_name = tempfile.NamedTemporaryFile(mode="w", delete=False, dir=None, suffix=".sqlite").name
+        problem = MyProblem()
+        problem.data_store = SqliteDataStore(problem, database_name=database_name)
+
+        problem.individuals = [Individual([float(i), 0.0]) for i in range(10)]
+        problem.data_store.sync_all()
+
+        # overwrite the stored costs behind the data store
+        conn = sqlite3.connect(database_name)
+        c = conn.cursor()
+        for individual in problem.individuals:
+            c.execute("UPDATE individuals SET costs = ? WHERE id = ?", [np.array([-1.0]).tobytes(), individual.id])
+        conn.commit()
+        conn.close()
+
+        # only the modified individual is written
+        problem.individuals[3].costs = [3.0]
+        problem.data_store.sync_all()
+        problem.data_store.destroy()
+
+        problem_view = ProblemViewDataStore(database_name=database_name)
+        costs = {}
+        for individual in problem_view.individuals:
+            costs[individual.id] = individual.costs
+        remove_database(database_name)
+
+        for i, individual in enumerate(problem.individuals):
+            self.assertEqual(costs[individual.id], [3.0] if i == 3 else [-1.0])
+
 
 class TestDataStoreBenchmark(unittest.TestCase):
     def setUp(self):
@@ -133,18 +423,13 @@ class TestDataStoreBenchmark(unittest.TestCase):
         t_s = time.time()
         # check
 
-        conn = sqlite3.connect(database_name)
-        c = conn.cursor()
-        c.execute("SELECT * FROM individuals;")
-        rows = c.fetchall()
-        for row in rows:
-            individual = Individual.from_dict(json.loads(row[1]))
+        problem_view = ProblemViewDataStore(database_name=database_name)
+        for individual in problem_view.individuals:
             self.assertAlmostEqual(individual.costs[0], individuals[individual.id].costs[0], 3)
 
         # remove file
         # print(database_name)
-        conn.close()
-        os.remove(database_name)
+        remove_database(database_name)
 
         t = time.time() - t_s
         problem.logger.info("read elapsed time: {} s".format(t))
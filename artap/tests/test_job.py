@@ -1,7 +1,10 @@
+import tempfile
 import unittest
 from ..problem import Problem
 from ..individual import Individual
 from ..job import Job
+from ..datastore import SqliteDataStore
+from .test_datastore import remove_database
 
 
 class JobProblem(Problem):
@@ -33,5 +36,92 @@ class TestJob(unittest.TestCase):
         self.assertEqual(individual.costs, [9])
 
 
+class CacheProblem(Problem):
+    def set(self):
+        self.name = "CacheProblem"
+        self.parameters = [{'name': 'x_1', 'bounds': [-10, 10], 'precision': 1e-3},
+                           {'name': 'x_2', 'bounds': [-10, 10]}]
+        self.costs = [{'name': 'F_1', 'criteria': 'minimize'}]
+        self.calls = 0
+
+    def evaluate(self, individual):
+        self.calls += 1
+        individual.custom["calls"] = self.calls
+        return [individual.vector[0] ** 2 + individual.vector[1] ** 2]
+
+
+class TestEvaluationCache(unittest.TestCase):
+
+    def test_cache_disabled(self):
+        problem = CacheProblem()
+        job = Job(problem)
+        job.evaluate(Individual([1.0, 2.0]))
+        job.evaluate(Individual([1.0, 2.0]))
+
+        self.assertEqual(problem.calls, 2)
+        self.assertEqual(problem.evaluation_cache.hits, 0)
+
+    def test_cache_hit(self):
+        problem = CacheProblem()
+        problem.options['evaluation_cache'] = True
+        job = Job(problem)
+
+        individual = Individual([1.0, 2.0])
+        job.evaluate(individual)
+        # differs below the precision of the parameters
+        cached = Individual([1.0001, 2.00000001])
+        Job(problem).evaluate(cached)
+
+        self.assertEqual(problem.calls, 1)
+        self.assertEqual(cached.costs, individual.costs)
+        self.assertEqual(cached.costs_signed, individual.costs_signed)
+        self.assertEqual(cached.custom["calls"], 1)
+        self.assertEqual(cached.state, Individual.State.EVALUATED)
+        self.assertEqual(problem.evaluation_cache.hits, 1)
+        self.assertEqual(problem.evaluation_cache.misses, 1)
+
+        job.evaluate(Individual([1.01, 2.0]))
+        self.assertEqual(problem.calls, 2)
+        self.assertEqual(problem.evaluation_cache.misses, 2)
+
+    def test_cache_eviction(self):
+        problem = CacheProblem()
+        problem.options['evaluation_cache'] = True
+        problem.options['evaluation_cache_size'] = 2
+        job = Job(problem)
+
+        for x in [1.0, 2.0, 1.0, 3.0]:
+            job.evaluate(Individual([x, 0.0]))
+        # 2.0 is the least recently used
+        self.assertEqual(len(problem.evaluation_cache), 2)
+        job.evaluate(Individual([1.0, 0.0]))
+        self.assertEqual(problem.calls, 3)
+        job.evaluate(Individual([2.0, 0.0]))
+        self.assertEqual(problem.calls, 4)
+
+    def test_cache_persistent(self):
+        database_name = tempfile.NamedTemporaryFile(mode="w", delete=False, dir=None, suffix=".sqlite").name
+
+        problem = CacheProblem()
+        problem.options['evaluation_cache'] = True
+        problem.options['evaluation_cache_persistent'] = True
+        problem.data_store = SqliteDataStore(problem, database_name=database_name, mode="rewrite")
+        Job(problem).evaluate(Individual([1.0, 2.0]))
+        problem.data_store.destroy()
+
+        problem = CacheProblem()
+        problem.options['evaluation_cache'] = True
+        problem.options['evaluation_cache_persistent'] = True
+        problem.data_store = SqliteDataStore(problem, database_name=database_name)
+        individual = Individual([1.0, 2.0])
+        Job(problem).evaluate(individual)
+        problem.data_store.destroy()
+        remove_database(database_name)
+
+        self.assertEqual(problem.calls, 0)
+        self.assertEqual(individual.costs, [5.0])
+        self.assertEqual(problem.evaluation_cache.hits, 1)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,11 +1,14 @@
 from ..operators import SimpleMutator, SimulatedBinaryCrossover, SimpleCrossover, \
     TournamentSelector, ParetoDominance, nondominated_truncate, crowding_distance, PmMutator, EpsilonDominance, \
-    UniformMutator, NonUniformMutation, FireflyStep
+    UniformMutator, NonUniformMutation, FireflyStep, nondominated_ranks, crowding_distances, _crowding_distance_loop
 from ..individual import Individual
 from ..benchmark_pareto import BiObjectiveTestProblem
 from ..problem import Problem
 from math import inf
 import unittest
+import random
+import time
+import numpy as np
 
 
 class TestCrossover(unittest.TestCase):
@@ -41,6 +44,31 @@ class TestCrossover(unittest.TestCase):
         offsprings = sbx.cross(self.i1.vector, self.i2.vector)
         self.assertEqual(len(offsprings), 2)
 
+    def test_sbx_batch(self):
+        sbx = SimulatedBinaryCrossover(self.parameters, 0.9)
+        n = 5000
+        offsprings_1, offsprings_2 = sbx.cross_batch(np.tile([1.0, 0.5], (n, 1)), np.tile([3.0, 2.5], (n, 1)))
+        self.assertEqual(offsprings_1.shape, (n, 2))
+        for offsprings in [offsprings_1, offsprings_2]:
+            self.assertTrue(np.all(offsprings >= [0, 0]) and np.all(offsprings <= [5, 3]))
+
+        # the same distribution as the crossover of one pair
+        offsprings = np.array([sbx.cross([1.0, 0.5], [3.0, 2.5]) for _ in range(n)])
+        np.testing.assert_allclose(offsprings_1.mean(axis=0), offsprings[:, 0, :].mean(axis=0), atol=0.1)
+        np.testing.assert_allclose(offsprings_2.std(axis=0), offsprings[:, 1, :].std(axis=0), atol=0.1)
+
+    def test_pm_batch(self):
+        pm = PmMutator(self.parameters, 0.5)
+        n = 5000
+        vectors = pm.mutate_batch(np.tile([1.0, 2.5], (n, 1)))
+        self.assertTrue(np.all(vectors >= [0, 0]) and np.all(vectors <= [5, 3]))
+        # the probability of the mutation
+        self.assertAlmostEqual(np.mean(vectors[:, 0] != 1.0), 0.5, delta=0.05)
+
+        mutated = np.array([pm.mutate([1.0, 2.5]) for _ in range(n)])
+        np.testing.assert_allclose(vectors.mean(axis=0), mutated.mean(axis=0), atol=0.05)
+        np.testing.assert_allclose(vectors.std(axis=0), mutated.std(axis=0), atol=0.05)
+
     def test_simple_crossover(self):
         sbx = SimpleCrossover(self.parameters, 0.9)
         offsprings = sbx.cross(self.i1, self.i2)
@@ -203,6 +231,82 @@ class TestFastNonDominatedSorting(unittest.TestCase):
         self.assertAlmostEqual(inf, population[3].features['crowding_distance'])
         self.assertAlmostEqual(inf, population[4].features['crowding_distance'])
 
+    def random_population(self, n, m):
+        population = []
+        for i in range(n):
+            individual = Individual([0.0, 0.0])
+            # rounded costs make ties, some of the individuals violate the constraints
+            individual.costs_signed = [round(random.uniform(0, 1), 1) for _ in range(m)] \
+                + [random.choice([0, 0, 0, -1, 1, 2])]
+            population.append(individual)
+        return population
+
+    def test_should_vectorized_sorting_equal_pairwise_sorting(self):
+        for m in [1, 2, 3, 5]:
+            with self.subTest(m=m):
+                population = self.random_population(200, m)
+                self.selector.pairwise_nondominated_sorting(population)
+                front_numbers = [individual.features['front_number'] for individual in population]
+
+                self.selector.fast_nondominated_sorting(population)
+                self.assertEqual([individual.features['front_number'] for individual in population], front_numbers)
+                for individual in population:
+                    dominating = [other for other in population
+                                  if self.selector.comparator.compare(other.costs_signed, individual.costs_signed) == 1]
+                    self.assertEqual(individual.features['domination_counter'], len(dominating))
+
+    def test_should_sorting_algorithms_give_the_same_fronts(self):
+        for m in [1, 2, 3, 5]:
+            with self.subTest(m=m):
+                population = self.random_population(300, m)
+                costs_signed = np.array([individual.costs_signed for individual in population], dtype=float)
+
+                front_numbers, domination_counter = nondominated_ranks(costs_signed, 'matrix')
+                fronts, counter = nondominated_ranks(costs_signed, 'sweep' if m <= 2 else 'ens')
+                np.testing.assert_array_equal(fronts, front_numbers)
+                if m <= 2:
+                    np.testing.assert_array_equal(counter, domination_counter)
+                else:
+                    self.assertIsNone(counter)
+
+    def test_should_vectorized_crowding_distance_equal_loop(self):
+        for m in [1, 2, 3]:
+            with self.subTest(m=m):
+                population = self.random_population(100, m)
+                front = list(population)
+                _crowding_distance_loop(front)
+                distances = [individual.features['crowding_distance'] for individual in population]
+
+                vectorized_front = list(population)
+                crowding_distance(vectorized_front)
+                self.assertEqual([individual.features['crowding_distance'] for individual in population], distances)
+                self.assertEqual([individual.id for individual in vectorized_front], [individual.id for individual in front])
+
+                # whole population split by the fronts
+                front_numbers = [i % 3 for i in range(len(population))]
+                costs = np.array([individual.costs_signed[:-1] for individual in population])
+                distances = crowding_distances(costs, front_numbers)
+                for number in range(3):
+                    front = [individual for i, individual in enumerate(population) if front_numbers[i] == number]
+                    _crowding_distance_loop(front)
+                    for i, individual in enumerate(population):
+                        if front_numbers[i] == number:
+                            self.assertEqual(distances[i], individual.features['crowding_distance'])
+
+    def test_benchmark_fast_nondominated_sorting(self):
+        population = self.random_population(500, 3)
+
+        t_s = time.time()
+        self.selector.pairwise_nondominated_sorting(population)
+        t_pairwise = time.time() - t_s
+
+        t_s = time.time()
+        self.selector.fast_nondominated_sorting(population)
+        t_vectorized = time.time() - t_s
+
+        # print("pairwise: {} s, vectorized: {} s".format(t_pairwise, t_vectorized))
+        self.assertLess(t_vectorized, t_pairwise)
+
     def test_should_the_crowding_distance_of_four_solutions_correctly_assigned(self):
         x = Individual([0, 1])
         y = Individual([1, 0])
@@ -559,6 +663,16 @@ class TestNonUniformMutator(unittest.TestCase):
         y = self.um.mutate(x, 2)
         self.assertNotEqual(y, [3, 2])
 
+    def test_mutate_batch(self):
+        vectors = [[3, 2], [4, 5]]
+        self.assertEqual(self.um.mutate_batch(vectors, 2).tolist(), vectors)
+
+        self.um.probability = 1.0
+        lower, upper = self.um.bounds()
+        y = self.um.mutate_batch(vectors, 2)
+        self.assertEqual(y.shape, (2, 2))
+        self.assertTrue(np.all((y >= lower) & (y <= upper)))
+
 
 class TestFireflystep(unittest.TestCase):
 
@@ -0,0 +1,112 @@
+import unittest
+import numpy as np
+
+from ..population import PopulationArray, IndividualView
+from ..individual import Individual
+from ..benchmark_pareto import ZDT1
+from ..algorithm_NSGAII import NSGAII
+from ..results import Results
+
+
+def evaluated_individual(vector, costs, population_id=0):
+    individual = Individual(vector)
+    individual.costs = costs
+    individual.costs_signed = costs + [False]
+    individual.state = Individual.State.EVALUATED
+    individual.population_id = population_id
+    individual.features['front_number'] = 1
+    return individual
+
+
+class TestPopulationArray(unittest.TestCase):
+    def test_compact(self):
+        individuals = [evaluated_individual([i, i + 0.5], [2.0 * i, 1.0], population_id=i % 3) for i in range(10)]
+        population = PopulationArray.from_individuals(individuals)
+
+        self.assertEqual(len(population), 10)
+        self.assertTrue(np.array_equal(population.vectors, [individual.vector for individual in individuals]))
+        self.assertTrue(np.array_equal(population.costs[:, 0], 2.0 * np.arange(10)))
+        self.assertTrue(np.array_equal(population.ids, [individual.id for individual in individuals]))
+
+        view = population[-1]
+        self.assertIsInstance(view, IndividualView)
+        self.assertEqual(view.vector, [9, 9.5])
+        self.assertEqual(view.costs_signed, [18.0, 1.0, 0.0])
+        self.assertEqual(view.state, Individual.State.EVALUATED)
+        self.assertEqual(view.features, {'feasible': 0, 'precision': 7, 'front_number': 1})
+
+        # views write to the arrays
+        view.population_id = 5
+        self.assertEqual(population.select('population_id', 5), [view])
+        self.assertEqual([len(individuals) for individuals in population.groups('population_id').values()],
+                         [3, 3, 3, 1])
+
+    def test_buffer(self):
+        population = PopulationArray(buffer_size=5)
+        individuals = [Individual([i, i]) for i in range(20)]
+        population.extend(individuals)
+
+        # the individuals without costs are waiting
+        self.assertIs(population[0], individuals[0])
+        self.assertFalse(np.any(population.evaluated))
+
+        for i, individual in enumerate(individuals):
+            individual.costs = [1.0]
+            individual.state = Individual.State.EVALUATED
+            individual.population_id = i // 5
+        population.append(Individual([20, 20]))
+
+        # the populations 0 and 1 are finished (the algorithm appended the population 3)
+        self.assertIsInstance(population[0], IndividualView)
+        self.assertIsInstance(population[9], IndividualView)
+        self.assertIs(population[10], individuals[10])
+        self.assertIs(population[20], population._pending[20])
+        self.assertEqual(int(np.sum(population.evaluated)), 20)
+
+        # the individuals of the populations 2 and 3 (and the new one) are waiting
+        self.assertEqual(sorted(population._pending), list(range(10, 21)))
+
+    def test_view_changes(self):
+        population = PopulationArray.from_individuals([evaluated_individual([1.0, 2.0], [3.0])])
+        view = population[0]
+
+        # in-place changes are not stored, they raise
+        with self.assertRaises(TypeError):
+            view.vector[0] = 5.0
+        with self.assertRaises(TypeError):
+            view.features['front_number'] = 2
+        with self.assertRaises(TypeError):
+            view.custom = {'label': 'a'}
+
+        # the assigned values are stored
+        vector = view.vector.copy()
+        vector[0] = 5.0
+        view.vector = vector
+        self.assertEqual(population[0].vector, [5.0, 2.0])
+
+    def test_problem_individuals(self):
+        problem = ZDT1()
+        problem.individuals = PopulationArray(buffer_size=10)
+
+        algorithm = NSGAII(problem)
+        algorithm.options['max_population_number'] = 5
+        algorithm.options['max_population_size'] = 10
+        algorithm.options['max_processes'] = 1
+        algorithm.run()
+
+        self.assertEqual(len(problem.populations()), 5)
+        self.assertEqual(len(problem.last_population()), 10)
+
+        results = Results(problem)
+        costs = results.costs()
+        population_ids = results.get_population_ids()
+        optimum = results.find_optimum('f_1')
+
+        # the same results from the list of individuals
+        problem.individuals = list(problem.individuals)
+        self.assertEqual(costs, results.costs())
+        self.assertEqual(population_ids, results.get_population_ids())
+        self.assertEqual(optimum.vector, results.find_optimum('f_1').vector)
+
+if __name__ == '__main__':
+    unittest.main()
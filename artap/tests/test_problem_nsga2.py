@@ -5,7 +5,10 @@ from ..benchmark_pareto import ZDT1
 from ..algorithm_NSGAII import NSGAII
 from ..results import Results
 from ..problem import Problem
+from ..individual import Individual
 from ..quality_indicator import epsilon_add
+from ..cache import quantized_vector
+from ..operators import CostToleranceTermination, HypervolumeStagnationTermination, IGDStagnationTermination
 
 
 class TestNSGA2(unittest.TestCase):
@@ -31,6 +34,103 @@ class TestNSGA2(unittest.TestCase):
                          algorithm.options['max_population_number'] * algorithm.options['max_population_size'])
 
 
+class GridProblem(Problem):
+    def set(self):
+        self.name = 'GridProblem'
+        self.parameters = [{'name': 'x_1', 'bounds': [0, 1], 'precision': 1e-2},
+                           {'name': 'x_2', 'bounds': [0, 1], 'precision': 1e-2}]
+        self.costs = [{'name': 'f_1', 'criteria': 'minimize'},
+                      {'name': 'f_2', 'criteria': 'minimize'}]
+        self.evaluated = []
+
+    def evaluate(self, individual):
+        self.evaluated.append(quantized_vector(self.parameters, individual))
+        x = individual.vector
+        return [x[0] ** 2 + x[1], (x[0] - 1) ** 2 + x[1]]
+
+
+class TestDuplicates(unittest.TestCase):
+    def run_algorithm(self, problem, population_size):
+        algorithm = NSGAII(problem)
+        algorithm.options['max_population_number'] = 10
+        algorithm.options['max_population_size'] = population_size
+        algorithm.options['max_processes'] = 1
+        algorithm.options['exclude_evaluated'] = True
+        algorithm.run()
+        return algorithm
+
+    def test_exclude_evaluated(self):
+        problem = GridProblem()
+        self.run_algorithm(problem, 20)
+
+        # the points are never evaluated twice
+        self.assertEqual(len(problem.evaluated), 200)
+        self.assertEqual(len(set(problem.evaluated)), len(problem.evaluated))
+
+    def test_exhausted_space(self):
+        problem = GridProblem()
+        for parameter in problem.parameters:
+            parameter['precision'] = 0.5
+
+        # only 9 points, the duplicates are accepted
+        self.run_algorithm(problem, 20)
+        self.assertEqual(len(problem.evaluated), 200)
+
+    def test_visited_points_shared(self):
+        problem = GridProblem()
+        algorithm = self.run_algorithm(problem, 20)
+        n_evaluated = len(algorithm.evaluated)
+
+        # the evaluated points are not copied to the filter of the generation
+        visited = algorithm.visited_points(problem.individuals[:2])
+        self.assertIs(visited.base, algorithm.evaluated)
+        self.assertIn(problem.individuals[-1], visited)
+        self.assertFalse(visited.add(problem.individuals[-1]))
+        visited.update([Individual([0.123, 0.456]), Individual([0.654, 0.321])])
+        self.assertEqual(len(algorithm.evaluated), n_evaluated)
+
+
+class TestTermination(unittest.TestCase):
+    def create_algorithm(self, problem):
+        algorithm = NSGAII(problem)
+        algorithm.options['max_population_number'] = 100
+        algorithm.options['max_population_size'] = 10
+        algorithm.options['max_processes'] = 1
+        return algorithm
+
+    def test_max_evaluations(self):
+        problem = ZDT1()
+        algorithm = self.create_algorithm(problem)
+        algorithm.options['max_evaluations'] = 45
+        algorithm.run()
+
+        # checked after every generation
+        self.assertEqual(algorithm.n_gen, 5)
+        self.assertEqual(algorithm.evaluator.n_eval, 50)
+        self.assertEqual(len(problem.populations()), 5)
+
+    def test_max_time(self):
+        problem = ZDT1()
+        algorithm = self.create_algorithm(problem)
+        algorithm.options['max_time'] = 0.0
+        algorithm.run()
+
+        self.assertEqual(algorithm.n_gen, 1)
+        self.assertEqual(len(problem.individuals), 10)
+
+    def test_stagnation(self):
+        for termination in [CostToleranceTermination(1e-2, window=3), HypervolumeStagnationTermination(1e-2, window=3),
+                            IGDStagnationTermination(1e-2, window=3)]:
+            problem = GridProblem()
+            algorithm = self.create_algorithm(problem)
+            algorithm.add_termination(termination)
+            algorithm.options['max_population_size'] = 20
+            algorithm.run()
+
+            self.assertLess(algorithm.n_gen, 99)
+            self.assertEqual(len(problem.populations()), algorithm.n_gen)
+
+
 class TestZDT1(unittest.TestCase):
     # integration test -- tests the total functionality of nsga2
     # around 11secs according to literature DOI: 10.1007/978-3-642-01020-0_39
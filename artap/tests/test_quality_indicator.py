@@ -1,6 +1,8 @@
 import unittest
+import itertools
+import numpy as np
 
-from ..quality_indicator import gd, epsilon_add
+from ..quality_indicator import gd, igd, igd_plus, epsilon_add, hypervolume
 
 
 class TestGenerationalDistance(unittest.TestCase):
@@ -30,6 +32,58 @@ class TestEpsUnaryAdd(unittest.TestCase):
 
         self.assertAlmostEqual(epsilon_add(ref, calc), 0.03)
 
+    def test_empty(self):
+        ref = [(1., 1.), (2., 0.5)]
+        self.assertEqual(epsilon_add([], ref), 0.0)
+        self.assertEqual(epsilon_add(ref, []), float('inf'))
+
+
+class TestInvertedGenerationalDistance(unittest.TestCase):
+
+    def test_2d(self):
+        ref = [(0., 1.), (0.5, 0.5), (1., 0.)]
+        calc = [(0., 1.), (0.5, 0.6), (1.2, 0.)]
+
+        self.assertAlmostEqual(igd(ref, calc), 0.3 / 3)
+        # only the worse components are measured
+        self.assertAlmostEqual(igd_plus(ref, calc), 0.3 / 3)
+        self.assertAlmostEqual(igd_plus(ref, [(-1., -1.)]), 0.)
+        self.assertGreater(igd(ref, [(-1., -1.)]), 1.)
+
+    def test_empty(self):
+        ref = [(1., 1.), (2., 0.5)]
+        self.assertEqual(igd([], ref), 0.0)
+        self.assertEqual(igd(ref, []), float('inf'))
+        self.assertEqual(igd_plus([], ref), 0.0)
+        self.assertEqual(igd_plus(ref, []), float('inf'))
+
+
+class TestHypervolume(unittest.TestCase):
+
+    def test_2d(self):
+        points = [(1., 3.), (2., 2.), (3., 1.), (2.5, 2.5), (5., 0.)]
+        self.assertAlmostEqual(hypervolume(points, (4., 4.)), 6.)
+
+    def test_3d(self):
+        points = [(1., 2., 3.), (3., 1., 2.), (2., 3., 1.)]
+        # the boxes of the volume 6 - the pairwise intersections of the volume 2 + the intersection of all of them
+        self.assertAlmostEqual(hypervolume(points, (4., 4., 4.)), 3 * 6 - 3 * 2 + 1)
+
+        self.assertAlmostEqual(hypervolume(points, (4., 4., 4.), method='monte_carlo', seed=1), 13., delta=0.1)
+
+    def test_random(self):
+        # the sum of the volumes of the disjoint boxes (the inclusion-exclusion principle)
+        random = np.random.default_rng(0)
+        for dimension in [2, 3, 4]:
+            points = random.random((6, dimension))
+            reference = np.ones(dimension)
+            expected = 0.0
+            for size in range(1, len(points) + 1):
+                for subset in itertools.combinations(points, size):
+                    expected += (-1) ** (size + 1) * np.prod(reference - np.max(subset, axis=0))
+
+            self.assertAlmostEqual(hypervolume(points, reference), expected)
+
 
 
 if __name__ == '__main__':
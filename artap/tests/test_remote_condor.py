@@ -1,14 +1,24 @@
 import os
 import pathlib
+import builtins
+import pickle
 import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
 import unittest
 import zipfile
+from types import SimpleNamespace
 from unittest import TestCase, main
 
 from ..algorithm import DummyAlgorithm
 from ..algorithm_NSGAII import NSGAII
 from ..config import config
-from ..executor import CondorComsolJobExecutor, CondorMatlabJobExecutor, CondorPythonJobExecutor, CondorCSTJobExecutor
+from ..executor import CondorComsolJobExecutor, CondorMatlabJobExecutor, CondorPythonJobExecutor, CondorCSTJobExecutor, \
+    CondorJobExecutor, ConnectionPool, JobMonitor, UploadCache
 from ..individual import Individual
 from ..problem import Problem
 
@@ -128,6 +138,37 @@ class PythonInputProblem(Problem):
         return [float(content[0])]
 
 
+class PythonBatchProblem(PythonInputProblem):
+    """ The population is evaluated by one cluster. """
+
+    def evaluate_batch(self, x, individuals=None):
+        return self.executor.eval_batch(individuals)
+
+
+class LegacyPythonJobExecutor(CondorJobExecutor):
+    """ Executor creating the job itself (without _job_description). """
+
+    def __init__(self, problem):
+        super().__init__(problem, ["run_input.py"], ["output.txt"])
+        shutil.copy(os.path.join(str(pathlib.Path(__file__).parent.absolute()), "data/run_input.py"),
+                    problem.working_dir)
+
+    def _create_job_file(self, remote_dir, individual, client):
+        self._create_file_on_remote("input.txt", "\n".join(str(value) for value in individual.vector),
+                                    remote_dir=remote_dir, client=client)
+        client.root.submit_job(remote_dir=remote_dir, executable="python3", arguments="run_input.py input.txt",
+                               input_files=["run_input.py", "input.txt"], output_files=self.output_files,
+                               requirements="", request_cpus=-1, request_memory=-1, hold_on_start=False,
+                               desc=self._create_desc(individual))
+
+
+class PythonAsyncProblem(PythonInputProblem):
+    """ The jobs are evaluated concurrently on the event loop. """
+
+    async def evaluate_async(self, individual):
+        return await self.executor.eval_async(individual)
+
+
 class CSTProblem(Problem):
     """ Describe simple one objective optimization problem. """
 
@@ -245,5 +286,475 @@ class TestCondor(TestCase):
             self.assertEqual(len(individuals), algorithm.options['max_population_size'])
 
 
+class LocalConnection:
+    """ Connection counting the concurrent users of the pool. """
+    opened = 0
+
+    def __init__(self, alive=True):
+        LocalConnection.opened += 1
+        self.closed = False
+        self.alive = alive
+
+    def ping(self, timeout=None):
+        if not self.alive:
+            raise EOFError
+
+    def close(self):
+        self.closed = True
+
+
+class TestConnectionPool(TestCase):
+    def setUp(self):
+        LocalConnection.opened = 0
+
+    def test_reuse(self):
+        pool = ConnectionPool(LocalConnection, max_size=4)
+        for i in range(10):
+            with pool.connection() as connection:
+                self.assertFalse(connection.closed)
+
+        self.assertEqual(LocalConnection.opened, 1)
+        self.assertEqual(len(pool), 1)
+
+        pool.close()
+        self.assertTrue(connection.closed)
+        self.assertEqual(len(pool), 0)
+
+    def test_bounded_size(self):
+        pool = ConnectionPool(LocalConnection, max_size=3)
+        in_use = []
+        maximum = []
+        lock = threading.Lock()
+
+        def evaluate():
+            with pool.connection():
+                with lock:
+                    in_use.append(1)
+                    maximum.append(len(in_use))
+                time.sleep(0.01)
+                with lock:
+                    in_use.pop()
+
+        threads = [threading.Thread(target=evaluate) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(max(maximum), 3)
+        self.assertEqual(LocalConnection.opened, 3)
+
+    def test_reconnect(self):
+        pool = ConnectionPool(LocalConnection, max_size=1, timeout=1.0)
+
+        # the broken connection is dropped
+        with self.assertRaises(ConnectionError):
+            with pool.connection() as connection:
+                raise ConnectionError
+        self.assertTrue(connection.closed)
+
+        # the connection, which does not respond to ping, is replaced
+        pool.health_check_interval = 0.0
+        with pool.connection() as connection:
+            connection.alive = False
+        with pool.connection() as new_connection:
+            self.assertIsNot(connection, new_connection)
+
+        self.assertEqual(LocalConnection.opened, 3)
+        self.assertEqual(len(pool), 1)
+
+    def test_pickle(self):
+        pool = ConnectionPool(LocalConnection, max_size=2)
+        with pool.connection():
+            pass
+
+        pool = pickle.loads(pickle.dumps(pool))
+        self.assertEqual(len(pool), 0)
+        with pool.connection() as connection:
+            self.assertFalse(connection.closed)
+
+
+class LocalDaemon:
+    """ Daemon running the procs of the submitted cluster locally (one after another). """
+
+    class Root:
+        def __init__(self):
+            self.artap_dir = tempfile.mkdtemp()
+            self.lock = threading.Lock()
+            self.clusters = 0
+            self.reads = 0
+            self.events = {}
+            # descriptions of the procs of the submitted clusters
+            self.cluster_descs = []
+            # number of the clusters, whose last proc fails
+            self.failures = 0
+            # number of the clusters, whose last proc is held
+            self.held = 0
+            # the submitted single jobs are not run (they stay in the queue)
+            self.hold = False
+            # the jobs removed from the queue
+            self.removed = []
+
+        def create_job_dir(self):
+            # the jobs are submitted from more threads
+            with self.lock:
+                remote_dir = "job-{}".format(len(self.events))
+                self.events[remote_dir] = []
+            os.mkdir(os.path.join(self.artap_dir, remote_dir))
+            return remote_dir
+
+        def submit_job(self, remote_dir, executable, arguments, input_files, output_files, requirements,
+                       request_cpus, request_memory, hold_on_start, desc):
+            with self.lock:
+                self.clusters += 1
+            if not self.hold:
+                self._run(remote_dir, remote_dir, arguments, 0)
+
+        def submit_cluster(self, remote_dir, executable, arguments, input_files, output_files, requirements,
+                           request_cpus, request_memory, hold_on_start, desc):
+            self.clusters += 1
+            self.cluster_descs.append(desc)
+            for proc, (proc_arguments, proc_input_files) in enumerate(zip(arguments, input_files)):
+                proc_dir = os.path.join(remote_dir, str(proc))
+                if self.failures > 0 and proc == len(arguments) - 1:
+                    self.failures -= 1
+                    self.events[remote_dir].append({"type": "job_terminated", "cluster": self.clusters, "proc": proc,
+                                                    "successful": False})
+                    continue
+                if self.held > 0 and proc == len(arguments) - 1:
+                    self.held -= 1
+                    self.events[remote_dir].append({"type": "job_held", "cluster": self.clusters, "proc": proc})
+                    continue
+                # input files are transferred to the working directory of the proc
+                for file in proc_input_files:
+                    if file.startswith("../"):
+                        shutil.copy(os.path.join(self.artap_dir, proc_dir, file), os.path.join(self.artap_dir, proc_dir))
+                self._run(remote_dir, proc_dir, proc_arguments, proc)
+
+        def _run(self, remote_dir, job_dir, arguments, proc):
+            process = subprocess.run([sys.executable] + arguments.split(), cwd=os.path.join(self.artap_dir, job_dir))
+            self.events[remote_dir].append({"type": "job_terminated", "cluster": self.clusters, "proc": proc,
+                                            "successful": process.returncode == 0})
+
+        def eventlogs(self, remote_dirs):
+            self.reads += 1
+            return {remote_dir: self.events[remote_dir] for remote_dir in remote_dirs}
+
+        def remove_job(self, remote_dir):
+            self.removed.append(remote_dir)
+
+        def remove_job_dir(self, remote_dir):
+            shutil.rmtree(os.path.join(self.artap_dir, remote_dir))
+
+    def __init__(self):
+        self.root = LocalDaemon.Root()
+        self.builtin = builtins
+        self.modules = SimpleNamespace(os=os, shutil=shutil)
+        self.closed = False
+
+
+class TestCondorBatch(TestCase):
+    def test_eval_batch(self):
+        problem = PythonBatchProblem()
+        daemon = LocalDaemon()
+        problem.executor.options["hostname"] = "localhost"
+        problem.executor._connections = ConnectionPool(lambda: daemon)
+
+        individuals = [Individual([i, i + 1]) for i in range(5)]
+        algorithm = DummyAlgorithm(problem)
+        algorithm.evaluator.evaluate(individuals)
+
+        # one cluster, the job directory is removed (the uploaded files stay in the cache)
+        self.assertEqual(daemon.root.clusters, 1)
+        self.assertEqual(os.listdir(daemon.root.artap_dir), [".cache"])
+        for individual in individuals:
+            self.assertAlmostEqual(individual.costs[0], individual.vector[0] ** 2 + individual.vector[1] ** 2)
+        shutil.rmtree(daemon.root.artap_dir)
+
+    def test_eval_batch_failed(self):
+        problem = PythonBatchProblem()
+        daemon = LocalDaemon()
+        daemon.root.failures = 1
+        problem.executor.options["hostname"] = "localhost"
+        problem.executor._connections = ConnectionPool(lambda: daemon)
+
+        individuals = [Individual([i, 2]) for i in range(5)]
+        algorithm = DummyAlgorithm(problem)
+        algorithm.evaluator.evaluate(individuals)
+
+        # the failed proc is submitted again as a smaller cluster, the jobs describe the evaluated individuals
+        self.assertEqual(daemon.root.clusters, 2)
+        self.assertEqual([[desc["individual_id"] for desc in descs] for descs in daemon.root.cluster_descs],
+                         [[individual.id for individual in individuals], [individuals[-1].id]])
+        self.assertEqual([individual.costs[0] for individual in individuals], [4, 5, 8, 13, 20])
+        self.assertEqual(daemon.root.removed, [])
+        shutil.rmtree(daemon.root.artap_dir)
+
+    def test_eval_batch_held(self):
+        problem = PythonBatchProblem()
+        daemon = LocalDaemon()
+        daemon.root.held = 1
+        problem.executor.options["hostname"] = "localhost"
+        problem.executor._connections = ConnectionPool(lambda: daemon)
+
+        individuals = [Individual([i, 2]) for i in range(3)]
+        algorithm = DummyAlgorithm(problem)
+        algorithm.evaluator.evaluate(individuals)
+
+        # the cluster with the held proc is removed from the queue before the proc is submitted again
+        self.assertEqual(daemon.root.clusters, 2)
+        self.assertEqual(daemon.root.removed, ["job-0"])
+        self.assertEqual([individual.costs[0] for individual in individuals], [4, 5, 8])
+        shutil.rmtree(daemon.root.artap_dir)
+
+    def test_legacy_executor(self):
+        problem = PythonBatchProblem()
+        daemon = LocalDaemon()
+        problem.executor = LegacyPythonJobExecutor(problem)
+        problem.executor.options["hostname"] = "localhost"
+        problem.executor._connections = ConnectionPool(lambda: daemon)
+
+        # the executor without _job_description submits the single jobs
+        individuals = [Individual([i, 2]) for i in range(3)]
+        algorithm = DummyAlgorithm(problem)
+        algorithm.evaluator.evaluate(individuals)
+
+        self.assertEqual(daemon.root.clusters, 3)
+        self.assertEqual(daemon.root.cluster_descs, [])
+        self.assertEqual([individual.costs[0] for individual in individuals], [4, 5, 8])
+        shutil.rmtree(daemon.root.artap_dir)
+
+    def test_eval(self):
+        problem = PythonInputProblem()
+        daemon = LocalDaemon()
+        problem.executor.options["hostname"] = "localhost"
+        problem.executor._connections = ConnectionPool(lambda: daemon)
+
+        individuals = [Individual([i, 2]) for i in range(3)]
+        algorithm = DummyAlgorithm(problem)
+        algorithm.evaluator.evaluate(individuals)
+
+        self.assertEqual(daemon.root.clusters, 3)
+        self.assertEqual([individual.costs[0] for individual in individuals], [4, 5, 8])
+
+        # the script is uploaded once
+        self.assertEqual(len(os.listdir(os.path.join(daemon.root.artap_dir, ".cache"))), 1)
+
+        # the current content stays in the cache
+        problem.executor.close()
+        self.assertEqual(len(os.listdir(os.path.join(daemon.root.artap_dir, ".cache"))), 1)
+        shutil.rmtree(daemon.root.artap_dir)
+
+    def test_eval_timeout(self):
+        problem = PythonInputProblem()
+        problem.options['time_out'] = 0.1
+        daemon = LocalDaemon()
+        daemon.root.hold = True
+        problem.executor.options["hostname"] = "localhost"
+        problem.executor._connections = ConnectionPool(lambda: daemon)
+
+        # the job is removed from the queue and it is not watched anymore
+        with self.assertRaises(TimeoutError):
+            problem.executor.eval(Individual([1, 2]))
+        self.assertEqual(daemon.root.removed, ["job-0"])
+        self.assertEqual(len(problem.executor.monitor), 0)
+        self.assertEqual(os.listdir(daemon.root.artap_dir), [".cache"])
+        shutil.rmtree(daemon.root.artap_dir)
+
+    def test_eval_broken_connection(self):
+        problem = PythonInputProblem()
+        daemon = LocalDaemon()
+        problem.executor.options["hostname"] = "localhost"
+        problem.executor.options["max_reconnects"] = 1
+        problem.executor._connections = ConnectionPool(lambda: daemon)
+
+        def create_job_dir():
+            raise ConnectionError("connection lost")
+
+        # the error is raised after max_reconnects attempts
+        daemon.root.create_job_dir = create_job_dir
+        with self.assertLogs(problem.logger, level='WARNING'):
+            with self.assertRaises(ConnectionError):
+                problem.executor.eval(Individual([1, 2]))
+        shutil.rmtree(daemon.root.artap_dir)
+
+    def test_eval_async(self):
+        problem = PythonAsyncProblem()
+        daemon = LocalDaemon()
+        problem.executor.options["hostname"] = "localhost"
+        problem.executor._connections = ConnectionPool(lambda: daemon)
+
+        individuals = [Individual([i, 2]) for i in range(5)]
+        algorithm = DummyAlgorithm(problem)
+        algorithm.options['max_concurrency'] = 3
+        algorithm.evaluator.evaluate(individuals)
+
+        self.assertEqual(daemon.root.clusters, 5)
+        self.assertEqual([individual.costs[0] for individual in individuals], [4, 5, 8, 13, 20])
+        shutil.rmtree(daemon.root.artap_dir)
+
+
+class TestJobMonitor(TestCase):
+    def test_watch(self):
+        daemon = LocalDaemon()
+        monitor = JobMonitor(ConnectionPool(lambda: daemon), min_delay=0.01, max_delay=0.05)
+
+        remote_dirs = [daemon.root.create_job_dir() for _ in range(20)]
+        jobs = [monitor.watch(remote_dir, procs=2) for remote_dir in remote_dirs]
+        time.sleep(0.2)
+
+        # the delay grows without events
+        self.assertEqual(monitor.delay, 0.05)
+        self.assertFalse(any(job.done() for job in jobs))
+        self.assertLess(daemon.root.reads, 20)
+
+        for remote_dir in remote_dirs:
+            daemon.root.events[remote_dir].append({"type": "job_terminated", "cluster": 1, "proc": 0,
+                                                   "successful": True})
+            daemon.root.events[remote_dir].append({"type": "job_held", "cluster": 1, "proc": 1})
+
+        for job in jobs:
+            events = job.result(timeout=5.0)
+            self.assertTrue(events[0]["successful"])
+            self.assertEqual(events[1]["type"], "job_held")
+        self.assertEqual(len(monitor), 0)
+
+        # the unfinished job is cancelled
+        job = monitor.watch(daemon.root.create_job_dir())
+        with self.assertRaises(TimeoutError):
+            job.result(timeout=0.05)
+        monitor.unwatch(list(daemon.root.events.keys())[-1])
+        self.assertTrue(job.cancelled())
+        shutil.rmtree(daemon.root.artap_dir)
+
+
+    def test_error(self):
+        daemon = LocalDaemon()
+        monitor = JobMonitor(ConnectionPool(lambda: daemon), min_delay=0.01, max_delay=0.05)
+
+        def eventlogs(remote_dirs):
+            raise KeyError(remote_dirs[0])
+
+        # the unexpected error is passed to all waiting evaluations
+        daemon.root.eventlogs = eventlogs
+        jobs = [monitor.watch(daemon.root.create_job_dir()) for _ in range(3)]
+        for job in jobs:
+            with self.assertRaises(KeyError):
+                job.result(timeout=5.0)
+        self.assertEqual(len(monitor), 0)
+        self.assertIsNone(monitor._thread)
+
+        # the next job starts a new thread
+        del daemon.root.eventlogs
+        remote_dir = daemon.root.create_job_dir()
+        daemon.root.events[remote_dir].append({"type": "job_terminated", "cluster": 1, "proc": 0, "successful": True})
+        self.assertTrue(monitor.watch(remote_dir).result(timeout=5.0)[0]["successful"])
+        shutil.rmtree(daemon.root.artap_dir)
+
+    def test_broken_connection(self):
+        daemon = LocalDaemon()
+        monitor = JobMonitor(ConnectionPool(lambda: daemon), min_delay=0.01, max_delay=0.05, max_failures=3)
+
+        def eventlogs(remote_dirs):
+            raise ConnectionError("connection lost")
+
+        # the waiting evaluations fail after max_failures rounds with the broken connection
+        daemon.root.eventlogs = eventlogs
+        job = monitor.watch(daemon.root.create_job_dir())
+        with self.assertRaises(ConnectionError):
+            job.result(timeout=5.0)
+        self.assertEqual(len(monitor), 0)
+        shutil.rmtree(daemon.root.artap_dir)
+
+
+class TestUploadCache(TestCase):
+    def test_transfer(self):
+        daemon = LocalDaemon()
+        cache = UploadCache()
+        with tempfile.NamedTemporaryFile(mode='w', suffix=".mph", delete=False) as file:
+            file.write("model")
+
+        remote_dirs = [daemon.root.create_job_dir() for _ in range(3)]
+        for remote_dir in remote_dirs:
+            cache.transfer(file.name, "{}/model.mph".format(remote_dir), daemon)
+
+        cached = os.listdir(os.path.join(daemon.root.artap_dir, ".cache"))
+        self.assertEqual(cached, [cache.digest(file.name)])
+        for remote_dir in remote_dirs:
+            with open(os.path.join(daemon.root.artap_dir, remote_dir, "model.mph")) as remote_file:
+                self.assertEqual(remote_file.read(), "model")
+        self.assertEqual(os.stat(os.path.join(daemon.root.artap_dir, remote_dirs[0], "model.mph")).st_nlink, 4)
+
+        # changed file is uploaded again
+        old_digest = cache.digest(file.name)
+        with open(file.name, 'w') as changed_file:
+            changed_file.write("changed model")
+        cache.transfer(file.name, "{}/changed.mph".format(remote_dirs[0]), daemon)
+        self.assertEqual(len(os.listdir(os.path.join(daemon.root.artap_dir, ".cache"))), 2)
+
+        # the previous content is removed from the cache, the job directories keep it
+        self.assertEqual(cache.cleanup(daemon), {old_digest})
+        self.assertEqual(os.listdir(os.path.join(daemon.root.artap_dir, ".cache")), [cache.digest(file.name)])
+        with open(os.path.join(daemon.root.artap_dir, remote_dirs[2], "model.mph")) as remote_file:
+            self.assertEqual(remote_file.read(), "model")
+        self.assertEqual(cache.cleanup(daemon), set())
+
+        # removed cache
+        shutil.rmtree(os.path.join(daemon.root.artap_dir, ".cache"))
+        cache = pickle.loads(pickle.dumps(cache))
+        cache.transfer(file.name, "{}/model.mph".format(remote_dirs[1]), daemon)
+        self.assertEqual(len(os.listdir(os.path.join(daemon.root.artap_dir, ".cache"))), 1)
+
+        os.unlink(file.name)
+        shutil.rmtree(daemon.root.artap_dir)
+
+    def test_concurrent_transfer(self):
+        daemon = LocalDaemon()
+        uploads = []
+        running = []
+        maximum = []
+        lock = threading.Lock()
+
+        def replace(source, destination):
+            # slow upload, the other transfers of the same content are waiting
+            with lock:
+                uploads.append(destination)
+                running.append(destination)
+                maximum.append(len(running))
+            time.sleep(0.1)
+            os.replace(source, destination)
+            with lock:
+                running.remove(destination)
+
+        daemon.modules = SimpleNamespace(os=SimpleNamespace(path=os.path, makedirs=os.makedirs, link=os.link,
+                                                            replace=replace), shutil=shutil)
+        cache = UploadCache()
+        files = []
+        for content in ["model", "mesh"]:
+            with tempfile.NamedTemporaryFile(mode='w', suffix=".mph", delete=False) as file:
+                file.write(content)
+            files.append(file.name)
+
+        remote_dirs = [daemon.root.create_job_dir() for _ in range(8)]
+        threads = [threading.Thread(target=cache.transfer, args=(files[i % 2], "{}/model.mph".format(remote_dir),
+                                                                 daemon))
+                   for i, remote_dir in enumerate(remote_dirs)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # every content is uploaded once, the different contents at the same time
+        self.assertEqual(len(uploads), 2)
+        self.assertEqual(max(maximum), 2)
+        for i, remote_dir in enumerate(remote_dirs):
+            with open(os.path.join(daemon.root.artap_dir, remote_dir, "model.mph")) as remote_file:
+                self.assertEqual(remote_file.read(), ["model", "mesh"][i % 2])
+
+        for name in files:
+            os.unlink(name)
+        shutil.rmtree(daemon.root.artap_dir)
+
+
 if __name__ == '__main__':
     main()
@@ -10,6 +10,7 @@ from ..algorithm_sweep import SweepAlgorithm
 from ..algorithm_NSGAII import NSGAII
 from ..operators import CustomGenerator
 from ..results import Results
+from ..individual import Individual
 
 
 class TestProblem(Problem):
@@ -266,3 +267,44 @@ class TestResults(unittest.TestCase):
         result = Results(problem)
         integral = result.integration_measure()
         self.assertAlmostEqual(integral, problem.integral_global, places=1)
+
+
+class TestPopulationIndex(unittest.TestCase):
+    def scan(self, individuals, population_id):
+        return [individual for individual in individuals if individual.population_id == population_id]
+
+    def test_population_index(self):
+        problem = TestProblem()
+        for i in range(20):
+            individual = Individual([float(i), 0.0])
+            problem.individuals.append(individual)
+            individual.population_id = i // 5
+            individual.algorithm_id = i % 2
+
+        self.assertEqual(problem.population(2), self.scan(problem.individuals, 2))
+        self.assertEqual(list(problem.populations().keys()), [0, 1, 2, 3])
+        self.assertEqual(len(problem.algorithm_individuals(1)), 10)
+
+        # appended and changed individuals
+        individual = Individual([20.0, 0.0])
+        individual.population_id = 4
+        problem.individuals.append(individual)
+        self.assertEqual(problem.last_population(), [individual])
+        problem.individuals[3].population_id = 2
+        self.assertEqual(problem.population(2), self.scan(problem.individuals, 2))
+        self.assertEqual(problem.population(0), self.scan(problem.individuals, 0))
+
+        # replaced list
+        problem.individuals = problem.individuals[:7]
+        self.assertEqual(problem.last_population(), [problem.individuals[3]])
+        self.assertEqual(problem.population(1), self.scan(problem.individuals, 1))
+
+        # in-place changes of the same length
+        individual = Individual([30.0, 0.0])
+        individual.population_id = 5
+        problem.individuals[2] = individual
+        self.assertEqual(problem.last_population(), [individual])
+        problem.individuals.pop()
+        problem.individuals.append(Individual([31.0, 0.0]))
+        self.assertEqual(problem.population(5), [individual])
+        self.assertEqual(problem.population(-1), self.scan(problem.individuals, -1))
@@ -1,4 +1,5 @@
 import unittest
+import numpy as np
 from ..benchmark_functions import Ackley
 from ..algorithm_swarm import SwarmAlgorithm, OMOPSO, SMPSO, IndividualSwarm
 from ..problem import Problem
@@ -36,6 +37,18 @@ class TestSwarm(unittest.TestCase):
         # result should be -0.2087
         self.assertAlmostEqual(self.Swarm.khi(3., 4.), -0.2087, 4)
 
+    def test_constrictionfactor_of_the_swarm(self):
+        c1 = np.array([[1.], [3.], [2.5]])
+        c2 = np.array([[1.], [4.], [2.5]])
+        self.assertTrue(np.allclose(self.Swarm.khi(c1, c2), [[self.Swarm.khi(1., 1.)],
+                                                             [self.Swarm.khi(3., 4.)],
+                                                             [self.Swarm.khi(2.5, 2.5)]]))
+
+    def test_speed_constriction_of_the_swarm(self):
+        velocities = np.array([[1., -1.], [0.1, -20.]])
+        constricted = self.Swarm.speed_constriction(velocities, np.array([1., 0.]), np.array([0., -1.]))
+        self.assertEqual(constricted.tolist(), [[0.5, -0.5], [0.1, -0.5]])
+
     def test_speed_max_should_reduce_speed(self):
         self.assertAlmostEqual(self.Swarm.speed_constriction(1., 1., 0.), 0.5)
 
@@ -110,27 +123,21 @@ class TestOMOPSOTOOLS(unittest.TestCase):
         # it should preserve the features
         self.assertEqual(population[0].features, z.features)
 
-    def test_global_best(self):
-        x = Individual([1, 2])
-        x.costs = [2.0, 1.0]
+    def test_select_leaders(self):
+        x = Individual([2, 3])
         x.costs_signed = [2.0, 1.0, 0]
-        x.features = {'velocity': [1, 2], 'best_cost': [0., 0., 0.], 'best_vector': [1, 2], 'crowding_distance': [50]}
-
-        self.omopso.leaders.add(x)
-        y = self.omopso.select_leader()
-
-        self.assertEqual(x, y)
+        x.features = {'crowding_distance': 50}
 
         z = Individual([3, 2])
-        z.costs = [0.5, 1.5]
-        z.costs_signed = [0.5, 1.5, 0]
-        z.features = {'velocity': [1, 2], 'best_cost': [0., 0., 0.], 'best_vector': [1, 2], 'crowding_distance': [100]}
+        z.costs_signed = [1.0, 2.0, 0]
+        z.features = {'crowding_distance': 100}
 
-        self.omopso.leaders.add(z)
-        y = self.omopso.select_leader()
+        self.omopso.leaders.add(x)
+        self.assertEqual(self.omopso.select_leaders(3).tolist(), [[2, 3]] * 3)
 
-        # the leader has the bigger crowding distance
-        self.assertEqual(z, y)
+        # the tournament of two different leaders, the leader has the bigger crowding distance
+        self.omopso.leaders.add(z)
+        self.assertEqual(self.omopso.select_leaders(20).tolist(), [[3, 2]] * 20)
 
     def test_velocity(self):
         # if every parameter set to one and we are not on the borders, we shuold got back the velocity
@@ -186,6 +193,44 @@ class TestOMOPSOTOOLS(unittest.TestCase):
         self.assertEqual(population[0].vector, [10, 20])  # preserve the position
         self.assertEqual(population[0].features['velocity'], [-1, -2])  # particle should turn back
 
+    def test_swarm_state(self):
+        x = Individual([1, 2])
+        x.costs_signed = [2.0, 1.0, 0]
+        x.features = {'velocity': [1, 2], 'best_cost': [0., 0., 0.], 'best_vector': [1, 2]}
+        population = [x]
+
+        # the velocities and the particle best are kept by the algorithm between the iterations
+        self.omopso.velocities = np.array([[2., 1.]])
+        self.omopso.update_position(population)
+        self.assertEqual(x.vector, [3, 3])
+        self.assertEqual(x.features['velocity'], [2, 1])
+
+        self.omopso.init_pbest(population)
+        x.vector = [4, 4]
+        x.costs_signed = [1.0, 1.0, 0]
+        self.omopso.update_particle_best(population)
+        self.assertEqual(self.omopso.best_vectors.tolist(), [[4, 4]])
+        self.assertEqual(self.omopso.best_costs, [[1.0, 1.0, 0]])
+        self.assertEqual(x.features['best_vector'], [4, 4])
+
+    def test_swarm_update(self):
+        population = []
+        for i in range(10):
+            x = Individual([2 + i, 20 - i])
+            x.costs_signed = [i, 10.0 - i, 0]
+            x.features = {'velocity': [0, 0], 'best_cost': [i, 10.0 - i, 0], 'best_vector': [2 + i, 20 - i],
+                          'crowding_distance': i}
+            self.omopso.leaders.add(x)
+            population.append(x)
+
+        self.omopso.update_velocity(population)
+        self.omopso.update_position(population)
+        self.omopso.turbulence(population, 5)
+
+        for x in population:
+            self.assertTrue(2. <= x.vector[0] <= 10. and 2. <= x.vector[1] <= 20.)
+            self.assertTrue(abs(x.features['velocity'][0]) <= 4. and abs(x.features['velocity'][1]) <= 9.)
+
     def test_update_global_best(self):
         population = []
         for i in range(0, 10):
@@ -237,9 +282,7 @@ class TestSMPSOTOOLS(unittest.TestCase):
             'crowding_distance': [100]
         }
         self.smpso.leaders.add(x)
-        y = self.smpso.select_leader()
-        # print(y)
-        self.assertEqual(x, y)
+        self.assertEqual(self.smpso.select_leaders(1).tolist(), [[4, 5]])
 
     def test_initial_velocity(self):
         x = Individual([3, 4])
@@ -294,3 +337,17 @@ class TestSMPSOTOOLS(unittest.TestCase):
         self.smpso.update_position(population)
 
         self.assertEqual(population[0].vector, [6, 12])
+
+    def test_update_position_should_slow_down_on_the_border(self):
+        x = Individual([9, 3])
+        x.features = {'velocity': [2, -2]}
+        y = Individual([5, 10])
+        y.features = {'velocity': [1, 2]}
+        population = [x, y]
+        self.smpso.update_position(population)
+
+        self.assertEqual(x.vector, [10, 2])
+        self.assertAlmostEqual(x.features['velocity'][0], 0.002)
+        self.assertAlmostEqual(x.features['velocity'][1], -0.002)
+        self.assertEqual(y.vector, [6, 12])
+        self.assertEqual(y.features['velocity'], [1, 2])